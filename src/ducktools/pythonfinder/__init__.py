@@ -27,26 +27,98 @@ __all__ = [
     "__version__",
     "get_python_installs",
     "list_python_installs",
+    "aget_python_installs",
+    "alist_python_installs",
+    "find_python",
+    "VersionFilter",
+    "DiscoverySource",
+    "register_source",
     "PythonInstall",
 ]
 
 import sys
+
+from ducktools.lazyimporter import LazyImporter, FromImport, get_module_funcs
+
 from ._version import __version__
 from .shared import PythonInstall, DetailFinder
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from .async_search import aget_python_installs, alist_python_installs
+    from .candidates import VersionFilter
+    from .find import find_python
+    from .sources import DiscoverySource, register_source
+
 
 if sys.platform == "win32":
-    from .win32 import get_python_installs
+    _platform_module = ".win32"
 elif sys.platform == "darwin":
-    from .darwin import get_python_installs
+    _platform_module = ".darwin"
 else:
-    from .linux import get_python_installs
+    _platform_module = ".linux"
+
+# The rest of the public API and the platform search are imported when first used
+_laz = LazyImporter(
+    [
+        FromImport(".async_search", "aget_python_installs"),
+        FromImport(".async_search", "alist_python_installs"),
+        FromImport(".candidates", "VersionFilter"),
+        FromImport(".client", "get_server_installs"),
+        FromImport(".find", "find_python"),
+        FromImport(".sources", "DiscoverySource"),
+        FromImport(".sources", "register_source"),
+        FromImport(_platform_module, "get_python_installs", "_get_python_installs"),
+    ],
+    globs=globals(),
+)
+
+__getattr__, __dir__ = get_module_funcs(_laz, __name__)
+
+
+def get_python_installs(
+    *,
+    finder: DetailFinder | None = None,
+    version_filter: VersionFilter | None = None,
+    sources: Iterable[str] | None = None,
+) -> Iterator[PythonInstall]:
+    """
+    Yield the discoverable Python installs
+
+    If no finder or sources are given and a discovery server is running the
+    installs are requested from the server instead of being searched for.
+
+    :param finder: DetailFinder used to get and cache install details
+    :param version_filter: Only include installs in this version range, candidates
+                           ruled out by their file or folder names are not queried
+    :param sources: Names of the sources to search in order of precedence
+                    (eg: ["pyenv", "uv", "PATH"]), defaults to every default source
+    :yield: PythonInstall details
+    """
+    if (
+        finder is None
+        and sources is None
+        and (installs := _laz.get_server_installs()) is not None
+    ):
+        for install in installs:
+            if version_filter is None or version_filter.includes(install):
+                yield install
+    else:
+        yield from _laz._get_python_installs(
+            finder=finder, version_filter=version_filter, sources=sources
+        )
 
 
-def list_python_installs(*, finder: DetailFinder | None = None) -> list[PythonInstall]:
-    finder = DetailFinder() if finder is None else finder
+def list_python_installs(
+    *,
+    finder: DetailFinder | None = None,
+    version_filter: VersionFilter | None = None,
+    sources: Iterable[str] | None = None,
+) -> list[PythonInstall]:
     return sorted(
-        get_python_installs(finder=finder),
+        get_python_installs(finder=finder, version_filter=version_filter, sources=sources),
         reverse=True,
         key=lambda x: (x.version[3], *x.version[:3], x.version[4])
     )
@@ -27,13 +27,14 @@ import os
 
 from ducktools.lazyimporter import LazyImporter, ModuleImport, FromImport
 
-from . import list_python_installs, __version__
-from .shared import purge_caches, version_str_to_tuple
+from . import list_python_installs, __version__, VersionFilter
+from .shared import DetailFinder, purge_caches
 
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
     import argparse
+    from .stats import DiscoveryStats
 
 
 _laz = LazyImporter(
@@ -44,7 +45,10 @@ _laz = LazyImporter(
         ModuleImport("subprocess"),
         ModuleImport("sysconfig"),
         ModuleImport("platform"),
-        FromImport("packaging.specifiers", "SpecifierSet"),
+        FromImport(".client", "SERVER_SOCKET_PATH"),
+        FromImport(".client", "ServerError"),
+        FromImport(".client", "query_server"),
+        FromImport(".server", "serve"),
     ],
     globs=globals()
 )
@@ -135,6 +139,27 @@ def get_parser() -> argparse.ArgumentParser:
         help="Clear the cache of Python install details"
     )
 
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run a discovery server that keeps search results up to date for other processes",
+    )
+    serve_parser.add_argument(
+        "--socket",
+        default=None,
+        help="Path of the Unix domain socket to listen on",
+    )
+    serve_parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop a running discovery server",
+    )
+
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Show cache, query and per source statistics for the search",
+    )
+
     specifiers = parser.add_argument_group("Version specifiers", "Specifiers for Python version filters")
     specifiers.add_argument("--min", help="Specify minimum Python version")
     specifiers.add_argument("--max", help="Specify maximum Python version")
@@ -147,13 +172,18 @@ def display_local_installs(
     min_ver: str | None = None,
     max_ver: str | None = None,
     compatible: str | None = None,
+    show_stats: bool = False,
 ) -> None:
 
-    min_ver_tuple = version_str_to_tuple(min_ver) if min_ver else None
-    max_ver_tuple = version_str_to_tuple(max_ver) if max_ver else None
-    compatible_spec = _laz.SpecifierSet(f"~={compatible}") if compatible else None
+    version_filter = VersionFilter(
+        min_version=min_ver,
+        max_version=max_ver,
+        specifier=f"~={compatible}" if compatible else None,
+    )
 
-    installs = list_python_installs()
+    # Statistics need a local search, otherwise a running server can be used
+    finder = DetailFinder() if show_stats else None
+    installs = list_python_installs(finder=finder, version_filter=version_filter)
 
     headings = ["Version", "Executable Location"]
 
@@ -167,13 +197,6 @@ def display_local_installs(
 
     # First collect the strings
     for install in installs:
-        if (
-            (min_ver_tuple and install.version < min_ver_tuple)
-            or (max_ver_tuple and install.version > max_ver_tuple)
-            or (compatible_spec and not compatible_spec.contains(install.version_str))
-        ):
-            continue
-
         version_str = install.version_str
 
         if sys.platform == "win32":
@@ -229,6 +252,74 @@ def display_local_installs(
     for version_str, executable in install_collection:
         print(f"| {version_str:>{max_version_len}s} | {executable:<{max_executable_len}s} |")
 
+    if finder is not None:
+        print()
+        display_stats(finder.stats)
+
+
+def display_stats(stats: DiscoveryStats) -> None:
+    print("Search Statistics")
+    print()
+    print(f"Cache hits: {stats.cache_hits}")
+    print(f"Cache misses: {stats.cache_misses}")
+    print(f"Stale cache entries: {stats.stale_entries}")
+    print(f"Queries: {stats.probe_count} ({stats.probe_time:.3f}s)")
+    print()
+
+    headings = ["Source", "Time (s)", "Installs", "scandir", "stat"]
+    rows = [
+        [s.name, f"{s.time:.3f}", str(s.installs), str(s.scandir_calls), str(s.stat_calls)]
+        for s in stats.sources.values()
+    ]
+    _print_table(headings, rows)
+
+    if stats.probes:
+        print()
+        headings = ["Executable", "Wall (s)", "User (s)", "System (s)", "Result"]
+        rows = [
+            [
+                p.executable,
+                f"{p.wall_time:.3f}",
+                "-" if p.user_time is None else f"{p.user_time:.3f}",
+                "-" if p.system_time is None else f"{p.system_time:.3f}",
+                "ok" if p.succeeded else "failed",
+            ]
+            for p in sorted(stats.probes, key=lambda p: p.wall_time, reverse=True)
+        ]
+        _print_table(headings, rows)
+
+
+def _print_table(headings: list[str], rows: list[list[str]]) -> None:
+    widths = [
+        max([len(heading), *(len(row[i]) for row in rows)])
+        for i, heading in enumerate(headings)
+    ]
+    print("| " + " | ".join(f"{h:<{w}s}" for h, w in zip(headings, widths)) + " |")
+    print("| " + " | ".join("-" * w for w in widths) + " |")
+    for row in rows:
+        # Left align the first column, right align values
+        cells = [f"{row[0]:<{widths[0]}s}"]
+        cells.extend(f"{cell:>{w}s}" for cell, w in zip(row[1:], widths[1:]))
+        print("| " + " | ".join(cells) + " |")
+
+
+def run_server(socket_path: str | None = None, stop: bool = False) -> int:
+    socket_path = _laz.SERVER_SOCKET_PATH if socket_path is None else socket_path
+
+    if stop:
+        try:
+            _laz.query_server("shutdown", socket_path)
+        except _laz.ServerError as e:
+            print(e, file=sys.stderr)
+            return 1
+        return 0
+
+    try:
+        _laz.serve(socket_path)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0
 
 
 def main() -> int:
@@ -245,11 +336,14 @@ def main() -> int:
 
         if vals.command == "clear-cache":
             purge_caches()
+        elif vals.command == "serve":
+            return run_server(socket_path=vals.socket, stop=vals.stop)
         else:
             display_local_installs(
                 min_ver=vals.min,
                 max_ver=vals.max,
                 compatible=vals.compatible,
+                show_stats=vals.stats,
             )
     else:
         # No arguments to parse
@@ -0,0 +1,249 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Discover python installs without blocking an asyncio event loop
+
+Install details are queried with asyncio subprocesses, with a limit on the
+number of queries that can run at the same time.
+"""
+from __future__ import annotations
+
+import os
+import os.path
+import sys
+
+try:
+    from _collections_abc import AsyncIterator
+except ImportError:
+    from collections.abc import AsyncIterator
+
+from ducktools.lazyimporter import LazyImporter, ModuleImport
+
+from .candidates import Candidate, VersionFilter, get_candidate_version, get_candidates
+from .shared import (
+    DetailFinder,
+    PythonInstall,
+    _load_installer_cache,
+    _save_installer_cache,
+)
+
+_laz = LazyImporter(
+    [
+        ModuleImport("asyncio"),
+    ]
+)
+
+
+async def _arun(*args: str) -> str | None:
+    """
+    Run a command in an asyncio subprocess
+
+    :return: stdout of the command or None if it could not be run or failed
+    """
+    asyncio = _laz.asyncio
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except OSError:
+        return None
+
+    stdout, _ = await proc.communicate()
+    if proc.returncode != 0:
+        return None
+
+    return stdout.decode()
+
+
+async def aget_uv_python_path() -> str | None:
+    """
+    Async version of get_uv_python_path
+    """
+    installer_cache = _load_installer_cache()
+
+    uv_python_dir = installer_cache.get("uv")
+    if uv_python_dir and os.path.exists(uv_python_dir):
+        return uv_python_dir
+
+    uv_output = await _arun("uv", "python", "dir")
+    uv_python_dir = None if uv_output is None else uv_output.strip()
+
+    installer_cache["uv"] = uv_python_dir
+    _save_installer_cache(installer_cache)
+
+    return uv_python_dir
+
+
+async def aget_pyenv_root() -> str | None:
+    """
+    Async version of get_pyenv_root
+    """
+    pyenv_root = os.environ.get("PYENV_ROOT")
+
+    # Windows PYENV does not have the `pyenv root` command to use as a backup.
+    if not pyenv_root and sys.platform != "win32":
+        installer_cache = _load_installer_cache()
+
+        pyenv_root = installer_cache.get("pyenv")
+        if pyenv_root is None or not os.path.exists(pyenv_root):
+            pyenv_output = await _arun("pyenv", "root")
+            if pyenv_output is None:
+                return None
+
+            pyenv_root = pyenv_output.strip()
+
+            installer_cache["pyenv"] = pyenv_root
+            _save_installer_cache(installer_cache)
+
+    return pyenv_root
+
+
+async def _get_candidates(finder: DetailFinder | None = None) -> list[Candidate]:
+    finder = DetailFinder() if finder is None else finder
+
+    pyenv_root = await aget_pyenv_root()
+    uv_root = await aget_uv_python_path()
+
+    return get_candidates(finder, pyenv_root, uv_root)
+
+
+async def aget_python_installs(
+    *,
+    finder: DetailFinder | None = None,
+    max_concurrency: int | None = None,
+    version_filter: VersionFilter | None = None,
+) -> AsyncIterator[PythonInstall]:
+    """
+    Async version of get_python_installs
+
+    Installs are yielded in the same order as get_python_installs, uncached
+    installs are queried concurrently.
+
+    :param finder: DetailFinder to use for the cache
+    :param max_concurrency: Maximum number of simultaneous queries,
+                            defaults to the finder's max_workers
+    :param version_filter: Only include installs in this version range, candidates
+                           ruled out by their names are not queried
+    :yield: Discovered PythonInstalls
+    """
+    asyncio = _laz.asyncio
+
+    finder = DetailFinder() if finder is None else finder
+
+    if max_concurrency is None:
+        max_concurrency = finder.max_workers
+    if max_concurrency is None:
+        max_concurrency = os.cpu_count() or 1
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def limited_details(exe, managed_by, metadata):
+        async with semaphore:
+            return await finder.aget_install_details(exe, managed_by, metadata)
+
+    # Used for unique installs
+    listed_bins: set[str] = set()
+    listed_stdlibs: set[str] = set()
+
+    # Used for shadowed PATH installs
+    exe_names: set[str] = set()
+
+    with finder:
+        # Source times only cover finding candidates as queries run concurrently
+        candidates = await _get_candidates(finder)
+        tasks = [
+            None
+            if version_filter and not version_filter.may_include(
+                get_candidate_version(exe, metadata)
+            )
+            else asyncio.ensure_future(limited_details(exe, managed_by, metadata))
+            for exe, managed_by, metadata, _ in candidates
+        ]
+
+        try:
+            for (exe, _, _, on_path), task in zip(candidates, tasks):
+                if task is None:
+                    # Not queried, but it still shadows later executables with the same name
+                    if on_path:
+                        exe_names.add(os.path.basename(exe))
+                    continue
+
+                install = await task
+                if install is None:
+                    continue
+
+                if sys.platform == "win32":
+                    # Compare by stdlib paths for uniqueness
+                    if stdlib_path := install.paths.get("stdlib"):
+                        if stdlib_path in listed_stdlibs:
+                            continue
+                        listed_stdlibs.add(stdlib_path)
+                    elif install.executable in listed_bins:
+                        continue
+                    else:
+                        listed_bins.add(install.executable)
+                else:
+                    if on_path:
+                        name = os.path.basename(install.executable)
+                        if name in exe_names:
+                            install.shadowed = True
+                        else:
+                            exe_names.add(name)
+
+                    if install.real_executable in listed_bins:
+                        continue
+                    listed_bins.add(install.real_executable)
+
+                if version_filter is None or version_filter.includes(install):
+                    yield install
+        finally:
+            pending = [task for task in tasks if task is not None]
+            for task in pending:
+                task.cancel()
+            # Wait for cancelled queries to stop their processes
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def alist_python_installs(
+    *,
+    finder: DetailFinder | None = None,
+    max_concurrency: int | None = None,
+    version_filter: VersionFilter | None = None,
+) -> list[PythonInstall]:
+    """
+    Async version of list_python_installs
+    """
+    installs = [
+        install async for install in aget_python_installs(
+            finder=finder,
+            max_concurrency=max_concurrency,
+            version_filter=version_filter,
+        )
+    ]
+    return sorted(
+        installs,
+        reverse=True,
+        key=lambda x: (x.version[3], *x.version[:3], x.version[4])
+    )
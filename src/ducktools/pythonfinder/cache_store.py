@@ -0,0 +1,573 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Storage backends for the install details cache.
+
+The JSON store keeps the whole cache in one file that is read and written in full.
+Saving merges changes into the current file under a lock so that entries written
+by other processes since the cache was loaded are kept.
+The SQLite store keeps one row per executable so entries are only decoded when they
+are looked up and only changed entries are written on save.
+"""
+from __future__ import annotations
+
+import os
+import os.path
+import sys
+
+from abc import ABC, abstractmethod
+
+try:
+    from _collections_abc import Iterator, MutableMapping
+except ImportError:
+    from collections.abc import Iterator, MutableMapping
+
+from ducktools.classbuilder.prefab import Prefab, attribute
+from ducktools.lazyimporter import LazyImporter, ModuleImport, FromImport
+
+_laz = LazyImporter(
+    [
+        ModuleImport("asyncio"),
+        ModuleImport("json"),
+        ModuleImport("sqlite3"),
+        ModuleImport("tempfile"),
+        ModuleImport("time"),
+        FromImport("threading", "Lock"),
+    ]
+)
+
+# The locking modules are small builtins, import directly
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# Time in seconds to wait for other processes writing to an SQLite cache
+SQLITE_TIMEOUT = 30.0
+
+# Delay between attempts to take a lock that is held elsewhere
+LOCK_POLL_INTERVAL = 0.01
+
+
+class FileLock(Prefab):
+    """
+    Advisory lock held on a file across processes
+
+    Uses fcntl.flock on POSIX and msvcrt.locking on Windows.
+    The lock file is created if it does not exist and is left in place on release.
+
+    Processes that have to wait for the lock create a '.waiting' file next to it
+    so the holder can tell if anything is waiting for its result.
+    """
+    path: str
+    # Maximum time in seconds to wait for the lock, None will wait forever
+    timeout: float | None = None
+
+    _fd: int | None = attribute(default=None, private=True)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    @property
+    def waiting_path(self) -> str:
+        return f"{self.path}.waiting"
+
+    @property
+    def has_waiters(self) -> bool:
+        """
+        :return: True if another process waited for the lock since the
+                 waiters were last cleared
+        """
+        return os.access(self.waiting_path, os.F_OK)
+
+    def clear_waiters(self) -> None:
+        try:
+            os.remove(self.waiting_path)
+        except OSError:
+            pass
+
+    def _mark_waiting(self) -> None:
+        try:
+            with open(self.waiting_path, "w"):
+                pass
+        except OSError:
+            pass
+
+    def _try_lock(self, fd: int, blocking: bool) -> bool:
+        if sys.platform == "win32":
+            try:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            except OSError:
+                return False
+        else:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(fd, flags)
+            except BlockingIOError:
+                return False
+        return True
+
+    def _open(self) -> int:
+        flags = os.O_RDWR | os.O_CREAT
+        try:
+            return os.open(self.path, flags, 0o644)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            return os.open(self.path, flags, 0o644)
+
+    def acquire(self) -> bool:
+        """
+        Take the lock, waiting until it is available
+
+        :return: True if the lock was held by another process and had to be waited for
+        :raises TimeoutError: if the lock is not taken within the timeout
+        """
+        if self._fd is not None:
+            raise RuntimeError(f"Lock on {self.path!r} is already held")
+
+        fd = self._open()
+        try:
+            waited = not self._try_lock(fd, blocking=False)
+            if waited:
+                self._mark_waiting()
+                # msvcrt has no blocking lock without a retry limit so always poll
+                blocking = self.timeout is None and sys.platform != "win32"
+                deadline = None if self.timeout is None else _laz.time.monotonic() + self.timeout
+                while not self._try_lock(fd, blocking):
+                    self._check_deadline(deadline)
+                    _laz.time.sleep(LOCK_POLL_INTERVAL)
+        except BaseException:
+            os.close(fd)
+            raise
+
+        self._fd = fd
+        return waited
+
+    async def aacquire(self) -> bool:
+        """
+        Take the lock, polling without blocking the event loop until it is available
+
+        :return: True if the lock was held by another process and had to be waited for
+        :raises TimeoutError: if the lock is not taken within the timeout
+        """
+        if self._fd is not None:
+            raise RuntimeError(f"Lock on {self.path!r} is already held")
+
+        fd = self._open()
+        try:
+            waited = not self._try_lock(fd, blocking=False)
+            if waited:
+                self._mark_waiting()
+                deadline = None if self.timeout is None else _laz.time.monotonic() + self.timeout
+                while not self._try_lock(fd, blocking=False):
+                    self._check_deadline(deadline)
+                    await _laz.asyncio.sleep(LOCK_POLL_INTERVAL)
+        except BaseException:
+            os.close(fd)
+            raise
+
+        self._fd = fd
+        return waited
+
+    def _check_deadline(self, deadline: float | None) -> None:
+        if deadline is not None and _laz.time.monotonic() >= deadline:
+            raise TimeoutError(
+                f"Could not lock {self.path!r} within {self.timeout} seconds"
+            )
+
+    def release(self) -> None:
+        if (fd := self._fd) is None:
+            return
+        self._fd = None
+        try:
+            if sys.platform == "win32":
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+class CacheStore(MutableMapping, ABC):
+    """
+    Mapping of absolute executable paths to cache entries
+
+    Changes are kept in memory until save is called.
+    """
+    def __init__(self, path: str):
+        self.path = path
+
+    def __repr__(self):
+        return f"{type(self).__name__}(path={self.path!r})"
+
+    @abstractmethod
+    def refresh(self, key: str) -> None:
+        """
+        Discard the in memory copy of an entry, including any unsaved change,
+        so the next lookup gets the entry as currently stored.
+
+        :param key: Absolute path to the runtime .exe
+        """
+
+    @abstractmethod
+    def save(self) -> None:
+        """
+        Write any changes to storage
+        """
+
+    def least_recently_seen(self, count: int) -> list[str]:
+        """
+        Get the keys of the entries with the oldest 'last_seen' times
+
+        :param count: Maximum number of keys to return
+        :return: list of keys, least recently seen first
+        """
+        return sorted(self, key=lambda k: self[k].get("last_seen", 0))[:count]
+
+
+class JSONCacheStore(CacheStore):
+    """
+    Cache stored as a single JSON object, loaded in full on first access
+
+    Changes are recorded so that saving can merge them into the file as it is
+    at the time of saving, instead of overwriting it with this store's data.
+    """
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._data: dict | None = None
+        # Keys set or removed since the last save
+        self._changed: set[str] = set()
+        self._cleared = False
+        # Batch queries update entries from worker threads
+        self._lock = _laz.Lock()
+
+    @property
+    def lock_path(self) -> str:
+        return f"{self.path}.lock"
+
+    def _read_file(self) -> dict:
+        try:
+            with open(self.path) as f:
+                data = _laz.json.load(f)
+        except (_laz.json.JSONDecodeError, FileNotFoundError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self._data = self._read_file()
+        return self._data
+
+    def __getitem__(self, key: str) -> dict:
+        return self.data[key]
+
+    def __setitem__(self, key: str, value: dict) -> None:
+        with self._lock:
+            self.data[key] = value
+            self._changed.add(key)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            del self.data[key]
+            self._changed.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data = {}
+            self._changed = set()
+            self._cleared = True
+
+    def refresh(self, key: str) -> None:
+        stored = self._read_file()
+        with self._lock:
+            if self._cleared:
+                # Entries stored before a clear are no longer valid here
+                stored.pop(key, None)
+            self._changed.discard(key)
+            if key in stored:
+                self.data[key] = stored[key]
+            else:
+                self.data.pop(key, None)
+
+    def save(self) -> None:
+        """
+        Merge the changes made to this store into the cache file
+
+        The file is re-read under a lock and the changed entries are applied
+        on top, so concurrent saves from other processes are not lost.
+        The result is written to a temporary file and moved into place so
+        readers never see a partially written cache.
+        """
+        with self._lock:
+            self._save()
+
+    def _save(self) -> None:
+        if not (self._changed or self._cleared):
+            return
+
+        folder = os.path.dirname(self.path)
+
+        # Taking the lock creates the cache folder if needed
+        with FileLock(self.lock_path):
+            merged = {} if self._cleared else self._read_file()
+            for key in self._changed:
+                if key in self.data:
+                    merged[key] = self.data[key]
+                else:
+                    merged.pop(key, None)
+
+            with _laz.tempfile.NamedTemporaryFile(
+                "w", dir=folder, prefix=".tmp_cache_", suffix=".json", delete=False
+            ) as f:
+                try:
+                    _laz.json.dump(merged, f, indent=4)
+                except BaseException:
+                    f.close()
+                    os.remove(f.name)
+                    raise
+            try:
+                os.replace(f.name, self.path)
+            except OSError:
+                os.remove(f.name)
+                raise
+
+        self._data = merged
+        self._changed = set()
+        self._cleared = False
+
+
+class SQLiteCacheStore(CacheStore):
+    """
+    Cache stored as one JSON encoded row per executable in an SQLite database
+
+    Opening the store does not read any entries, each lookup reads a single row
+    and saving only writes the entries that have been changed or removed.
+    """
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._connection = None
+        # Entries that have been read or changed, None marks a removed entry
+        self._entries: dict[str, dict | None] = {}
+        self._changed: set[str] = set()
+        self._cleared = False
+        # Batch queries look up entries from worker threads
+        self._lock = _laz.Lock()
+
+    def _connect(self, create: bool = False):
+        if self._connection is None:
+            if not create and not os.path.exists(self.path):
+                return None
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # Other processes may be writing, wait for their transactions to finish
+            connection = _laz.sqlite3.connect(
+                self.path, timeout=SQLITE_TIMEOUT, check_same_thread=False
+            )
+            try:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS runtimes "
+                    "(exe_path TEXT PRIMARY KEY, entry TEXT NOT NULL)"
+                )
+                connection.commit()
+            except _laz.sqlite3.DatabaseError:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
+
+    def _read_entry(self, key: str) -> dict | None:
+        if self._cleared:
+            return None
+        try:
+            if (connection := self._connect()) is None:
+                return None
+            row = connection.execute(
+                "SELECT entry FROM runtimes WHERE exe_path = ?", (key,)
+            ).fetchone()
+        except _laz.sqlite3.DatabaseError:
+            return None
+        if row is None:
+            return None
+        try:
+            return _laz.json.loads(row[0])
+        except _laz.json.JSONDecodeError:
+            return None
+
+    def _stored_keys(self) -> list[str]:
+        if self._cleared:
+            return []
+        try:
+            if (connection := self._connect()) is None:
+                return []
+            return [row[0] for row in connection.execute("SELECT exe_path FROM runtimes")]
+        except _laz.sqlite3.DatabaseError:
+            return []
+
+    def _stored_last_seen(self, limit: int) -> list[tuple[str, float]]:
+        if self._cleared:
+            return []
+        if (connection := self._connect()) is None:
+            return []
+        return connection.execute(
+            "SELECT exe_path, COALESCE(json_extract(entry, '$.last_seen'), 0) "
+            "FROM runtimes ORDER BY 2 LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    def __getitem__(self, key: str) -> dict:
+        with self._lock:
+            if key in self._entries:
+                entry = self._entries[key]
+            else:
+                entry = self._entries[key] = self._read_entry(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry
+
+    def __setitem__(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._changed.add(key)
+
+    def __delitem__(self, key: str) -> None:
+        self[key]  # Raise KeyError if the entry does not exist
+        with self._lock:
+            self._entries[key] = None
+            self._changed.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            keys = dict.fromkeys(self._stored_keys())
+            for key, entry in self._entries.items():
+                if entry is None:
+                    keys.pop(key, None)
+                else:
+                    keys[key] = None
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def least_recently_seen(self, count: int) -> list[str]:
+        # Only the 'last_seen' value is read from the stored rows.
+        # Entries held in memory replace their rows, so read enough rows
+        # that 'count' remain after removing them.
+        with self._lock:
+            entries = dict(self._entries)
+            try:
+                rows = self._stored_last_seen(count + len(entries))
+            except _laz.sqlite3.DatabaseError:
+                # json_extract is unavailable or an entry is not valid JSON
+                rows = None
+        if rows is None:
+            return super().least_recently_seen(count)
+
+        last_seen = dict(rows)
+        for key, entry in entries.items():
+            if entry is None:
+                last_seen.pop(key, None)
+            else:
+                last_seen[key] = entry.get("last_seen", 0)
+        return sorted(last_seen, key=last_seen.__getitem__)[:count]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._changed = set()
+            self._cleared = True
+
+    def refresh(self, key: str) -> None:
+        with self._lock:
+            self._changed.discard(key)
+            if self._cleared:
+                self._entries[key] = None
+            else:
+                self._entries.pop(key, None)
+
+    def save(self) -> None:
+        with self._lock:
+            if not (self._changed or self._cleared):
+                return
+            try:
+                connection = self._connect(create=True)
+            except _laz.sqlite3.OperationalError:
+                # Locked by other processes beyond SQLITE_TIMEOUT or not accessible
+                # Keep the changes for the next save
+                return
+            except _laz.sqlite3.DatabaseError:
+                # Replace a file that is not a valid database, as the JSON store does
+                os.remove(self.path)
+                connection = self._connect(create=True)
+            try:
+                with connection:
+                    if self._cleared:
+                        connection.execute("DELETE FROM runtimes")
+                    for key in self._changed:
+                        if (entry := self._entries[key]) is None:
+                            connection.execute("DELETE FROM runtimes WHERE exe_path = ?", (key,))
+                        else:
+                            connection.execute(
+                                "INSERT OR REPLACE INTO runtimes (exe_path, entry) VALUES (?, ?)",
+                                (key, _laz.json.dumps(entry)),
+                            )
+            except _laz.sqlite3.OperationalError:
+                return
+            self._changed = set()
+            self._cleared = False
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def get_cache_store(path: str) -> CacheStore:
+    """
+    Get the cache store for a path, SQLite for .db/.sqlite/.sqlite3 files
+    and JSON otherwise.
+
+    :param path: Path to the cache file
+    :return: CacheStore for the path
+    """
+    if path.endswith(SQLITE_EXTENSIONS):
+        return SQLiteCacheStore(path)
+    return JSONCacheStore(path)
@@ -0,0 +1,338 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Find the paths of possible Python executables without querying them
+
+Candidates are tuples of (executable, managed_by, metadata, on_path) in the
+order that the installs would be listed by get_python_installs.
+"""
+from __future__ import annotations
+
+import os
+import os.path
+import sys
+
+from ducktools.classbuilder.prefab import Prefab, attribute
+from ducktools.lazyimporter import LazyImporter, ModuleImport, FromImport
+
+from .shared import (
+    DetailFinder,
+    PythonInstall,
+    _get_uv_candidates,
+    get_uv_python_path,
+    version_str_to_tuple,
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from packaging.specifiers import SpecifierSet
+
+_laz = LazyImporter(
+    [
+        ModuleImport("re"),
+        FromImport("packaging.specifiers", "SpecifierSet"),
+    ],
+    globs=globals(),
+)
+
+
+Candidate = tuple[str, str | None, dict | None, bool]
+
+
+def get_search_roots() -> tuple[str | None, str | None]:
+    """
+    :return: The pyenv root and uv python folder, None for any that are not found
+    """
+    if sys.platform == "win32":
+        from .win32.pyenv_search import get_pyenv_root
+    else:
+        from .linux.pyenv_search import get_pyenv_root
+
+    return get_pyenv_root(), get_uv_python_path()
+
+
+def get_candidates(
+    finder: DetailFinder,
+    pyenv_root: str | None,
+    uv_root: str | None,
+) -> list[Candidate]:
+    """
+    Get the possible Python executables from every source
+
+    :param finder: DetailFinder for the folder cache and statistics
+    :param pyenv_root: pyenv root folder from get_search_roots
+    :param uv_root: uv python folder from get_search_roots
+    :return: list of candidates in search order
+    """
+    candidates: list[Candidate] = []
+    stats = finder.stats
+
+    if sys.platform == "win32":
+        from .win32.registry_search import _get_registry_candidates
+
+        with stats.source("registry"):
+            for python_path, metadata in _get_registry_candidates():
+                candidates.append((python_path, metadata["Company"], metadata, False))
+
+    if pyenv_root and os.path.exists(versions_folder := os.path.join(pyenv_root, "versions")):
+        if sys.platform == "win32":
+            from .win32.pyenv_search import _get_pyenv_candidates
+        else:
+            from .linux.pyenv_search import _get_pyenv_candidates
+
+        with stats.source("pyenv"):
+            for exe in _get_pyenv_candidates(versions_folder, stats=stats):
+                candidates.append((exe, "pyenv", None, False))
+
+    if uv_root and os.path.exists(uv_root):
+        with stats.source("uv"):
+            for exe in _get_uv_candidates(uv_root, stats=stats):
+                candidates.append((exe, "Astral", None, False))
+
+    if sys.platform != "win32":
+        from .linux import _get_path_folders
+        if sys.platform == "darwin":
+            from .darwin import KNOWN_MANAGED_PATHS
+        else:
+            from .linux import KNOWN_MANAGED_PATHS
+
+        with stats.source("PATH"):
+            for fld, managed_by in _get_path_folders(KNOWN_MANAGED_PATHS, [pyenv_root, uv_root]):
+                for exe in finder.get_folder_candidates(fld):
+                    candidates.append((exe, managed_by, None, True))
+
+    return candidates
+
+
+class CandidateHint(Prefab):
+    """
+    What the name of an executable or its folders suggests about an install
+
+    Any value that could not be worked out from the names is None.
+    """
+    version: tuple[int, ...] | None = None
+    implementation: str | None = None
+    freethreaded: bool | None = None
+
+
+# python3.12, pypy3, python3.13t, python.exe
+_FILENAME_HINT = (
+    r"(?P<implementation>python|pypy|graalpy|micropython)"
+    r"(?P<version>\d+(?:\.\d+)?)?(?P<freethreaded>t)?(?:\.exe)?"
+)
+# 3.12.1, 3.13.0t, pypy3.10-7.3.15 (pyenv)
+# cpython-3.13.0+freethreaded-linux-x86_64-gnu (uv)
+_FOLDER_HINT = (
+    r"(?:(?P<implementation>[a-z]+)-?)?(?P<version>\d+\.\d+(?:\.\d+)?)"
+    r"(?P<freethreaded>t|\+freethreaded)?(?:[-+].*)?"
+)
+# Python312, Python313t (Windows installers)
+_COMPACT_FOLDER_HINT = r"(?P<implementation>python)(?P<major>\d)(?P<minor>\d+)(?P<freethreaded>t)?"
+
+_IMPLEMENTATION_NAMES = {
+    "python": "cpython",
+    "cpython": "cpython",
+    "pypy": "pypy",
+    "graalpy": "graalpy",
+    "micropython": "micropython",
+}
+
+
+def _hint_from_match(match, version: tuple[int, ...] | None) -> CandidateHint:
+    implementation = _IMPLEMENTATION_NAMES.get((match["implementation"] or "").lower())
+    if match["implementation"] and implementation is None:
+        # An unknown prefix, the version may not be a Python version
+        return CandidateHint()
+    if implementation in {"graalpy", "micropython"}:
+        # GraalPy and MicroPython folders carry their own release version
+        # not the version of the Python language they implement
+        version = None
+    elif implementation is None and version:
+        # pyenv names CPython versions without a prefix
+        implementation = "cpython"
+    return CandidateHint(
+        version=version,
+        implementation=implementation,
+        freethreaded=True if match["freethreaded"] else None,
+    )
+
+
+def get_candidate_hint(exe_path: str) -> CandidateHint:
+    """
+    Guess the version and implementation of a possible Python executable
+    from the name of the executable and the names of the folders it is in.
+
+    The most specific version from the executable name and its two closest
+    folders is used. Folders named only with a version are only used inside
+    a pyenv 'versions' folder.
+
+    :param exe_path: Path to a possible Python executable
+    :return: CandidateHint with anything that could be worked out
+    """
+    re = _laz.re
+    hints = []
+
+    if match := re.fullmatch(_FILENAME_HINT, os.path.basename(exe_path), re.IGNORECASE):
+        version = tuple(int(v) for v in match["version"].split(".")) if match["version"] else None
+        hint = _hint_from_match(match, version)
+        if version is None:
+            # python and python.exe say nothing about the implementation
+            hint.implementation = None if hint.implementation == "cpython" else hint.implementation
+        hints.append(hint)
+
+    folder = os.path.dirname(exe_path)
+    for _ in range(2):
+        folder, name = os.path.split(folder)
+        if match := re.fullmatch(_FOLDER_HINT, name, re.IGNORECASE):
+            if not match["implementation"] and os.path.basename(folder).lower() != "versions":
+                # A bare version is only a Python version in a pyenv 'versions' folder
+                # others such as /opt/tool/1.2/bin are the version of something else
+                continue
+            version = tuple(int(v) for v in match["version"].split("."))
+            hints.append(_hint_from_match(match, version))
+        elif match := re.fullmatch(_COMPACT_FOLDER_HINT, name, re.IGNORECASE):
+            version = (int(match["major"]), int(match["minor"]))
+            hints.append(_hint_from_match(match, version))
+
+    if not hints:
+        return CandidateHint()
+
+    best = max(hints, key=lambda h: len(h.version) if h.version else 0)
+    return CandidateHint(
+        version=best.version,
+        implementation=next((h.implementation for h in hints if h.implementation), None),
+        freethreaded=True if any(h.freethreaded for h in hints) else None,
+    )
+
+
+def get_candidate_version(exe_path: str, metadata: dict | None = None) -> tuple[int, ...] | None:
+    """
+    Get the known parts of a candidate's version without querying it
+
+    :param exe_path: Path to a possible Python executable
+    :param metadata: Registry metadata for the candidate, if any
+    :return: Version from the PEP 514 SysVersion or the candidate's names,
+             None if neither gives a version
+    """
+    if metadata and (sys_version := metadata.get("SysVersion")):
+        try:
+            return tuple(int(part) for part in sys_version.split("."))
+        except (ValueError, AttributeError):
+            pass
+    return get_candidate_hint(exe_path).version
+
+
+# Highest minor and micro versions checked when a name only gives part of a version
+MAX_PART_VERSION = 50
+
+
+def specifier_may_include(spec: SpecifierSet, version: tuple[int, ...] | None) -> bool:
+    """
+    Check if a specifier could match an install from a partial version
+
+    :param spec: Version specifier
+    :param version: Version from a CandidateHint, with at least major.minor to check
+    :return: False if no install with this version can match
+    """
+    if version is None or len(version) < 2:
+        return True
+    if len(version) >= 3:
+        return spec.contains(".".join(str(v) for v in version[:3]), prereleases=True)
+
+    major, minor = version
+    return any(
+        spec.contains(f"{major}.{minor}.{micro}", prereleases=True)
+        for micro in range(MAX_PART_VERSION + 1)
+    )
+
+
+class VersionFilter(Prefab):
+    """
+    Only include installs within a range of versions
+
+    Sources skip candidates whose file or folder names rule them out,
+    so they are never queried.
+
+    :param min_version: Lowest version to include, eg: '3.10'
+    :param max_version: Highest version to include, eg: '3.13'
+    :param specifier: Version specifier to satisfy, eg: '~=3.11' or '>=3.10,!=3.12.*'
+    """
+    min_version: str | None = None
+    max_version: str | None = None
+    specifier: str | None = None
+
+    _min_tuple: tuple | None = attribute(default=None, private=True)
+    _max_tuple: tuple | None = attribute(default=None, private=True)
+    _specifier_set: SpecifierSet | None = attribute(default=None, private=True)
+
+    def __prefab_post_init__(self):
+        if self.min_version:
+            self._min_tuple = version_str_to_tuple(self.min_version)
+        if self.max_version:
+            self._max_tuple = version_str_to_tuple(self.max_version)
+        if self.specifier:
+            self._specifier_set = _laz.SpecifierSet(self.specifier)
+
+    def includes(self, install: PythonInstall) -> bool:
+        """
+        :param install: Queried install
+        :return: True if the install satisfies the filter
+        """
+        return not (
+            (self._min_tuple and install.version < self._min_tuple)
+            or (self._max_tuple and install.version > self._max_tuple)
+            or (self._specifier_set and not self._specifier_set.contains(install.version_str))
+        )
+
+    def may_include(self, version: tuple[int, ...] | None) -> bool:
+        """
+        Check if an install with a partially known version could satisfy the filter
+
+        :param version: Known parts of the version, eg: (3, 12) or None if unknown
+        :return: False if the install can be skipped without querying it
+        """
+        if not version:
+            return True
+
+        # Lowest and highest possible versions for the unknown parts
+        padding = 3 - min(len(version), 3)
+        if padding:
+            low = (*version, *([0] * padding), "alpha", 0)
+            high = (*version, *([MAX_PART_VERSION] * padding), "final", MAX_PART_VERSION)
+        else:
+            low = high = (*version[:3], "final", 0)
+
+        return not (
+            (self._min_tuple and high < self._min_tuple)
+            or (self._max_tuple and low > self._max_tuple)
+            or (self._specifier_set and not specifier_may_include(self._specifier_set, version))
+        )
+
+    def may_include_path(self, exe_path: str) -> bool:
+        """
+        Check if a candidate could satisfy the filter from its file and folder names
+
+        :param exe_path: Path to a possible Python executable
+        :return: False if the candidate can be skipped without querying it
+        """
+        return self.may_include(get_candidate_hint(exe_path).version)
@@ -0,0 +1,196 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Client for the discovery server started with `ducktools-pythonfinder serve`.
+
+Requests and responses are single lines of JSON over a Unix domain socket.
+The library functions fall back to searching directly if no server is running.
+"""
+from __future__ import annotations
+
+import os
+import os.path
+
+from ducktools.lazyimporter import LazyImporter, ModuleImport, FromImport
+
+from .shared import CACHE_FOLDER, DetailFinder, PythonInstall
+from .snapshot import SNAPSHOT_ENVIRON, install_from_entry
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .venv import PythonVEnv
+
+
+_laz = LazyImporter(
+    [
+        ModuleImport("json"),
+        ModuleImport("socket"),
+        FromImport(".venv", "PythonVEnv"),
+    ],
+    globs=globals(),
+)
+
+
+# The socket is kept out of the cache folder so clearing the cache does not
+# remove the socket of a running server
+if _runtime_folder := os.environ.get("XDG_RUNTIME_DIR"):
+    SERVER_FOLDER = os.path.join(_runtime_folder, "ducktools-pythonfinder")
+else:
+    SERVER_FOLDER = os.path.join(os.path.dirname(CACHE_FOLDER), "pythonfinder-server")
+SERVER_SOCKET_PATH = os.path.join(SERVER_FOLDER, "server.sock")
+
+# Set this environment variable to stop the library using a running server
+NO_SERVER_ENVIRON = "DUCKTOOLS_PYTHONFINDER_NO_SERVER"
+
+# Maximum time in seconds to wait for a response, a cold search can take a while
+SERVER_TIMEOUT = 30.0
+
+
+class ServerError(Exception):
+    """
+    Raised if the server can not be reached or can not answer a query
+    """
+
+
+def server_available(socket_path: str = SERVER_SOCKET_PATH) -> bool:
+    """
+    Check if a server socket exists and the library is allowed to use it
+
+    This does not connect, a server that has stopped without removing its
+    socket will still appear to be available.
+
+    :param socket_path: Path to the server socket
+    :return: True if there is a socket to connect to
+    """
+    return (
+        not os.environ.get(NO_SERVER_ENVIRON)
+        and hasattr(_laz.socket, "AF_UNIX")
+        and os.path.exists(socket_path)
+    )
+
+
+def query_server(
+    query: str,
+    socket_path: str = SERVER_SOCKET_PATH,
+    timeout: float | None = SERVER_TIMEOUT,
+    **params,
+) -> dict:
+    """
+    Send a query to the server and get the response
+
+    The environment variables that affect a search are sent with every query.
+
+    :param query: Name of the query (ping, installs, venvs, shutdown)
+    :param socket_path: Path to the server socket
+    :param timeout: Maximum time to wait for a response
+    :param params: Additional parameters for the query
+    :return: Response from the server
+    :raises ServerError: if there is no response or the query failed
+    """
+    socket = _laz.socket
+    json = _laz.json
+
+    request = {
+        "query": query,
+        "environ": {name: os.environ.get(name) for name in SNAPSHOT_ENVIRON},
+        **params,
+    }
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        response = json.loads(line)
+    except (OSError, ValueError) as e:
+        raise ServerError(f"No response from server at {socket_path!r}: {e}") from e
+
+    if not isinstance(response, dict) or not response.get("ok"):
+        error = response.get("error") if isinstance(response, dict) else None
+        raise ServerError(error or "Invalid response from server")
+
+    return response
+
+
+def get_server_installs(
+    finder: DetailFinder | None = None,
+    socket_path: str = SERVER_SOCKET_PATH,
+) -> list[PythonInstall] | None:
+    """
+    Get the Python installs from a running server
+
+    :param finder: DetailFinder for any details that are loaded later
+    :param socket_path: Path to the server socket
+    :return: list of installs or None if no server could answer
+    """
+    if not server_available(socket_path):
+        return None
+    try:
+        response = query_server("installs", socket_path)
+    except ServerError:
+        return None
+
+    finder = DetailFinder() if finder is None else finder
+    return [
+        install
+        for entry in response["installs"]
+        if (install := install_from_entry(finder, entry))
+    ]
+
+
+def get_server_venvs(
+    base_dir: str | os.PathLike | None = None,
+    recursive: bool = False,
+    search_parent_folders: bool = False,
+    socket_path: str = SERVER_SOCKET_PATH,
+) -> list[PythonVEnv] | None:
+    """
+    Get the venvs in a folder from a running server
+
+    :param base_dir: Base directory to search venvs, defaults to the working directory
+    :param recursive: Also check subfolders of the base directory
+    :param search_parent_folders: Also search parent folders
+    :param socket_path: Path to the server socket
+    :return: list of venvs or None if no server could answer
+    """
+    if not server_available(socket_path):
+        return None
+
+    base_dir = os.path.abspath(os.getcwd() if base_dir is None else base_dir)
+    try:
+        response = query_server(
+            "venvs",
+            socket_path,
+            base_dir=base_dir,
+            recursive=recursive,
+            search_parent_folders=search_parent_folders,
+        )
+    except ServerError:
+        return None
+
+    return [
+        _laz.PythonVEnv(**{**entry, "version": tuple(entry["version"])})
+        for entry in response["venvs"]
+    ]
@@ -22,14 +22,20 @@
 # SOFTWARE.
 from __future__ import annotations
 
-import itertools
 try:
-    from _collections_abc import Iterator
+    from _collections_abc import Iterator, Mapping
 except ImportError:
-    from collections.abc import Iterator
+    from collections.abc import Iterator, Mapping
 
 from .. import linux
-from ..shared import get_uv_pythons, DetailFinder,PythonInstall
+from ..shared import DetailFinder, PythonInstall
+
+# Searching all sources is shared with linux, only the PATH search differs
+from ..linux import get_python_installs  # noqa: F401
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ..candidates import VersionFilter
 
 
 # This is the difference from the linux methods
@@ -47,28 +53,15 @@ def get_path_pythons(
     *,
     finder: DetailFinder | None = None,
     known_paths: dict[str, str] | None = None,
+    version_filter: VersionFilter | None = None,
+    environ: Mapping[str, str] | None = None,
 ) -> Iterator[PythonInstall]:
 
     known_paths = KNOWN_MANAGED_PATHS if known_paths is None else known_paths
 
-    return linux.get_path_pythons(finder=finder, known_paths=known_paths)
-
-
-def get_python_installs(
-    *,
-    finder: DetailFinder | None = None,
-) -> Iterator[PythonInstall]:
-    listed_pythons = set()
-
-    finder = DetailFinder() if finder is None else finder
-
-    chain_commands = [
-        linux.get_pyenv_pythons(finder=finder),
-        get_uv_pythons(finder=finder),
-        get_path_pythons(finder=finder),
-    ]
-    with finder:
-        for py in itertools.chain.from_iterable(chain_commands):
-            if py.real_executable not in listed_pythons:
-                yield py
-                listed_pythons.add(py.real_executable)
+    return linux.get_path_pythons(
+        finder=finder,
+        known_paths=known_paths,
+        version_filter=version_filter,
+        environ=environ,
+    )
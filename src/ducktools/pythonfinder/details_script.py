@@ -61,7 +61,8 @@ def version_str_to_tuple(version):
     return version_tuple
 
 
-def get_details():
+def get_details(minimal=False):
+    # minimal skips anything that needs sysconfig: the install paths and freethreaded
     try:
         implementation = sys.implementation.name
     except AttributeError:  # pragma: no cover
@@ -90,18 +91,21 @@ def get_details():
             metadata = {"{}_version".format(implementation): imp_ver}
         else:
             metadata = {}
-            if sys.version_info >= (3, 13):
+            if sys.version_info >= (3, 13) and not minimal:
                 import sysconfig
                 freethreaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
                 metadata["freethreaded"] = freethreaded
 
     # Attempt to get the paths to stdlib etc from sysconfig
-    try:
-        import sysconfig  # Exists in 2.7 and 3.2 onwards, missing in earlier and micropython
-    except ImportError:
-        paths = {}
+    if minimal:
+        paths = None
     else:
-        paths = sysconfig.get_paths()
+        try:
+            import sysconfig  # Exists in 2.7 and 3.2 onwards, missing in earlier and micropython
+        except ImportError:
+            paths = {}
+        else:
+            paths = sysconfig.get_paths()
 
     # Use struct to correctly identify GraalPy as 64 bit
     try:
@@ -117,19 +121,73 @@ def get_details():
         architecture=architecture,
         implementation=implementation,
         metadata=metadata,
-        paths=paths,
     )
+    if paths is not None:
+        install["paths"] = paths
 
     return install
 
 
-def main():
+def get_pip_version():
+    try:
+        import pip
+    except ImportError:
+        return None
+    return getattr(pip, "__version__", None)
+
+
+def get_base_executable():
+    return getattr(sys, "_base_executable", None)
+
+
+def get_packages():
+    # Name and version of each distribution installed in purelib
+    try:
+        import sysconfig
+        from importlib.metadata import distributions
+    except ImportError:
+        return None
+
+    purelib = sysconfig.get_paths()["purelib"]
+    packages = [
+        [dist.metadata["Name"], dist.version]
+        for dist in distributions(path=[purelib])
+    ]
+    packages.sort(key=lambda p: (p[0] or "").lower())
+    return packages
+
+
+# Extra details that can be requested by name as arguments to the script
+EXTRAS = {
+    "pip_version": get_pip_version,
+    "base_executable": get_base_executable,
+    "packages": get_packages,
+}
+
+
+def get_extras(names):
+    extras = {}
+    for name in names:
+        try:
+            extras[name] = EXTRAS[name]()
+        except Exception:  # noqa: BLE001 - An extra that fails is reported as unavailable
+            extras[name] = None
+    return extras
+
+
+def main(extras=None, minimal=False):
     import json
 
-    install = get_details()
+    install = get_details(minimal=minimal)
+
+    if extras:
+        install["extras"] = get_extras(extras)
 
     sys.stdout.write(json.dumps(install))
 
 
 if __name__ == "__main__":  # pragma: no cover
-    main()
+    main(
+        extras=[arg for arg in sys.argv[1:] if arg != "--minimal"],
+        minimal="--minimal" in sys.argv[1:],
+    )
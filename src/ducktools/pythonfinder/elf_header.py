@@ -0,0 +1,195 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Read the start of an executable to determine if it can be run natively
+before launching it.
+
+Linux will run foreign architecture binaries through emulators registered
+with binfmt_misc (eg: qemu-user) which makes querying them very slow.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+from ducktools.classbuilder.prefab import Prefab
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Literal
+
+
+ELF_MAGIC = b"\x7fELF"
+SHEBANG = b"#!"
+
+# Only the identification bytes, e_type and e_machine are needed
+ELF_HEADER_SIZE = 20
+
+ET_EXEC = 2
+ET_DYN = 3
+
+# e_machine values for common architectures
+MACHINE_NAMES = {
+    3: "x86",
+    8: "mips",
+    20: "ppc",
+    21: "ppc64",
+    22: "s390",
+    40: "arm",
+    62: "x86_64",
+    183: "aarch64",
+    243: "riscv",
+    258: "loongarch",
+}
+
+# os.uname().machine values and the e_machine values they run natively
+UNAME_MACHINES = {
+    "x86_64": {62, 3},
+    "amd64": {62, 3},
+    "i386": {3},
+    "i486": {3},
+    "i586": {3},
+    "i686": {3},
+    # Most 64-bit ARM kernels can also run 32-bit ARM executables
+    "aarch64": {183, 40},
+    "arm64": {183, 40},
+    "armv6l": {40},
+    "armv7l": {40},
+    "armv8l": {40},
+    "ppc": {20},
+    "ppc64": {21},
+    "ppc64le": {21},
+    "s390x": {22},
+    "mips": {8},
+    "mips64": {8},
+    "riscv64": {243},
+    "loongarch64": {258},
+}
+
+
+class ExecutableHeader(Prefab):
+    """
+    Details of an executable read from the start of the file.
+
+    format is 'elf' for ELF binaries, 'script' for files starting with
+    a shebang and 'unknown' for anything else.
+    """
+    format: str
+    bits: int | None = None
+    little_endian: bool | None = None
+    elf_type: int | None = None
+    machine: int | None = None
+
+    @property
+    def architecture(self) -> str | None:
+        """
+        Architecture in the same format as platform.architecture()[0]
+        """
+        return f"{self.bits}bit" if self.bits else None
+
+    @property
+    def machine_name(self) -> str | None:
+        if self.machine is None:
+            return None
+        return MACHINE_NAMES.get(self.machine, f"unknown ({self.machine})")
+
+
+def read_executable_header(path: str | os.PathLike) -> ExecutableHeader:
+    """
+    Read the header of an executable without running it.
+
+    :param path: Path to the executable
+    :return: ExecutableHeader with the format of the executable and
+             architecture details for ELF files
+    :raises OSError: If the file can not be read
+    """
+    with open(path, "rb") as f:
+        data = f.read(ELF_HEADER_SIZE)
+
+    if data.startswith(SHEBANG):
+        return ExecutableHeader(format="script")
+
+    if not data.startswith(ELF_MAGIC) or len(data) < ELF_HEADER_SIZE:
+        return ExecutableHeader(format="unknown")
+
+    ei_class, ei_data = data[4], data[5]
+    if ei_class not in {1, 2} or ei_data not in {1, 2}:
+        return ExecutableHeader(format="unknown")
+
+    byteorder: Literal["little", "big"] = "little" if ei_data == 1 else "big"
+
+    return ExecutableHeader(
+        format="elf",
+        bits=32 if ei_class == 1 else 64,
+        little_endian=(ei_data == 1),
+        elf_type=int.from_bytes(data[16:18], byteorder),
+        machine=int.from_bytes(data[18:20], byteorder),
+    )
+
+
+_native_machines: frozenset[int] | None = None
+
+
+def get_native_machines() -> frozenset[int]:
+    """
+    Get the ELF machine types that can run without emulation.
+
+    This is the machine of the running interpreter along with any the
+    kernel architecture is known to support.
+    """
+    global _native_machines
+    if _native_machines is None:
+        machines = set(UNAME_MACHINES.get(os.uname().machine, set()))
+        try:
+            header = read_executable_header(sys.executable)
+        except OSError:
+            pass
+        else:
+            if header.machine is not None:
+                machines.add(header.machine)
+        _native_machines = frozenset(machines)
+
+    return _native_machines
+
+
+def can_run_natively(header: ExecutableHeader) -> bool:
+    """
+    Check if an executable can be run without going through an emulator.
+
+    :param header: ExecutableHeader from read_executable_header
+    :return: False if the executable is an ELF file for a foreign architecture,
+             an ELF file that is not executable or a file in an unknown format
+    """
+    if header.format == "script":
+        return True
+    elif header.format == "elf":
+        native_machines = get_native_machines()
+        if not native_machines:
+            # Unknown platform, assume the executable will run
+            return header.elf_type in {ET_EXEC, ET_DYN}
+        return (
+            header.elf_type in {ET_EXEC, ET_DYN}
+            and header.machine in native_machines
+            and header.little_endian == (sys.byteorder == "little")
+        )
+    return False
@@ -0,0 +1,195 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Find a single Python install that satisfies a version specifier.
+
+Rather than querying every install, the candidates are ordered by what their
+names suggest and queried one at a time until one matches.
+"""
+from __future__ import annotations
+
+import os.path
+
+from ducktools.lazyimporter import LazyImporter, FromImport
+
+from .candidates import (
+    CandidateHint,
+    get_candidate_hint,
+    get_candidates,
+    get_search_roots,
+    specifier_may_include,
+)
+from .shared import DetailFinder, PythonInstall
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from packaging.specifiers import SpecifierSet
+
+
+_laz = LazyImporter(
+    [
+        FromImport("packaging.specifiers", "SpecifierSet"),
+    ],
+    globs=globals(),
+)
+
+
+# Candidates are queried in order of how likely they are to match
+HINT_MATCH = 0
+HINT_UNKNOWN = 1
+HINT_MISMATCH = 2
+
+
+def _get_specifier(spec: str | SpecifierSet | None) -> SpecifierSet | None:
+    if not isinstance(spec, str):
+        return spec
+    spec = spec.strip()
+    if spec[:1].isdigit():
+        # A bare version such as '3.12' means any release of that version
+        spec = f"=={spec}.*"
+    return _laz.SpecifierSet(spec)
+
+
+def _version_likelihood(hint_version: tuple[int, ...] | None, spec: SpecifierSet | None) -> int:
+    if spec is None:
+        return HINT_MATCH
+    if hint_version is None or len(hint_version) < 2:
+        return HINT_UNKNOWN
+
+    return HINT_MATCH if specifier_may_include(spec, hint_version) else HINT_MISMATCH
+
+
+def get_likelihood(
+    hint: CandidateHint,
+    spec: SpecifierSet | None = None,
+    implementation: str | None = None,
+    freethreaded: bool | None = None,
+) -> int:
+    """
+    Rate how likely a candidate is to match the requirements from its hint
+
+    :param hint: CandidateHint from the candidate's path
+    :param spec: Version specifier the install should satisfy
+    :param implementation: Required implementation name (eg: 'cpython', 'pypy')
+    :param freethreaded: Require a free-threaded (True) or standard (False) build
+    :return: HINT_MATCH, HINT_UNKNOWN or HINT_MISMATCH
+    """
+    likelihood = _version_likelihood(hint.version, spec)
+
+    if implementation is not None:
+        if hint.implementation is None:
+            likelihood = max(likelihood, HINT_UNKNOWN)
+        elif hint.implementation != implementation:
+            likelihood = HINT_MISMATCH
+
+    if freethreaded is True:
+        if hint.version and hint.version < (3, 13):
+            likelihood = HINT_MISMATCH
+        elif not hint.freethreaded:
+            likelihood = max(likelihood, HINT_UNKNOWN)
+    elif freethreaded is False and hint.freethreaded:
+        likelihood = HINT_MISMATCH
+
+    return likelihood
+
+
+def install_matches(
+    install: PythonInstall,
+    spec: SpecifierSet | None = None,
+    implementation: str | None = None,
+    freethreaded: bool | None = None,
+) -> bool:
+    """
+    Check if an install satisfies the requirements given to find_python
+    """
+    return (
+        (spec is None or spec.contains(install.version_str))
+        and (implementation is None or install.implementation == implementation)
+        and (
+            freethreaded is None
+            or bool(install.metadata.get("freethreaded", False)) == freethreaded
+        )
+    )
+
+
+def find_python(
+    spec: str | SpecifierSet | None = None,
+    implementation: str | None = None,
+    freethreaded: bool | None = None,
+    *,
+    finder: DetailFinder | None = None,
+) -> PythonInstall | None:
+    """
+    Find a Python install that satisfies a version specifier
+
+    Candidates whose names suggest they match (eg: 'python3.12' or a pyenv
+    '3.12.1' folder) are queried first, newest first, followed by candidates
+    that could match and finally those that are unlikely to. Candidates are
+    queried one at a time and the search stops at the first match.
+
+    :param spec: Version specifier such as '>=3.11' or a bare version such as
+                 '3.12' for any 3.12 release. None accepts any version.
+    :param implementation: Required implementation name (eg: 'cpython', 'pypy')
+    :param freethreaded: Require a free-threaded (True) or standard (False) build
+    :param finder: DetailFinder used to get and cache install details
+    :return: The first matching PythonInstall or None if no install matches
+    """
+    specifier = _get_specifier(spec)
+    implementation = implementation.lower() if implementation else None
+    finder = DetailFinder() if finder is None else finder
+
+    with finder:
+        candidates = get_candidates(finder, *get_search_roots())
+
+        # Mark PATH candidates that are shadowed by an earlier folder
+        ordered = []
+        path_names: set[str] = set()
+        for exe, managed_by, metadata, on_path in candidates:
+            shadowed = False
+            if on_path:
+                name = os.path.basename(exe)
+                shadowed = name in path_names
+                path_names.add(name)
+
+            hint = get_candidate_hint(exe)
+            likelihood = get_likelihood(hint, specifier, implementation, freethreaded)
+            ordered.append((likelihood, hint.version or (), exe, managed_by, metadata, shadowed))
+
+        # Newest first within each likelihood, keeping search order for equal hints
+        ordered.sort(key=lambda c: c[1], reverse=True)
+        ordered.sort(key=lambda c: c[0])
+
+        queried: set[str] = set()
+        for _, _, exe, managed_by, metadata, shadowed in ordered:
+            # PATH often has several names for the same executable
+            real_exe = os.path.realpath(exe)
+            if real_exe in queried:
+                continue
+            queried.add(real_exe)
+
+            install = finder.get_install_details(exe, managed_by=managed_by, metadata=metadata)
+            if install and install_matches(install, specifier, implementation, freethreaded):
+                install.shadowed = shadowed
+                return install
+
+    return None
@@ -24,21 +24,33 @@ from __future__ import annotations
 
 import os
 import os.path
-import itertools
+import functools
 
 try:
-    from _collections_abc import Iterator
+    from _collections_abc import Iterable, Iterator, Mapping
 except ImportError:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator, Mapping
+
+from ducktools.lazyimporter import LazyImporter, FromImport
 
 from ..shared import (
     DetailFinder,
     PythonInstall,
-    get_folder_pythons,
-    get_uv_pythons,
-    get_uv_python_path
+    get_uv_python_path,
+    search_sources,
+)
+from ..snapshot import search_with_snapshot
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ..candidates import VersionFilter
+
+_laz = LazyImporter(
+    [
+        FromImport(".pyenv_search", "get_pyenv_root"),
+    ],
+    globs=globals(),
 )
-from .pyenv_search import get_pyenv_pythons, get_pyenv_root
 
 
 KNOWN_MANAGED_PATHS = {
@@ -49,22 +61,17 @@ KNOWN_MANAGED_PATHS = {
 }
 
 
-def get_path_pythons(
-    *,
-    finder: DetailFinder | None = None,
-    known_paths: dict[str, str] | None = None,
-) -> Iterator[PythonInstall]:
-
-    exe_names = set()
-
-    path_folders = os.environ.get("PATH", "").split(":")
-    pyenv_root = get_pyenv_root()
-    uv_root = get_uv_python_path()
-
-    excluded_folders = [pyenv_root, uv_root]
-
-    finder = DetailFinder() if finder is None else finder
-    known_paths = KNOWN_MANAGED_PATHS if known_paths is None else known_paths
+def _get_path_folders(
+    known_paths: dict[str, str],
+    excluded_folders: list[str | None],
+    environ: Mapping[str, str] | None = None,
+) -> Iterator[tuple[str, str | None]]:
+    """
+    Yield the folders on PATH that should be searched along with the
+    tool that manages each folder (if known)
+    """
+    environ = os.environ if environ is None else environ
+    path_folders = environ.get("PATH", "").split(":")
 
     for fld in path_folders:
         # Don't retrieve pyenv installs
@@ -88,30 +95,77 @@ def get_path_pythons(
         else:
             managed_by = None
 
-        for install in get_folder_pythons(fld, finder=finder, managed_by=managed_by):
-            name = os.path.basename(install.executable)
-            if name in exe_names:
-                install.shadowed = True
+        yield fld, managed_by
+
+
+def get_path_pythons(
+    *,
+    finder: DetailFinder | None = None,
+    known_paths: dict[str, str] | None = None,
+    version_filter: VersionFilter | None = None,
+    environ: Mapping[str, str] | None = None,
+) -> Iterator[PythonInstall]:
+
+    exe_names = set()
+
+    pyenv_root = _laz.get_pyenv_root(environ)
+    uv_root = get_uv_python_path()
+
+    excluded_folders = [pyenv_root, uv_root]
+
+    finder = DetailFinder() if finder is None else finder
+    known_paths = KNOWN_MANAGED_PATHS if known_paths is None else known_paths
+
+    for fld, managed_by in _get_path_folders(known_paths, excluded_folders, environ):
+        candidates = []
+        for exe in finder.get_folder_candidates(fld):
+            if version_filter and not version_filter.may_include_path(exe):
+                # Not queried, but it still shadows later executables with the same name
+                exe_names.add(os.path.basename(exe))
             else:
-                exe_names.add(name)
-            yield install
+                candidates.append(exe)
+
+        with finder:
+            for install in finder.get_many_install_details(candidates, managed_by=managed_by):
+                if not install:
+                    continue
+
+                name = os.path.basename(install.executable)
+                if name in exe_names:
+                    install.shadowed = True
+                else:
+                    exe_names.add(name)
+
+                if version_filter is None or version_filter.includes(install):
+                    yield install
+
+
+def _get_search_folders(environ: Mapping[str, str] | None = None) -> list[str]:
+    # Folders scanned by get_python_installs, used for the snapshot fingerprint
+    environ = os.environ if environ is None else environ
+    folders = environ.get("PATH", "").split(":")
+    if pyenv_root := _laz.get_pyenv_root(environ):
+        folders.append(os.path.join(pyenv_root, "versions"))
+    if uv_root := get_uv_python_path():
+        folders.append(uv_root)
+    return folders
 
 
 def get_python_installs(
     *,
     finder: DetailFinder | None = None,
+    version_filter: VersionFilter | None = None,
+    sources: Iterable[str] | None = None,
 ) -> Iterator[PythonInstall]:
-    listed_bins: set[str] = set()
-
     finder = DetailFinder() if finder is None else finder
 
-    chain_commands: list[Iterator[PythonInstall]] = [
-        get_pyenv_pythons(finder=finder),
-        get_uv_pythons(finder=finder),
-        get_path_pythons(finder=finder),
-    ]
-    with finder:
-        for py in itertools.chain.from_iterable(chain_commands):
-            if py.real_executable not in listed_bins:
-                yield py
-                listed_bins.add(py.real_executable)
+    # The snapshot is of a search of the default sources
+    if finder.use_snapshot and sources is None:
+        yield from search_with_snapshot(
+            functools.partial(search_sources, version_filter=version_filter),
+            finder,
+            _get_search_folders(),
+            version_filter=version_filter,
+        )
+    else:
+        yield from search_sources(finder, version_filter, sources)
@@ -30,77 +30,96 @@ import os
 import os.path
 
 try:
-    from _collections_abc import Iterator
+    from _collections_abc import Iterator, Mapping
 except ImportError:
-    from collections.abc import Iterator
+    from collections.abc import Iterator, Mapping
 
 from ducktools.lazyimporter import LazyImporter, FromImport, ModuleImport
 
-from ..shared import PythonInstall, DetailFinder, INSTALLER_CACHE_PATH
+from ..shared import (
+    PythonInstall,
+    DetailFinder,
+    _get_installer_folder,
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ..candidates import VersionFilter
+    from ..stats import DiscoveryStats
 
 _laz = LazyImporter(
     [
-        ModuleImport("json"),
         ModuleImport("re"),
         FromImport("subprocess", "run"),
     ]
 )
 
 
-def get_pyenv_root() -> str | None:
+def _find_pyenv_root() -> str | None:
+    try:
+        output = _laz.run(["pyenv", "root"], capture_output=True, text=True)
+    except FileNotFoundError:
+        return None
+    return output.stdout.strip()
+
+
+def get_pyenv_root(environ: Mapping[str, str] | None = None) -> str | None:
     # Check if the environment variable exists, if so use that
     # As a backup try to run pyenv to obtain the root folder
-    pyenv_root = os.environ.get("PYENV_ROOT")
+    environ = os.environ if environ is None else environ
+    pyenv_root = environ.get("PYENV_ROOT")
     if not pyenv_root:
-        try:
-            with open(INSTALLER_CACHE_PATH) as f:
-                installer_cache = _laz.json.load(f)
-        except (FileNotFoundError, _laz.json.JSONDecodeError):
-            installer_cache = {}
-
-        pyenv_root = installer_cache.get("pyenv")
-        if pyenv_root is None or not os.path.exists(pyenv_root):
-            try:
-                output = _laz.run(["pyenv", "root"], capture_output=True, text=True)
-            except FileNotFoundError:
-                return None
-
-            pyenv_root = output.stdout.strip()
-
-            installer_cache["pyenv"] = pyenv_root
-            os.makedirs(os.path.dirname(INSTALLER_CACHE_PATH), exist_ok=True)
-            with open(INSTALLER_CACHE_PATH, 'w') as f:
-                _laz.json.dump(installer_cache, f)
+        pyenv_root = _get_installer_folder("pyenv", _find_pyenv_root)
 
     return pyenv_root
 
 
+def _get_pyenv_candidates(
+    versions_folder: str | os.PathLike,
+    stats: DiscoveryStats | None = None,
+) -> Iterator[str]:
+    """
+    Yield the paths of the Python executables in the pyenv versions folder
+    """
+    if stats:
+        stats.count_scandir()
+    # Sorting puts standard python versions before alternate implementations
+    # This can lead to much faster returns by potentially yielding
+    # the required python version before checking pypy/graalpy/micropython
+    for p in sorted(os.scandir(str(versions_folder)), key=lambda x: x.path):
+        # Don't include folders that are venvs
+        venv_indicator = os.path.join(p.path, "pyvenv.cfg")
+        if stats:
+            stats.count_stat(2)
+        if os.path.exists(venv_indicator):
+            continue
+
+        executable = os.path.join(p.path, "bin/python")
+        if os.path.exists(executable):
+            yield executable
+
+
 def get_pyenv_pythons(
     versions_folder: str | os.PathLike | None = None,
     *,
     finder: DetailFinder | None = None,
+    version_filter: VersionFilter | None = None,
+    environ: Mapping[str, str] | None = None,
 ) -> Iterator[PythonInstall]:
-    if versions_folder is None and (pyenv_root := get_pyenv_root()):
+    if versions_folder is None and (pyenv_root := get_pyenv_root(environ)):
         versions_folder = os.path.join(pyenv_root, "versions")
 
     if versions_folder is None or not os.path.exists(versions_folder):
         return
 
-    # Sorting puts standard python versions before alternate implementations
-    # This can lead to much faster returns by potentially yielding
-    # the required python version before checking pypy/graalpy/micropython
-
     finder = DetailFinder() if finder is None else finder
 
+    candidates = _get_pyenv_candidates(versions_folder, stats=finder.stats)
+    if version_filter:
+        # pyenv folders are named after the version they hold
+        candidates = filter(version_filter.may_include_path, candidates)
+
     with finder:
-        for p in sorted(os.scandir(str(versions_folder)), key=lambda x: x.path):
-            # Don't include folders that are venvs
-            venv_indicator = os.path.join(p.path, "pyvenv.cfg")
-            if os.path.exists(venv_indicator):
-                continue
-
-            executable = os.path.join(p.path, "bin/python")
-            if os.path.exists(executable):
-                install = finder.get_install_details(executable, managed_by="pyenv")
-                if install:
-                    yield install
+        for install in finder.get_many_install_details(candidates, managed_by="pyenv"):
+            if install and (version_filter is None or version_filter.includes(install)):
+                yield install
@@ -0,0 +1,428 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Watch the folders searched for Python installs and report changes as they happen.
+
+inotify is used through ctypes where it is available, otherwise the folders
+are polled. Only the Python executables in the folders that changed are
+checked, so unrelated changes such as installing a package into a venv do not
+start a search. When these executables have changed the search is run again,
+the folder and details caches mean only new or modified executables are queried.
+"""
+from __future__ import annotations
+
+import os
+import os.path
+import select
+import struct
+import threading
+import time
+
+try:
+    from _collections_abc import Iterable, Iterator
+except ImportError:
+    from collections.abc import Iterable, Iterator
+
+from ducktools.classbuilder.prefab import Prefab, attribute
+from ducktools.lazyimporter import LazyImporter, ModuleImport
+
+from ..shared import DetailFinder, PythonInstall, get_uv_python_path, search_sources
+from . import _get_search_folders
+from .pyenv_search import get_pyenv_root
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import ctypes
+
+
+_laz = LazyImporter(
+    [
+        ModuleImport("ctypes"),
+    ]
+)
+
+
+INSTALL_ADDED = "added"
+INSTALL_REMOVED = "removed"
+INSTALL_CHANGED = "changed"
+
+# Time with no further changes before checking the changed folders
+WATCH_SETTLE_TIME = 0.1
+
+# inotify constants from <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+INOTIFY_MASK = (
+    IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+
+# struct inotify_event header: wd, mask, cookie, len
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InstallEvent(Prefab):
+    """
+    A change to the discoverable Python installs
+
+    :param event: One of INSTALL_ADDED, INSTALL_REMOVED or INSTALL_CHANGED
+    :param install: The install that was added or changed, or the last
+                    details of the install that was removed
+    """
+    event: str
+    install: PythonInstall
+
+
+def _get_path_stamp(path: str) -> list[int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_ino, st.st_size]
+
+
+class _PollWatcher(Prefab):
+    """
+    Detect changes by comparing stat results of folders and files
+    """
+    _stamps: dict[str, list[int] | None] = attribute(default_factory=dict, private=True)
+    _files: set[str] = attribute(default_factory=set, private=True)
+
+    def update(self, folders: Iterable[str], files: Iterable[str] = ()) -> None:
+        """
+        Set the paths to watch, paths already watched keep their previous state
+
+        :param folders: Folders to watch for changes to their contents
+        :param files: Files to watch for modification
+        """
+        self._files = set(files)
+        paths = {*folders, *self._files}
+        for path in self._stamps.keys() - paths:
+            del self._stamps[path]
+        for path in paths - self._stamps.keys():
+            self._stamps[path] = _get_path_stamp(path)
+
+    def check(self) -> set[str]:
+        """
+        :return: The folders that have changed, or hold files that have changed,
+                 since the last check
+        """
+        changed = set()
+        for path, stamp in self._stamps.items():
+            if (new_stamp := _get_path_stamp(path)) != stamp:
+                self._stamps[path] = new_stamp
+                changed.add(os.path.dirname(path) if path in self._files else path)
+        return changed
+
+    def wait(self, timeout: float) -> set[str]:
+        time.sleep(timeout)
+        return self.check()
+
+    def close(self) -> None:
+        self._stamps.clear()
+        self._files.clear()
+
+
+class _InotifyWatcher(Prefab):
+    """
+    Detect changes to folders with inotify
+
+    Folders that can not be watched, usually because they do not exist yet,
+    are polled each time wait times out.
+    """
+    _fd: int = attribute(default=-1, private=True)
+    _libc: ctypes.CDLL | None = attribute(default=None, private=True)
+    _watches: dict[str, int] = attribute(default_factory=dict, private=True)
+    _unwatched: _PollWatcher = attribute(default_factory=_PollWatcher, private=True)
+
+    def open(self) -> None:
+        """
+        :raises OSError: if inotify is not available
+        """
+        ctypes = _laz.ctypes
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            inotify_init1 = libc.inotify_init1
+        except (OSError, AttributeError) as e:
+            raise OSError(f"inotify is not available: {e}") from e
+
+        fd = inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self._libc = libc
+        self._fd = fd
+
+    def update(self, folders: Iterable[str], files: Iterable[str] = ()) -> None:
+        """
+        Set the folders to watch, changes to files are seen through their folders
+
+        :param folders: Folders to watch for changes to their contents
+        :param files: Ignored, only used for polling
+        """
+        assert self._libc is not None, "update called before open"
+        folders = set(folders)
+
+        for folder in self._watches.keys() - folders:
+            self._libc.inotify_rm_watch(self._fd, self._watches.pop(folder))
+
+        unwatched = []
+        for folder in folders - self._watches.keys():
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), INOTIFY_MASK)
+            if wd < 0:
+                unwatched.append(folder)
+            else:
+                self._watches[folder] = wd
+
+        self._unwatched.update(unwatched)
+
+    def _read_events(self) -> set[str]:
+        data = b""
+        while True:
+            try:
+                chunk = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            data += chunk
+
+        # Events for watches removed by update are for folders no longer watched
+        folders = {wd: folder for folder, wd in self._watches.items()}
+        changed = set()
+
+        # Forget watches removed by the kernel when their folder was deleted
+        # so they are added again by the next update
+        offset = 0
+        removed_wds = set()
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            if (folder := folders.get(wd)) is not None:
+                changed.add(folder)
+            if mask & IN_IGNORED:
+                removed_wds.add(wd)
+            offset += _EVENT_HEADER.size + name_len
+
+        if removed_wds:
+            self._watches = {
+                folder: wd for folder, wd in self._watches.items() if wd not in removed_wds
+            }
+
+        return changed
+
+    def wait(self, timeout: float) -> set[str]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if readable:
+            return self._read_events()
+        return self._unwatched.check()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._watches.clear()
+        self._unwatched.close()
+
+
+def _get_install_roots() -> list[str]:
+    # Folders holding one folder per install, each with a bin folder
+    roots = []
+    if pyenv_root := get_pyenv_root():
+        roots.append(os.path.join(pyenv_root, "versions"))
+    if uv_root := get_uv_python_path():
+        roots.append(uv_root)
+    return roots
+
+
+def _get_watch_folders(installs: Iterable[PythonInstall]) -> tuple[set[str], set[str]]:
+    """
+    Get the folders where a change could change the result of a search
+
+    :return: (folders that hold executables,
+              install folders where any change needs a new search)
+    """
+    install_roots = _get_install_roots()
+    folders = {fld for fld in _get_search_folders() if fld}
+    structure_folders = set(install_roots)
+
+    for root in install_roots:
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        structure_folders.add(entry.path)
+                        folders.add(os.path.join(entry.path, "bin"))
+        except OSError:
+            pass
+
+    for install in installs:
+        folders.add(os.path.dirname(install.executable))
+        folders.add(os.path.dirname(install.real_executable))
+
+    return folders - structure_folders, structure_folders
+
+
+def _get_folder_executables(
+    finder: DetailFinder,
+    folder: str,
+    known_executables: dict[str, set[str]],
+) -> dict[str, list[int] | None] | None:
+    """
+    Get the state of the possible Python executables in a folder
+
+    :param finder: DetailFinder used to list the folder
+    :param folder: Folder to check
+    :param known_executables: Executables of found installs by folder, these are
+                              included even if their names are not recognised
+    :return: stamps of the executables by path or None if the folder can not be read
+    """
+    try:
+        executables = {*finder.get_folder_candidates(folder), *known_executables.get(folder, ())}
+    except OSError:
+        return None
+    return {exe: _get_path_stamp(exe) for exe in executables}
+
+
+def _get_known_executables(installs: Iterable[PythonInstall]) -> dict[str, set[str]]:
+    known_executables: dict[str, set[str]] = {}
+    for install in installs:
+        for exe in (install.executable, install.real_executable):
+            known_executables.setdefault(os.path.dirname(exe), set()).add(exe)
+    return known_executables
+
+
+def _get_watcher(use_inotify: bool) -> _InotifyWatcher | _PollWatcher:
+    if use_inotify:
+        watcher = _InotifyWatcher()
+        try:
+            watcher.open()
+        except OSError:
+            pass
+        else:
+            return watcher
+    return _PollWatcher()
+
+
+def watch_python_installs(
+    *,
+    finder: DetailFinder | None = None,
+    poll_interval: float = 1.0,
+    stop: threading.Event | None = None,
+    use_inotify: bool = True,
+) -> Iterator[InstallEvent]:
+    """
+    Yield events as Python installs are added, removed or changed
+
+    The installs found when the watch starts are yielded as added events first.
+    The folders searched by get_pyenv_pythons, get_uv_pythons and get_path_pythons
+    are watched with inotify if it is available and polled otherwise.
+
+    :param finder: DetailFinder used to get and cache install details
+    :param poll_interval: Time in seconds between polls and checks of stop
+    :param stop: Event to set to end the watch, otherwise close the generator
+    :param use_inotify: Use inotify if it is available
+    :yield: InstallEvent for each change
+    """
+    finder = DetailFinder() if finder is None else finder
+    watcher = _get_watcher(use_inotify)
+    installs: dict[str, PythonInstall] = {}
+    # Executables in each watched folder as of the last search
+    folder_states: dict[str, dict | None] = {}
+    structure_folders: set[str] = set()
+
+    def update_watcher() -> set[str]:
+        folders, structure = _get_watch_folders(installs.values())
+        watcher.update(
+            folders | structure,
+            (install.real_executable for install in installs.values()),
+        )
+        known_executables = _get_known_executables(installs.values())
+        for folder in folders - folder_states.keys():
+            folder_states[folder] = _get_folder_executables(finder, folder, known_executables)
+        return structure
+
+    def needs_search(changed: set[str]) -> bool:
+        known_executables = _get_known_executables(installs.values())
+        return any(
+            folder in structure_folders
+            or folder not in folder_states
+            or _get_folder_executables(finder, folder, known_executables)
+            != folder_states[folder]
+            for folder in changed
+        )
+
+    try:
+        while True:
+            # Watch and record the folders before searching
+            # so changes made during the search are seen
+            folder_states = {}
+            structure_folders = update_watcher()
+
+            found = {install.executable: install for install in search_sources(finder)}
+
+            events = [
+                InstallEvent(INSTALL_REMOVED, install)
+                for executable, install in installs.items()
+                if executable not in found
+            ]
+            for executable, install in found.items():
+                if (previous := installs.get(executable)) is None:
+                    events.append(InstallEvent(INSTALL_ADDED, install))
+                elif previous != install:
+                    events.append(InstallEvent(INSTALL_CHANGED, install))
+
+            # Watch any new folders and executables before handing over the events
+            installs = found
+            structure_folders |= update_watcher()
+
+            yield from events
+
+            while True:
+                while not (changed := watcher.wait(poll_interval)):
+                    if stop and stop.is_set():
+                        return
+
+                # Wait for a batch of changes such as a new install to finish
+                while more_changed := watcher.wait(WATCH_SETTLE_TIME):
+                    changed |= more_changed
+
+                if stop and stop.is_set():
+                    return
+
+                # Only search again if the Python executables have changed
+                if needs_search(changed):
+                    break
+    finally:
+        watcher.close()
@@ -0,0 +1,305 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Long running discovery server answering queries over a Unix domain socket.
+
+Search results are kept in memory with the fingerprint used for snapshots and
+are only searched again when the fingerprint no longer matches, so most
+queries are answered after a handful of stat calls.
+
+Each request is one line of JSON with a 'query' key and each response is one
+line of JSON with an 'ok' key:
+
+    {"query": "ping"}
+    {"query": "installs", "environ": {"PATH": ..., "PYENV_ROOT": ...}}
+    {"query": "venvs", "base_dir": ..., "recursive": false, "search_parent_folders": false}
+    {"query": "shutdown"}
+"""
+from __future__ import annotations
+
+import os
+import os.path
+import socketserver
+import sys
+import threading
+
+from ducktools.classbuilder.prefab import Prefab, attribute, as_dict
+from ducktools.lazyimporter import LazyImporter, ModuleImport
+
+from ._version import __version__
+from .client import SERVER_SOCKET_PATH
+from .shared import DetailFinder, search_sources
+from .snapshot import (
+    SNAPSHOT_ENVIRON,
+    fingerprint_matches,
+    get_fingerprint,
+    make_snapshot,
+    snapshot_matches,
+)
+from .venv import _search_python_venvs
+
+if sys.platform != "win32":
+    from .linux import _get_search_folders
+
+_laz = LazyImporter(
+    [
+        ModuleImport("json"),
+        ModuleImport("socket"),
+    ]
+)
+
+
+# Maximum number of search results of each kind kept in memory, the least
+# recently used are dropped first. Clients choose the keys for these results.
+MAX_STORED_RESULTS = 64
+
+
+def _get_result(results: dict, key: tuple):
+    # Move a used result to the end so it is dropped last
+    if (result := results.pop(key, None)) is not None:
+        results[key] = result
+    return result
+
+
+def _store_result(results: dict, key: tuple, result) -> None:
+    results.pop(key, None)
+    results[key] = result
+    while len(results) > MAX_STORED_RESULTS:
+        del results[next(iter(results))]
+
+
+class DiscoveryServer(Prefab):
+    """
+    Keep discovered installs and venvs in memory and answer queries about them
+
+    Use serve_forever to listen on the socket or handle_request to answer a
+    request directly.
+    """
+    socket_path: str = SERVER_SOCKET_PATH
+    finder: DetailFinder = attribute(default_factory=DetailFinder)
+
+    # Snapshots of searches for each set of environment variables
+    # in order of last use, see MAX_STORED_RESULTS
+    _install_snapshots: dict = attribute(default_factory=dict, private=True)
+    # (fingerprint, venv entries) for each non-recursive venv query
+    # in order of last use, see MAX_STORED_RESULTS
+    _venv_results: dict = attribute(default_factory=dict, private=True)
+    # Only one search runs at a time, other requests wait for its result
+    _search_lock: threading.Lock = attribute(default_factory=threading.Lock, private=True)
+    # Venv searches run at the same time, this only guards _venv_results
+    _venv_lock: threading.Lock = attribute(default_factory=threading.Lock, private=True)
+    _server: socketserver.BaseServer | None = attribute(default=None, private=True)
+
+    def handle_request(self, request: dict) -> dict:
+        """
+        Answer a single decoded request
+
+        :param request: dict with the query and its parameters
+        :return: JSON serializable response
+        """
+        query = request.get("query")
+        if query == "ping":
+            return {"ok": True, "version": __version__}
+        elif query == "installs":
+            return {"ok": True, "installs": self.get_install_entries(request.get("environ", {}))}
+        elif query == "venvs":
+            venvs = self.get_venv_entries(
+                request["base_dir"],
+                recursive=request.get("recursive", False),
+                search_parent_folders=request.get("search_parent_folders", False),
+            )
+            return {"ok": True, "venvs": venvs}
+        elif query == "shutdown":
+            threading.Thread(target=self.shutdown).start()
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown query {query!r}"}
+
+    def get_install_entries(self, environ: dict[str, str | None]) -> list[dict]:
+        """
+        Get the installs that a search with the given environment variables
+        would find, searching only if the stored result has changed.
+
+        The variables are only used to find the folders to search, installs
+        are queried with the environment of the server.
+
+        :param environ: Values of the environment variables in SNAPSHOT_ENVIRON
+        :return: list of snapshot entries for the installs
+        """
+        key = tuple(environ.get(name) for name in SNAPSHOT_ENVIRON)
+        search_environ: dict[str, str] = {
+            name: value
+            for name in SNAPSHOT_ENVIRON
+            if (value := environ.get(name)) is not None
+        }
+
+        with self._search_lock:
+            search_folders = _get_search_folders(search_environ)
+            snapshot = _get_result(self._install_snapshots, key)
+            if (
+                snapshot is None
+                or not snapshot_matches(self.finder, snapshot, search_folders, search_environ)
+            ):
+                installs = list(search_sources(self.finder, environ=search_environ))
+                snapshot = make_snapshot(self.finder, search_folders, installs, search_environ)
+                _store_result(self._install_snapshots, key, snapshot)
+                # Keep the details cache up to date for processes not using the server
+                self.finder.save()
+
+        return snapshot["installs"]
+
+    def get_venv_entries(
+        self,
+        base_dir: str,
+        recursive: bool = False,
+        search_parent_folders: bool = False,
+    ) -> list[dict]:
+        """
+        Get the venvs found from a folder
+
+        Non-recursive results are kept until the searched folders or the found
+        venv folders change, recursive searches are always run.
+
+        :param base_dir: Absolute path to the base directory
+        :param recursive: Also check subfolders of the base directory
+        :param search_parent_folders: Also search parent folders
+        :return: list of venv details as dicts
+        """
+        key = (base_dir, recursive, search_parent_folders)
+        if not recursive:
+            with self._venv_lock:
+                result = _get_result(self._venv_results, key)
+            if result is not None:
+                fingerprint, entries = result
+                if fingerprint_matches(self.finder, fingerprint):
+                    return entries
+
+        venvs = list(
+            _search_python_venvs(
+                base_dir=base_dir,
+                recursive=recursive,
+                search_parent_folders=search_parent_folders,
+            )
+        )
+        entries = [as_dict(venv) for venv in venvs]
+
+        if not recursive:
+            folders = [base_dir]
+            if search_parent_folders:
+                folders.extend(str(p) for p in _get_parent_folders(base_dir))
+            folders.extend(venv.folder for venv in venvs)
+            fingerprint = get_fingerprint(self.finder, folders)
+            with self._venv_lock:
+                _store_result(self._venv_results, key, (fingerprint, entries))
+
+        return entries
+
+    def serve_forever(self) -> None:
+        """
+        Listen on socket_path until shutdown is called or a shutdown query is received
+
+        :raises RuntimeError: if another server is already listening on the socket
+        """
+        self._remove_stale_socket()
+        os.makedirs(os.path.dirname(self.socket_path), mode=0o700, exist_ok=True)
+
+        # Only this user should be able to query the server, the socket is
+        # created without access for others so there is no window to connect
+        old_umask = os.umask(0o077)
+        try:
+            server = _UnixServer(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        server.discovery = self
+        self._server = server
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self._server = None
+            try:
+                os.remove(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _remove_stale_socket(self) -> None:
+        if not os.path.exists(self.socket_path):
+            return
+
+        socket = _laz.socket
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                # Left behind by a server that did not shut down cleanly
+                os.remove(self.socket_path)
+            else:
+                raise RuntimeError(f"A server is already running at {self.socket_path!r}")
+
+
+def _get_parent_folders(folder: str) -> list[str]:
+    parents = []
+    while (parent := os.path.dirname(folder)) != folder:
+        parents.append(parent)
+        folder = parent
+    return parents
+
+
+if sys.platform != "win32":
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+        discovery: DiscoveryServer
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        json = _laz.json
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                response = self.server.discovery.handle_request(request)
+            except (ValueError, KeyError, TypeError) as e:
+                response = {"ok": False, "error": f"Invalid request: {e}"}
+            except Exception as e:  # noqa: BLE001 - Report any failure so the client is not left waiting
+                response = {"ok": False, "error": f"Request failed: {e!r}"}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+def serve(socket_path: str = SERVER_SOCKET_PATH) -> None:
+    """
+    Run a discovery server until interrupted or sent a shutdown query
+
+    :param socket_path: Path of the Unix domain socket to listen on
+    """
+    if sys.platform == "win32":
+        raise RuntimeError("The discovery server is not supported on Windows")
+
+    server = DiscoveryServer(socket_path=socket_path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,284 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Keep an interpreter running to answer repeated queries about it
+without paying the startup cost of a new process each time.
+"""
+from __future__ import annotations
+
+from ducktools.classbuilder.prefab import Prefab, attribute
+from ducktools.lazyimporter import LazyImporter, ModuleImport, FromImport
+
+from . import session_script
+from .shared import (
+    CACHE_FOLDER,
+    DetailsScript,
+    ProbeLauncher,
+    PythonInstall,
+    _kill_process_tree,
+    _process_group_kwargs,
+)
+
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import queue
+    import subprocess
+    from .venv import PythonPackage
+
+
+_laz = LazyImporter(
+    [
+        ModuleImport("json"),
+        ModuleImport("queue"),
+        ModuleImport("subprocess"),
+        ModuleImport("threading"),
+        FromImport(".venv", "PythonPackage"),
+    ],
+    globs=globals(),
+)
+
+
+class SessionError(Exception):
+    """
+    Raised if an interpreter session can not be started,
+    ends unexpectedly, times out or a query fails.
+    """
+
+
+class InterpreterSession(Prefab):
+    """
+    Run an interpreter once and answer repeated queries about it.
+
+    Use as a context manager to close the interpreter when done::
+
+        with InterpreterSession(install.executable) as session:
+            pip_version = session.get_pip_version()
+            packages = session.get_packages()
+    """
+    executable: str
+    launcher: ProbeLauncher = attribute(default_factory=ProbeLauncher)
+
+    # Folder to keep the copies of the scripts run by the interpreter
+    script_folder: str = CACHE_FOLDER
+
+    # Maximum time in seconds to wait for a response, None will wait forever
+    timeout: float | None = 20.0
+
+    _process: subprocess.Popen | None = attribute(default=None, private=True)
+    _responses: queue.Queue | None = attribute(default=None, private=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """
+        Start the interpreter if it is not already running
+
+        :raises SessionError: If the interpreter could not be started
+        """
+        if self.running:
+            return
+
+        details_path = self.launcher.get_script_path(
+            DetailsScript().get_source_code(),
+            self.script_folder,
+        )
+        session_path = self.launcher.get_script_path(
+            DetailsScript(script_file=session_script.__file__).get_source_code(),
+            self.script_folder,
+            script_name="session_script",
+        )
+
+        # Queries need site-packages to find pip and installed packages
+        # Retry without flags for interpreters that don't support them
+        flags = self.launcher.get_flags(self.executable, use_site=True)
+        for attempt_flags in ([flags, []] if flags else [[]]):
+            try:
+                self._launch([self.executable, *attempt_flags, session_path, details_path])
+                self.request("ping")
+            except SessionError:
+                continue
+            return
+
+        raise SessionError(f"Could not start an interpreter session for {self.executable!r}")
+
+    def _launch(self, args: list[str]) -> None:
+        subprocess = _laz.subprocess
+        try:
+            self._process = subprocess.Popen(
+                args,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=self.launcher.get_env(),
+                **_process_group_kwargs(),
+            )
+        except OSError as e:
+            raise SessionError(f"Could not launch {self.executable!r}: {e}") from e
+
+        # Read responses in a thread so waiting for them can time out
+        self._responses = _laz.queue.Queue()
+        reader = _laz.threading.Thread(
+            target=self._read_responses,
+            args=(self._process.stdout, self._responses),
+            daemon=True,
+        )
+        reader.start()
+
+    @staticmethod
+    def _read_responses(stdout, responses) -> None:
+        for line in iter(stdout.readline, b""):
+            responses.put(line)
+        responses.put(None)
+
+    def close(self) -> None:
+        """
+        Stop the interpreter
+        """
+        self._close()
+
+    def _close(self, kill: bool = False) -> None:
+        if self._process is None:
+            return
+
+        process, self._process = self._process, None
+        assert process.stdin is not None
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+
+        if not kill:
+            try:
+                process.wait(timeout=1)
+            except _laz.subprocess.TimeoutExpired:
+                kill = True
+
+        if kill:
+            # Also kill any children that would keep stdout open
+            _kill_process_tree(process.pid)
+            process.kill()
+            process.wait()
+
+    def request(self, query: str, *args):
+        """
+        Send a query to the interpreter and wait for the result
+
+        :param query: Name of the query
+        :param args: Arguments for the query, these must be JSON serializable
+        :return: The result of the query
+        :raises SessionError: If the session is not running, the query failed
+                              or there was no response within the timeout
+        """
+        if not self.running:
+            raise SessionError("Interpreter session is not running")
+
+        assert self._process is not None and self._responses is not None
+        assert self._process.stdin is not None
+
+        message = _laz.json.dumps({"query": query, "args": list(args)}) + "\n"
+        try:
+            self._process.stdin.write(message.encode())
+            self._process.stdin.flush()
+        except OSError as e:
+            self.close()
+            raise SessionError("Interpreter session ended unexpectedly") from e
+
+        while True:
+            try:
+                line = self._responses.get(timeout=self.timeout)
+            except _laz.queue.Empty:
+                self._close(kill=True)
+                raise SessionError(f"No response after {self.timeout} seconds")
+
+            if line is None:
+                self.close()
+                raise SessionError("Interpreter session ended unexpectedly")
+
+            # Skip anything else the interpreter writes to stdout
+            try:
+                response = _laz.json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(response, dict):
+                break
+
+        if "error" in response:
+            raise SessionError(f"Query {query!r} failed: {response['error']}")
+
+        return response.get("result")
+
+    def get_details(self, minimal: bool = False) -> dict:
+        """
+        :param minimal: Skip the details that need sysconfig
+        :return: details_script output for the interpreter
+        """
+        return self.request("details", minimal)
+
+    def get_install(self) -> PythonInstall:
+        """
+        :return: PythonInstall for the interpreter
+        """
+        details = self.get_details()
+        if details["executable"] != self.executable:
+            details["metadata"]["sys_executable"] = details["executable"]
+            details["executable"] = self.executable
+        return PythonInstall.from_json(**details)
+
+    def get_extras(self, names: list[str]) -> dict:
+        """
+        :param names: Names of extra details, see details_script.EXTRAS
+        :return: dictionary of the extra details
+        """
+        return self.request("extras", list(names))
+
+    def get_pip_version(self) -> str | None:
+        return self.get_extras(["pip_version"])["pip_version"]
+
+    def get_base_executable(self) -> str | None:
+        return self.get_extras(["base_executable"])["base_executable"]
+
+    def get_packages(self) -> list[PythonPackage] | None:
+        """
+        :return: Packages installed in purelib or None if they can not be listed
+        """
+        packages = self.get_extras(["packages"])["packages"]
+        if packages is None:
+            return None
+        return [_laz.PythonPackage(name, version) for name, version in packages]
+
+    def get_config_vars(self, names: list[str]) -> dict:
+        """
+        :param names: Names of sysconfig config vars
+        :return: dictionary of config var values
+        """
+        return self.request("config_vars", list(names))
@@ -0,0 +1,87 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Answer repeated queries about an interpreter from one running process.
+
+Usage: python session_script.py <path to details_script.py>
+
+Requests are read from stdin as one JSON object per line in the form
+{"query": name, "args": [...]} and a JSON response is written to stdout
+for each one as {"result": value} or {"error": message}.
+
+This needs to run on every supported interpreter so avoid f-strings
+and anything else newer than Python 2.7.
+"""
+import sys
+import json
+
+
+def load_details_script(path):
+    # Load the functions from details_script without running it as __main__
+    namespace = {"__name__": "details_script"}
+    with open(path) as f:
+        source = f.read()
+    exec(source, namespace)  # noqa: S102 - details_script.py is part of this package
+    return namespace
+
+
+def get_config_vars(names):
+    import sysconfig
+    return {name: sysconfig.get_config_var(name) for name in names}
+
+
+def get_handlers(details_script):
+    return {
+        "ping": lambda: True,
+        "details": lambda minimal=False: details_script["get_details"](minimal),
+        "extras": lambda names: details_script["get_extras"](names),
+        "config_vars": get_config_vars,
+    }
+
+
+def main():
+    handlers = get_handlers(load_details_script(sys.argv[1]))
+
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break
+        if not line.strip():
+            continue
+
+        try:
+            request = json.loads(line)
+            handler = handlers.get(request["query"])
+            if handler is None:
+                raise ValueError("Unknown query {!r}".format(request["query"]))
+            response = {"result": handler(*request.get("args", []))}
+        except Exception:  # noqa: BLE001 - Any failure is sent back as an error response
+            error = sys.exc_info()[1]
+            response = {"error": "{}: {}".format(type(error).__name__, error)}
+
+        sys.stdout.write(json.dumps(response, default=str) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -27,24 +27,46 @@ import os
 import os.path
 
 try:
-    from _collections_abc import Iterator
+    from _collections_abc import Callable, Generator, Iterable, Iterator, Mapping, Sequence
 except ImportError:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Generator, Iterable, Iterator, Mapping, Sequence
 
 from ducktools.classbuilder.prefab import Prefab, attribute, as_dict
 from ducktools.lazyimporter import LazyImporter, ModuleImport, FromImport
 
 from . import details_script
+from .cache_store import CacheStore, FileLock, JSONCacheStore, get_cache_store
+from .elf_header import ExecutableHeader, can_run_natively, read_executable_header
+from .sources import get_sources
+from .static_details import get_name_details, get_name_version, get_static_details
+from .stats import DiscoveryStats
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import threading
+
+    from .candidates import VersionFilter
 
 _laz = LazyImporter(
     [
+        ModuleImport("asyncio"),
+        FromImport("collections", "deque"),
+        FromImport("concurrent.futures", "Future"),
+        FromImport("concurrent.futures", "ThreadPoolExecutor"),
         FromImport("glob", "glob"),
+        FromImport("itertools", "chain"),
+        ModuleImport("hashlib"),
         ModuleImport("json"),
         ModuleImport("platform"),
+        FromImport("queue", "SimpleQueue"),
         ModuleImport("re"),
         ModuleImport("shutil"),
+        ModuleImport("signal"),
         ModuleImport("subprocess"),
+        ModuleImport("sysconfig"),
         ModuleImport("tempfile"),
+        ModuleImport("threading"),
+        ModuleImport("time"),
         ModuleImport("zipfile"),
     ]
 )
@@ -76,10 +98,169 @@ else:
     CACHE_FOLDER = os.path.join(USER_FOLDER, ".cache", "ducktools", "pythonfinder")
 
 
-CACHE_VERSION = 2
+# Increase when the format of cache entries changes so older versions of
+# pythonfinder sharing the cache folder do not read entries they can not handle
+# Version 3: entries may hold 'minimal' details instead of 'install' and failed
+#            queries are stored with an 'install' of None and a 'failure' reason
+CACHE_VERSION = 3
 DETAILS_CACHE_PATH = os.path.join(CACHE_FOLDER, f"runtime_cache_v{CACHE_VERSION}.json")
 INSTALLER_CACHE_PATH = os.path.join(CACHE_FOLDER, "installer_details.json")
 
+# Folder listings are only cached once the folder has been unchanged for this long
+# so changes within the resolution of the folder mtime are not missed
+FOLDER_LISTING_SETTLE_TIME = 2.0
+
+# Cache entries record when they were last used to within this many seconds
+# so reading from the cache does not need a save every time
+LAST_SEEN_RESOLUTION = 24 * 60 * 60
+
+# Interval in seconds between checks of the output size of a running query
+QUERY_POLL_INTERVAL = 0.05
+
+
+# Probe tiers in order of increasing detail
+# deferred: version from the install folder name for pyenv and uv installs
+#           with no query, other installs use a minimal query
+# minimal: version, executable, architecture and implementation from sys only
+# full: adds install paths and metadata that need sysconfig
+PROBE_TIERS = ("deferred", "minimal", "full")
+
+
+class QueryError(Exception):
+    """
+    Raised when querying a Python install fails due to the timeout or output limits.
+
+    Unlike other failures these are recorded in the cache so the install is not
+    queried again until the executable changes.
+    """
+
+
+def _process_group_kwargs() -> dict:
+    """
+    Get the Popen arguments to start a process in a new process group
+    so it can be killed along with any children by _kill_process_tree
+    """
+    if sys.platform == "win32":
+        return {"creationflags": _laz.subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        return {"start_new_session": True}
+
+
+def _kill_process_tree(pid: int) -> None:
+    """
+    Kill a process started with _process_group_kwargs and its children
+    """
+    if sys.platform == "win32":
+        _laz.subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(pid)],
+            capture_output=True,
+        )
+    else:
+        try:
+            os.killpg(pid, _laz.signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def _get_venv_folder(exe_path: str) -> str | None:
+    """
+    :return: The folder of the venv containing exe_path or None if it is not in a venv
+    """
+    exe_folder = os.path.dirname(os.path.abspath(exe_path))
+    for folder in (exe_folder, os.path.dirname(exe_folder)):
+        if os.path.exists(os.path.join(folder, "pyvenv.cfg")):
+            return folder
+    return None
+
+
+def _get_folder_stamp(folder: str) -> list[int] | None:
+    """
+    Get values that change when a folder's contents change
+
+    :param folder: Path to the folder
+    :return: [mtime in ns, inode] or None if the folder can not be read
+    """
+    try:
+        st = os.stat(folder)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_ino]
+
+
+# (st_dev, st_ino) of the running interpreter's executables, filled when first needed
+_running_file_ids: dict[str, tuple[int, int]] = {}
+
+
+def _is_running_file(exe_stat: os.stat_result, path: str) -> bool:
+    if (file_id := _running_file_ids.get(path)) is None:
+        try:
+            path_stat = os.stat(path)
+        except OSError:
+            return False
+        file_id = _running_file_ids[path] = (path_stat.st_dev, path_stat.st_ino)
+    return (exe_stat.st_dev, exe_stat.st_ino) == file_id
+
+
+def _get_running_details(exe_path: str) -> dict | None:
+    """
+    Get details_script output in process if exe_path is the running interpreter
+    or the base interpreter of the running venv.
+
+    Executables are compared by device and inode so links to the
+    interpreter also match.
+
+    :param exe_path: Path to the runtime .exe
+    :return: dict of install details or None if exe_path is another interpreter
+    """
+    try:
+        exe_stat = os.stat(exe_path)
+    except OSError:
+        return None
+
+    exe_venv = _get_venv_folder(exe_path)
+    in_venv = sys.prefix != sys.base_prefix
+    details = None
+
+    if sys.executable and _is_running_file(exe_stat, sys.executable):
+        # A link to the running interpreter from a different venv is not the same
+        if exe_venv is None:
+            same_install = not in_venv
+        else:
+            same_install = in_venv and os.path.samefile(exe_venv, sys.prefix)
+        if same_install:
+            details = details_script.get_details()
+
+    if (
+        details is None
+        and in_venv
+        and exe_venv is None
+        and (base_executable := getattr(sys, "_base_executable", None))
+        and _is_running_file(exe_stat, base_executable)
+    ):
+        # The base interpreter shares everything except the paths with this venv
+        sysconfig = _laz.sysconfig
+        try:
+            scheme = sysconfig._get_preferred_schemes()["prefix"]
+        except (AttributeError, KeyError):
+            return None
+
+        details = details_script.get_details()
+        details["paths"] = sysconfig.get_paths(
+            scheme,
+            vars={
+                "base": sys.base_prefix,
+                "platbase": sys.base_exec_prefix,
+                "installed_base": sys.base_prefix,
+                "installed_platbase": sys.base_exec_prefix,
+            },
+        )
+
+    if details is not None:
+        # Match the output of running the executable directly
+        details["executable"] = exe_path
+
+    return details
+
 
 def purge_caches(cache_folder=CACHE_FOLDER):
     _laz.shutil.rmtree(cache_folder, ignore_errors=True)
@@ -129,199 +310,1439 @@ def version_tuple_to_str(version_tuple):
     else:
         serial = f"{serial}"
 
-    return f"{major}.{minor}.{micro}{releaselevel}{serial}"
+    return f"{major}.{minor}.{micro}{releaselevel}{serial}"
+
+
+class DetailsScript(Prefab):
+    """
+    Class to obtain and cache the source code of details_script.py
+    (or another script from this package) to use on external Pythons.
+    """
+    script_file: str = details_script.__file__
+    _source_code: str | None = attribute(default=None, private=True)
+
+    def get_source_code(self) -> str:
+        if self._source_code is None:
+            if os.path.exists(details_file := self.script_file):
+                with open(details_file) as f:
+                    self._source_code = f.read()
+            elif os.path.splitext(archive_path := sys.argv[0])[1].startswith(".pyz"):
+                script_path = os.path.relpath(self.script_file, archive_path)
+                if sys.platform == "win32":
+                    # Windows paths have backslashes, these do not work in zipfiles
+                    script_path = script_path.replace("\\", "/")
+                script = _laz.zipfile.Path(archive_path, script_path)
+                self._source_code = script.read_text()
+            else:
+                raise FileNotFoundError(f"Could not find {self.script_file!r}")
+
+        assert isinstance(self._source_code, str)
+
+        return self._source_code
+
+
+class ProbeLauncher(Prefab):
+    """
+    Choose the command line flags and environment used to run
+    details_script on an interpreter.
+
+    Flags that skip startup work are used where they don't change
+    the output of the script.
+    """
+    # Isolated mode, ignores PYTHON* environment variables and user site-packages
+    isolated: bool = True
+
+    # Don't import site or process .pth files, not used for venvs as
+    # the venv paths are set by site
+    no_site: bool = True
+
+    # Use the frozen stdlib modules (3.11+, ignored by earlier versions)
+    frozen_modules: bool = True
+
+    # Executable names that don't support these flags and are launched without them
+    plain_names: tuple[str, ...] = ("python2", "micropython")
+
+    def get_flags(self, exe_path: str, use_site: bool = False) -> list[str]:
+        """
+        Get the command line flags to use when querying an executable
+
+        :param exe_path: Path to the runtime .exe
+        :param use_site: The query needs site-packages to be available
+        :return: list of command line flags
+        """
+        exe_name = os.path.basename(exe_path).lower()
+        if exe_name.startswith(self.plain_names):
+            return []
+
+        flags = []
+        if self.isolated:
+            flags.append("-I")
+        if self.no_site and not use_site and not self._is_venv(exe_path):
+            flags.append("-S")
+        if self.frozen_modules:
+            flags.extend(["-X", "frozen_modules=on"])
+
+        return flags
+
+    @staticmethod
+    def _is_venv(exe_path: str) -> bool:
+        return _get_venv_folder(exe_path) is not None
+
+    @staticmethod
+    def get_env() -> dict[str, str]:
+        """
+        Get the environment for a query with Python specific variables removed
+
+        This covers interpreters launched without the isolated flag.
+        """
+        return {
+            k: v for k, v in os.environ.items()
+            if not k.upper().startswith(("PYTHON", "MICROPY"))
+        }
+
+    @staticmethod
+    def get_script_path(
+        source: str,
+        script_folder: str,
+        script_name: str = "details_script",
+    ) -> str:
+        """
+        Get the path to a persistent copy of a script
+
+        This is used for interpreters that can't read the script from stdin.
+        The file name includes a hash of the source so a changed script
+        is written to a new file.
+
+        :param source: source code of the script
+        :param script_folder: folder to store the script
+        :param script_name: base name for the script file
+        :return: path to the script file
+        """
+        source_hash = _laz.hashlib.sha256(source.encode()).hexdigest()[:16]
+        script_path = os.path.join(script_folder, f"{script_name}_{source_hash}.py")
+
+        if not os.path.exists(script_path):
+            os.makedirs(script_folder, exist_ok=True)
+            temp_path = f"{script_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                f.write(source)
+            os.replace(temp_path, script_path)
+
+        return script_path
+
+    def get_attempts(
+        self,
+        exe_path: str,
+        source: str,
+        script_folder: str,
+        script_args: list[str] | None = None,
+        use_site: bool = False,
+    ) -> Iterator[tuple[list[str], str | None]]:
+        """
+        Get the commands to try in order to query an executable
+
+        The script is piped to stdin with flags, then without flags and finally
+        run from a file for interpreters such as micropython that do not
+        support reading from stdin.
+
+        :param exe_path: Path to the runtime .exe
+        :param source: source code of the details script
+        :param script_folder: folder to store the script if it is needed
+        :param script_args: arguments to pass to the script
+        :param use_site: The query needs site-packages to be available
+        :return: iterator of (command line arguments, stdin input) pairs
+        """
+        script_args = [] if script_args is None else script_args
+
+        if flags := self.get_flags(exe_path, use_site=use_site):
+            yield [exe_path, *flags, "-", *script_args], source
+        yield [exe_path, "-", *script_args], source
+
+        try:
+            script_path = self.get_script_path(source, script_folder)
+        except OSError:
+            return
+        yield [exe_path, script_path, *script_args], None
+
+
+class DetailFinder(Prefab):
+    cache_path: str = DETAILS_CACHE_PATH
+    details_script: DetailsScript = attribute(default_factory=DetailsScript)
+    launcher: ProbeLauncher = attribute(default_factory=ProbeLauncher)
+
+    # Maximum number of simultaneous queries for batch lookups
+    # None uses the number of CPUs
+    max_workers: int | None = None
+
+    # Maximum time in seconds to wait for a query, None will wait forever
+    query_timeout: float | None = 20.0
+
+    # Maximum number of bytes of output to accept from a query
+    max_query_output: int = 1024 * 1024
+
+    # Kill any processes started by a query that times out, not just the query itself
+    kill_process_tree: bool = True
+
+    # Installs managed by these tools are read from their install folder without
+    # running the executable where the layout is recognised.
+    # None will attempt this for all installs.
+    static_query_managers: tuple[str, ...] | None = ("pyenv", "Astral")
+
+    # Build the details of pyenv and uv managed CPython installs from the name of
+    # their install folder (eg: 'cpython-3.13.1+freethreaded-linux-x86_64-gnu')
+    # without reading the install or running it. The paths are those of a
+    # standard layout and these details are not cached.
+    details_from_names: bool = False
+
+    # Skip executables that would need to run through an emulator or can not run
+    # This is checked from the ELF header and only applies on Linux
+    skip_foreign_executables: bool = True
+
+    # Get the details of the running interpreter (or the base of the running venv)
+    # in process instead of launching it again
+    in_process_query: bool = True
+
+    # Level of detail to get when an install is queried, see PROBE_TIERS
+    # Installs from a 'minimal' query get their paths and any metadata that needs
+    # a 'full' query when these are first accessed.
+    # 'deferred' installs are queried when their architecture, paths or metadata
+    # are first accessed.
+    probe_tier: str = "full"
+
+    # Cache hits, probe timings and per source counts for this finder
+    stats: DiscoveryStats = attribute(
+        default_factory=DiscoveryStats, repr=False, compare=False
+    )
+
+    # Remember the Python executables found in each searched folder and only
+    # scan a folder again when it (or its parent) has changed
+    cache_folder_listings: bool = True
+
+    # Return the result of the last complete search for installs while the
+    # environment and the searched folders are unchanged, see snapshot.py
+    # Not used on Windows as installs are also found from the registry
+    use_snapshot: bool = False
+
+    # Only one process queries an uncached install at a time, others wait for it
+    # to finish and read the result from the cache.
+    # Waiting processes query the install themselves after single_flight_timeout
+    single_flight: bool = True
+    single_flight_timeout: float | None = 60.0
+
+    # Maximum number of cache entries to keep, the entries for the executables
+    # seen least recently are removed on save. None keeps every entry.
+    max_cache_entries: int | None = 1000
+
+    # Minimum time in seconds between removing entries for executables that no
+    # longer exist. This is checked on save, None never removes entries.
+    prune_interval: float | None = 24 * 60 * 60
+
+    # Storage for the cache entries, None uses a store based on the extension
+    # of cache_path: SQLite for .db/.sqlite/.sqlite3 files and JSON otherwise
+    cache_store: CacheStore | None = None
+
+    # Candidate executables in each searched folder, see get_folder_candidates
+    _folder_cache: JSONCacheStore | None = attribute(default=None, private=True)
+
+    # Reasons for failed queries that should be recorded in the cache
+    _query_failures: dict[str, str] = attribute(default_factory=dict, private=True)
+
+    # Indicates if the cache is known to have changed
+    _dirty_cache: bool = attribute(default=False, private=True)
+
+    # Increased each re-entry to the context manager
+    # Decreased on exit
+    # Save should only occur when all contexts exit
+    _context_level: int = attribute(default=0, private=True)
+
+    # Discovery sources may use the finder from separate threads
+    _lock: threading.RLock = attribute(default_factory=lambda: _laz.threading.RLock(), private=True)
+
+    # Semaphore shared by batch lookups using the finder's max_workers
+    _query_slots: threading.Semaphore | None = attribute(default=None, private=True)
+
+    # CPU times of the last query process run by each thread for the probe statistics
+    _probe_times: threading.local = attribute(
+        default_factory=lambda: _laz.threading.local(), private=True
+    )
+
+    def __prefab_post_init__(self):
+        if self.probe_tier not in PROBE_TIERS:
+            raise ValueError(
+                f"probe_tier must be one of {PROBE_TIERS}, not {self.probe_tier!r}"
+            )
+
+    def __enter__(self):
+        with self._lock:
+            self._context_level += 1
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        with self._lock:
+            self._context_level -= 1
+            if (
+                exc_type in {None, GeneratorExit}
+                and self._dirty_cache
+                and self._context_level == 0
+            ):
+                self.save()
+
+    @property
+    def raw_cache(self) -> CacheStore:
+        if self.cache_store is None:
+            with self._lock:
+                if self.cache_store is None:
+                    self.cache_store = get_cache_store(self.cache_path)
+        return self.cache_store
+
+    @property
+    def folder_cache(self) -> JSONCacheStore:
+        if self._folder_cache is None:
+            with self._lock:
+                if self._folder_cache is None:
+                    self._folder_cache = JSONCacheStore(
+                        os.path.join(
+                            os.path.dirname(os.path.abspath(self.cache_path)),
+                            "folder_cache.json",
+                        )
+                    )
+        return self._folder_cache
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(
+            os.path.dirname(os.path.abspath(self.cache_path)), "discovery_snapshot.json"
+        )
+
+    @property
+    def prune_stamp_path(self) -> str:
+        # The mtime of this file is the time the cache was last pruned
+        return f"{self.cache_path}.pruned"
+
+    def save(self) -> None:
+        """
+        Write changed cache entries, keeping entries saved by other processes
+        since the cache was loaded
+
+        Entries for missing executables are removed first if prune_interval has
+        passed and the least recently seen entries beyond max_cache_entries are dropped.
+        """
+        try:
+            last_prune = os.stat(self.prune_stamp_path).st_mtime
+        except OSError:
+            # Start counting from the first save of this cache
+            last_prune = None
+        else:
+            if (
+                self.prune_interval is not None
+                and _laz.time.time() - last_prune >= self.prune_interval
+            ):
+                self.clear_invalid_runtimes()
+                last_prune = None
+
+        self.evict_entries()
+        self.raw_cache.save()
+        if self._folder_cache is not None:
+            self._folder_cache.save()
+        self._dirty_cache = False
+
+        if last_prune is None:
+            try:
+                with open(self.prune_stamp_path, "w"):
+                    pass
+            except OSError:
+                pass
+
+    def evict_entries(self) -> None:
+        """
+        Remove the least recently seen cache entries beyond max_cache_entries
+        """
+        if self.max_cache_entries is None:
+            return
+
+        if (excess := len(self.raw_cache) - self.max_cache_entries) <= 0:
+            return
+
+        for exe_path in self.raw_cache.least_recently_seen(excess):
+            del self.raw_cache[exe_path]
+        self._dirty_cache = True
+
+    def clear_invalid_runtimes(self) -> None:
+        """
+        Remove cache entries where the python.exe no longer exists
+
+        Folders are checked before the executables inside them so removed
+        installs only need one check each.
+        """
+        by_folder: dict[str, list[str]] = {}
+        for exe_path in self.raw_cache:
+            by_folder.setdefault(os.path.dirname(exe_path), []).append(exe_path)
+
+        removed_runtimes: set[str] = set()
+        for folder, exe_paths in by_folder.items():
+            if os.path.exists(folder):
+                removed_runtimes.update(p for p in exe_paths if not os.path.exists(p))
+            else:
+                removed_runtimes.update(exe_paths)
+
+        for exe_path in removed_runtimes:
+            self.raw_cache.pop(exe_path)
+        if removed_runtimes:
+            self._dirty_cache = True
+
+    def clear_cache(self) -> None:
+        """
+        Completely empty the cache
+        """
+        self.raw_cache.clear()
+        self.folder_cache.clear()
+        self._dirty_cache = True
+        try:
+            os.remove(self.snapshot_path)
+        except FileNotFoundError:
+            pass
+
+    def get_folder_candidates(
+        self,
+        base_folder: str | os.PathLike,
+        basenames: tuple[str, ...] = ("python", "pypy", "micropython"),
+    ) -> list[str]:
+        """
+        Get the paths of files in a folder that look like Python executables
+
+        The names found are cached with the mtime and inode of the folder and its
+        parent (for the venv check), the folder is only scanned again if these change.
+
+        :param base_folder: Folder to search
+        :param basenames: Base names of executables to match
+        :return: list of paths to candidate executables
+        """
+        base_folder = str(base_folder)
+        if not self.cache_folder_listings:
+            return list(_get_folder_candidates(base_folder, basenames, stats=self.stats))
+
+        folder_key = os.path.abspath(base_folder)
+        self.stats.count_stat(2)
+        stamp = [
+            _get_folder_stamp(folder_key),
+            _get_folder_stamp(os.path.dirname(folder_key)),
+        ]
+
+        cached = self.folder_cache.get(folder_key)
+        if (
+            stamp[0] is not None
+            and cached
+            and cached["stamp"] == stamp
+            and cached["basenames"] == list(basenames)
+        ):
+            return [os.path.join(base_folder, name) for name in cached["names"]]
+
+        candidates = list(_get_folder_candidates(base_folder, basenames, stats=self.stats))
+
+        settled = _laz.time.time_ns() - FOLDER_LISTING_SETTLE_TIME * 1e9
+        if stamp[0] is not None and all(st is None or st[0] < settled for st in stamp):
+            self.folder_cache[folder_key] = {
+                "stamp": stamp,
+                "basenames": list(basenames),
+                "names": [os.path.basename(p) for p in candidates],
+            }
+            self._dirty_cache = True
+        elif cached:
+            del self.folder_cache[folder_key]
+            self._dirty_cache = True
+
+        return candidates
+
+    def query_install(
+        self,
+        exe_path: str,
+        managed_by: str | None = None,
+        metadata: dict | None = None,
+        tier: str | None = None,
+    ) -> PythonInstall | None:
+        """
+        Query the details of a Python install directly
+
+        :param exe_path: Path to the runtime .exe
+        :param managed_by: Which tool manages this install (if any)
+        :param metadata: Dictionary of install metadata
+        :param tier: Probe tier to use, defaults to the finder's probe_tier
+        :return: a PythonInstall if one exists at the exe Path
+        """
+        if running_install := self._running_query_install(exe_path, managed_by, metadata):
+            return running_install
+
+        header = self._read_header(exe_path)
+        if header and self.skip_foreign_executables and not can_run_natively(header):
+            return None
+        architecture = header.architecture if header else None
+
+        if static_install := self._static_query_install(
+            exe_path, managed_by, metadata, architecture
+        ):
+            return static_install
+
+        minimal = (tier or self.probe_tier) != "full"
+        if (detail_output := self._run_details_script(exe_path, minimal=minimal)) is None:
+            return None
+
+        return self._install_from_output(
+            exe_path, detail_output, managed_by, metadata, architecture, minimal
+        )
+
+    def query_install_extras(
+        self,
+        exe_path: str,
+        extras: Iterable[str],
+        managed_by: str | None = None,
+        metadata: dict | None = None,
+    ) -> tuple[PythonInstall | None, dict]:
+        """
+        Query the details of a Python install along with extra details
+        in one run of the details script.
+
+        Available extras are listed in details_script.EXTRAS.
+
+        :param exe_path: Path to the runtime .exe
+        :param extras: Names of the extra details to request
+        :param managed_by: Which tool manages this install (if any)
+        :param metadata: Dictionary of install metadata
+        :return: a PythonInstall if one exists at the exe Path and
+                 a dictionary of the extra details
+        """
+        header = self._read_header(exe_path)
+        if header and self.skip_foreign_executables and not can_run_natively(header):
+            return None, {}
+        architecture = header.architecture if header else None
+
+        if (detail_output := self._run_details_script(exe_path, extras)) is None:
+            return None, {}
+
+        try:
+            output = _laz.json.loads(detail_output)
+        except _laz.json.JSONDecodeError:
+            return None, {}
+
+        extras_output = output.pop("extras", {})
+        install = self._install_from_details(
+            exe_path, output, managed_by, metadata, architecture
+        )
+        return install, extras_output
+
+    def _run_details_script(
+        self,
+        exe_path: str,
+        extras: Iterable[str] = (),
+        minimal: bool = False,
+    ) -> str | None:
+        """
+        Run the details script on an executable
+
+        :param exe_path: Path to the runtime .exe
+        :param extras: Names of extra details to request
+        :param minimal: Only request the details for the minimal probe tier
+        :return: output of the details script or None if it could not be run
+        """
+        try:
+            source = self.details_script.get_source_code()
+        except FileNotFoundError:
+            return None
+
+        # Flags may not be supported (Python 2) and some interpreters can't read
+        # the script from stdin (micropython), try each method in turn
+        for args, script_input in self._get_query_attempts(
+            exe_path, source, extras, minimal
+        ):
+            start_time = _laz.time.perf_counter()
+            self._probe_times.value = None
+            succeeded = False
+            try:
+                output = self._run_query(args, input=script_input)
+                succeeded = True
+            except QueryError as e:
+                self._query_failures[exe_path] = str(e)
+                return None
+            except OSError:
+                # Something else has gone wrong
+                return None
+            except _laz.subprocess.CalledProcessError:
+                continue
+            finally:
+                self.stats.record_probe(
+                    exe_path, start_time, self._probe_times.value, succeeded
+                )
+            return output
+
+        return None
+
+    def _get_query_attempts(
+        self,
+        exe_path: str,
+        source: str,
+        extras: Iterable[str] = (),
+        minimal: bool = False,
+    ) -> Iterator[tuple[list[str], str | None]]:
+        # The script file for interpreters that can't use stdin is kept with the cache
+        script_folder = os.path.dirname(os.path.abspath(self.cache_path))
+        extras = list(extras)
+        script_args = ["--minimal", *extras] if minimal else extras
+        return self.launcher.get_attempts(
+            exe_path, source, script_folder, script_args, use_site=bool(extras)
+        )
+
+    def _process_group_kwargs(self) -> dict:
+        # Start queries in their own process group so the whole tree can be killed
+        if not self.kill_process_tree:
+            return {}
+        return _process_group_kwargs()
+
+    def _kill_query(self, pid: int) -> None:
+        """
+        Kill a query process and (if kill_process_tree is set) its children
+        """
+        if self.kill_process_tree:
+            _kill_process_tree(pid)
+
+    def _run_query(self, args: list[str], input: str | None = None) -> str:
+        """
+        Run a query subprocess within the timeout and output limits of the finder
+
+        Output is written to a temporary file instead of a pipe so a process
+        that produces excessive output does not use excessive memory. The size
+        of the file is checked while the process runs so the query is killed
+        as soon as it exceeds the limit.
+
+        :param args: Command line arguments for the query
+        :param input: text to send to stdin of the process
+        :return: stdout of the process
+        :raises QueryError: If the timeout or output limits are exceeded
+                            or the exit status could not be read
+        :raises subprocess.CalledProcessError: If the process returns a nonzero exit code
+        """
+        subprocess = _laz.subprocess
+        time = _laz.time
+
+        # Input is also given through a file so there are no pipes to service
+        # while waiting for the process
+        with _laz.tempfile.TemporaryFile() as output_file, \
+                _laz.tempfile.TemporaryFile() as input_file:
+            if input is not None:
+                input_file.write(input.encode())
+                input_file.seek(0)
+            proc = subprocess.Popen(
+                args,
+                stdin=subprocess.DEVNULL if input is None else input_file,
+                stdout=output_file,
+                stderr=subprocess.DEVNULL,
+                env=self.launcher.get_env(),
+                **self._process_group_kwargs(),
+            )
+            deadline = (
+                None if self.query_timeout is None
+                else time.monotonic() + self.query_timeout
+            )
+
+            # Wait with the same increasing delay as Popen.wait
+            delay = 0.0005
+            next_check = time.monotonic() + QUERY_POLL_INTERVAL
+            while not self._reap_query(proc):
+                if (now := time.monotonic()) >= next_check:
+                    if os.fstat(output_file.fileno()).st_size > self.max_query_output:
+                        error = QueryError(f"Output exceeded {self.max_query_output} bytes")
+                    elif deadline is not None and now >= deadline:
+                        error = QueryError(f"Timed out after {self.query_timeout} seconds")
+                    else:
+                        error = None
+
+                    if error:
+                        self._kill_query(proc.pid)
+                        proc.kill()
+                        proc.wait()
+                        raise error
+                    next_check = now + QUERY_POLL_INTERVAL
+
+                time.sleep(delay)
+                delay = min(delay * 2, QUERY_POLL_INTERVAL)
+
+            if os.fstat(output_file.fileno()).st_size > self.max_query_output:
+                raise QueryError(f"Output exceeded {self.max_query_output} bytes")
+
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, args)
+
+            output_file.seek(0)
+            return output_file.read().decode(errors="replace")
+
+    def _reap_query(self, proc) -> bool:
+        """
+        Check if a query process has finished without blocking
+
+        Where os.wait4 is available the process is reaped with it, so the CPU
+        time used by this process alone is recorded for the probe statistics.
+
+        :param proc: subprocess.Popen of the query
+        :return: True if the process has finished and proc.returncode is set
+        :raises QueryError: If the process was reaped elsewhere so its exit status is unknown
+        """
+        if not hasattr(os, "wait4"):
+            return proc.poll() is not None
+
+        try:
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+        except ChildProcessError as e:
+            # Already reaped elsewhere, eg: SIGCHLD is ignored
+            # Without the exit status the output can not be trusted
+            raise QueryError("Exit status of the query could not be read") from e
+
+        if pid == 0:
+            return False
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        self._probe_times.value = (usage.ru_utime, usage.ru_stime)
+        return True
+
+    async def _arun_query(self, args: list[str], input: str | None = None) -> str:
+        """
+        Async version of _run_query using asyncio subprocesses
+        """
+        asyncio = _laz.asyncio
+
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.DEVNULL if input is None else asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=self.launcher.get_env(),
+            **self._process_group_kwargs(),
+        )
+
+        async def communicate():
+            if input is not None:
+                proc.stdin.write(input.encode())
+                try:
+                    await proc.stdin.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                proc.stdin.close()
+
+            # Read the output in chunks so it can be limited in size
+            chunks = []
+            output_size = 0
+            while chunk := await proc.stdout.read(64 * 1024):
+                output_size += len(chunk)
+                if output_size > self.max_query_output:
+                    return None
+                chunks.append(chunk)
+
+            await proc.wait()
+            return b"".join(chunks)
+
+        async def kill():
+            self._kill_query(proc.pid)
+            if proc.returncode is None:
+                proc.kill()
+            await proc.wait()
+
+        try:
+            output = await asyncio.wait_for(communicate(), timeout=self.query_timeout)
+        except asyncio.TimeoutError:
+            error = QueryError(f"Timed out after {self.query_timeout} seconds")
+        except BaseException:
+            # Cancelled, do not leave the query (or anything it started) running
+            await kill()
+            raise
+        else:
+            if output is not None:
+                if proc.returncode != 0:
+                    raise _laz.subprocess.CalledProcessError(proc.returncode, args)
+                return output.decode(errors="replace")
+            error = QueryError(f"Output exceeded {self.max_query_output} bytes")
+
+        await kill()
+        raise error
+
+    async def aquery_install(
+        self,
+        exe_path: str,
+        managed_by: str | None = None,
+        metadata: dict | None = None,
+        tier: str | None = None,
+    ) -> PythonInstall | None:
+        """
+        Query the details of a Python install directly using an asyncio subprocess
+
+        :param exe_path: Path to the runtime .exe
+        :param managed_by: Which tool manages this install (if any)
+        :param metadata: Dictionary of install metadata
+        :param tier: Probe tier to use, defaults to the finder's probe_tier
+        :return: a PythonInstall if one exists at the exe Path
+        """
+        if running_install := self._running_query_install(exe_path, managed_by, metadata):
+            return running_install
+
+        header = self._read_header(exe_path)
+        if header and self.skip_foreign_executables and not can_run_natively(header):
+            return None
+        architecture = header.architecture if header else None
+
+        if static_install := self._static_query_install(
+            exe_path, managed_by, metadata, architecture
+        ):
+            return static_install
+
+        try:
+            source = self.details_script.get_source_code()
+        except FileNotFoundError:
+            return None
+
+        minimal = (tier or self.probe_tier) != "full"
+        for args, script_input in self._get_query_attempts(
+            exe_path, source, minimal=minimal
+        ):
+            start_time = _laz.time.perf_counter()
+            succeeded = False
+            try:
+                detail_output = await self._arun_query(args, input=script_input)
+                succeeded = True
+            except QueryError as e:
+                self._query_failures[exe_path] = str(e)
+                return None
+            except OSError:
+                return None
+            except _laz.subprocess.CalledProcessError:
+                continue
+            finally:
+                # asyncio reaps the process, so its CPU time is not available
+                self.stats.record_probe(exe_path, start_time, None, succeeded)
+            break
+        else:
+            return None
+
+        return self._install_from_output(
+            exe_path, detail_output, managed_by, metadata, architecture, minimal
+        )
+
+    def _running_query_install(
+        self,
+        exe_path: str,
+        managed_by: str | None = None,
+        metadata: dict | None = None,
+    ) -> PythonInstall | None:
+        """
+        Get the details of the running interpreter in process
+
+        :return: a PythonInstall or None if exe_path is not the running interpreter
+        """
+        if not self.in_process_query:
+            return None
+
+        if (details := _get_running_details(exe_path)) is None:
+            return None
+
+        return self._install_from_details(exe_path, details, managed_by, metadata)
+
+    @staticmethod
+    def _read_header(exe_path: str) -> ExecutableHeader | None:
+        """
+        Read the header of an executable to check it can run natively
+
+        :return: ExecutableHeader on Linux or None if it could not be read
+        """
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            return read_executable_header(exe_path)
+        except OSError:
+            return None
+
+    def _static_query_install(
+        self,
+        exe_path: str,
+        managed_by: str | None = None,
+        metadata: dict | None = None,
+        architecture: str | None = None,
+    ) -> PythonInstall | None:
+        """
+        Get the details of an install from its install folder without running it
+
+        :return: a PythonInstall or None if static queries are not used for this
+                 install or the layout was not recognised
+        """
+        if (
+            self.static_query_managers is not None
+            and managed_by not in self.static_query_managers
+        ):
+            return None
+
+        try:
+            details = get_static_details(exe_path)
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        if details is None:
+            return None
+
+        return self._install_from_details(
+            exe_path, details, managed_by, metadata, architecture
+        )
+
+    def _name_query_install(
+        self,
+        exe_path: str,
+        managed_by: str | None = None,
+        metadata: dict | None = None,
+    ) -> PythonInstall | None:
+        """
+        Get the details of a pyenv or uv install from the name of its folder
+
+        :return: a PythonInstall or None if details_from_names is not set
+                 or the name was not recognised
+        """
+        if not self.details_from_names or managed_by not in {"pyenv", "Astral"}:
+            return None
+
+        header = self._read_header(exe_path)
+        if header and self.skip_foreign_executables and not can_run_natively(header):
+            return None
+
+        details = get_name_details(exe_path, managed_by, header.architecture if header else None)
+        if details is None:
+            return None
+
+        return self._install_from_details(exe_path, details, managed_by, metadata)
+
+    def _deferred_install(
+        self,
+        exe_path: str,
+        managed_by: str | None = None,
+        metadata: dict | None = None,
+    ) -> PythonInstall | None:
+        """
+        Create an install that is queried when its details are first accessed
+
+        :return: a DeferredPythonInstall or None if the version is not known
+                 from the name of the install folder
+        """
+        if (version := get_name_version(exe_path, managed_by)) is None:
+            return None
+
+        header = self._read_header(exe_path)
+        if header and self.skip_foreign_executables and not can_run_natively(header):
+            return None
+
+        install = DeferredPythonInstall(
+            version=version,
+            executable=exe_path,
+            managed_by=managed_by,
+            metadata={} if metadata is None else metadata,
+        )
+        install._finder = self
+        return install
+
+    def _install_from_output(
+        self,
+        exe_path: str,
+        detail_output: str,
+        managed_by: str | None = None,
+        metadata: dict | None = None,
+        architecture: str | None = None,
+        minimal: bool = False,
+    ) -> PythonInstall | None:
+        """
+        Convert the JSON output of the details script into a PythonInstall
+
+        :param exe_path: Path to the runtime .exe that was queried
+        :param detail_output: JSON output from the details script
+        :param managed_by: Which tool manages this install (if any)
+        :param metadata: Dictionary of install metadata
+        :param architecture: Architecture read from the executable header
+        :param minimal: The output is from a minimal tier query
+        :return: a PythonInstall or None if the output is invalid
+        """
+        try:
+            output = _laz.json.loads(detail_output)
+        except _laz.json.JSONDecodeError:
+            return None
+
+        return self._install_from_details(
+            exe_path, output, managed_by, metadata, architecture, minimal
+        )
+
+    def _install_from_details(
+        self,
+        exe_path: str,
+        output: dict,
+        managed_by: str | None = None,
+        metadata: dict | None = None,
+        architecture: str | None = None,
+        minimal: bool = False,
+    ) -> PythonInstall:
+        if architecture:
+            output["architecture"] = architecture
+
+        if metadata:
+            output["metadata"].update(metadata)
+
+        if exe_path != output["executable"]:
+            output["metadata"]["sys_executable"] = output["executable"]
+            output["executable"] = exe_path
+
+        if minimal:
+            install = LazyPythonInstall.from_json(**output, managed_by=managed_by)
+            install._finder = self
+        else:
+            install = PythonInstall.from_json(**output, managed_by=managed_by)
+
+        return install
+
+    def _get_cached_install(self, exe_path: str) -> PythonInstall | None:
+        """
+        Get the details of a Python install only if they are validly cached.
+
+        Unlike get_install_details this will not query the install or remove
+        outdated cache entries.
+
+        :param exe_path: Path to the runtime .exe
+        :return: The cached PythonInstall or None if it is not in the cache
+        """
+        exe_path = os.path.abspath(exe_path)
+        self.stats.count_stat()
+        try:
+            mtime = os.stat(exe_path).st_mtime
+        except OSError:
+            return None
+
+        cached_details = self.raw_cache.get(exe_path)
+        if (
+            mtime != 0
+            and cached_details
+            and cached_details["mtime"] == mtime
+            and self._cache_has_tier(cached_details, self.probe_tier)
+        ):
+            self.stats.count_cache_hit()
+            self._mark_seen(exe_path, cached_details)
+            return self._install_from_cache(cached_details)
 
+        return None
 
-class DetailsScript(Prefab):
-    """
-    Class to obtain and cache the source code of details_script.py
-    to use on external Pythons.
-    """
-    _source_code: str | None = attribute(default=None, private=True)
+    def get_install_details(
+        self,
+        exe_path: str,
+        managed_by: str | None = None,
+        metadata: dict | None = None,
+        tier: str | None = None,
+    ) -> PythonInstall | None:
+        exe_path = os.path.abspath(exe_path)
+        tier = self.probe_tier if tier is None else tier
+        cached_details, mtime = self._lookup_cache(exe_path)
+        if mtime is None:
+            return None
 
-    def get_source_code(self) -> str:
-        if self._source_code is None:
-            if os.path.exists(details_file := details_script.__file__):
-                with open(details_file) as f:
-                    self._source_code = f.read()
-            elif os.path.splitext(archive_path := sys.argv[0])[1].startswith(".pyz"):
-                script_path = os.path.relpath(details_script.__file__, archive_path)
-                if sys.platform == "win32":
-                    # Windows paths have backslashes, these do not work in zipfiles
-                    script_path = script_path.replace("\\", "/")
-                script = _laz.zipfile.Path(archive_path, script_path)
-                self._source_code = script.read_text()
-            else:
-                raise FileNotFoundError(f"Could not find {details_script.__file__!r}")
+        if cached_details and self._cache_has_tier(cached_details, tier):
+            self.stats.count_cache_hit()
+            return self._install_from_cache(cached_details)
 
-        assert isinstance(self._source_code, str)
+        if install := self._name_query_install(exe_path, managed_by, metadata):
+            return install
 
-        return self._source_code
+        if tier == "deferred" and (
+            install := self._deferred_install(exe_path, managed_by, metadata)
+        ):
+            return install
 
+        self.stats.count_cache_miss()
+        if not (lock := self._get_query_lock(exe_path, mtime)):
+            install = self.query_install(exe_path, managed_by, metadata, tier)
+            self._store_cache(exe_path, mtime, install)
+            return install
 
-class DetailFinder(Prefab):
-    cache_path: str = DETAILS_CACHE_PATH
-    details_script: DetailsScript = attribute(default_factory=DetailsScript)
+        try:
+            waited = lock.acquire()
+        except OSError:
+            # Includes TimeoutError, query without waiting any longer
+            install = self.query_install(exe_path, managed_by, metadata, tier)
+            self._store_cache(exe_path, mtime, install)
+            return install
 
-    # Stores the dict loaded from the JSON file without processing
-    _raw_cache: dict | None = attribute(default=None, private=True)
+        try:
+            if waited:
+                # Another process may have queried the install while waiting
+                self.raw_cache.refresh(exe_path)
+                cached_details, mtime = self._lookup_cache(exe_path)
+                if mtime is None:
+                    return None
+                if cached_details and self._cache_has_tier(cached_details, tier):
+                    return self._install_from_cache(cached_details)
+
+            install = self.query_install(exe_path, managed_by, metadata, tier)
+            self._store_cache(exe_path, mtime, install)
+            if lock.has_waiters:
+                # Make the result available to waiting processes before unlocking
+                # otherwise it is saved with everything else at the end
+                self.raw_cache.save()
+                lock.clear_waiters()
+        finally:
+            lock.release()
 
-    # Indicates if the cache is known to have changed
-    _dirty_cache: bool = attribute(default=False, private=True)
+        return install
 
-    # Increased each re-entry to the context manager
-    # Decreased on exit
-    # Save should only occur when all contexts exit
-    _context_level: int = attribute(default=0, private=True)
+    def get_install_extras(
+        self,
+        exe_path: str,
+        extras: Iterable[str],
+        managed_by: str | None = None,
+    ) -> dict | None:
+        """
+        Get extra details of a Python install, using the cache if valid.
 
-    def __enter__(self):
-        self._context_level += 1
-        return self
+        Any extras that are not cached are requested in a single query.
+        Cached extras are discarded if the executable or its purelib
+        folder has changed, for instance when packages are installed.
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self._context_level -= 1
-        if (
-            exc_type in {None, GeneratorExit}
-            and self._dirty_cache
-            and self._context_level == 0
-        ):
-            self.save()
+        Available extras are listed in details_script.EXTRAS.
 
-    @property
-    def raw_cache(self) -> dict:
-        if self._raw_cache is None:
-            try:
-                with open(self.cache_path) as f:
-                    self._raw_cache = _laz.json.load(f)
-            except (_laz.json.JSONDecodeError, FileNotFoundError):
-                self._raw_cache = {}
+        :param exe_path: Path to the runtime .exe
+        :param extras: Names of the extra details to get
+        :param managed_by: Which tool manages this install (if any)
+        :return: dictionary of extra details or None if the install could not be queried
+        """
+        exe_path = os.path.abspath(exe_path)
+        extras = list(extras)
+        cached_details, mtime = self._lookup_cache(exe_path)
+        if mtime is None:
+            return None
 
-        assert isinstance(self._raw_cache, dict)
+        cached_extras: dict = {}
+        if cached_details and (cached_install := cached_details.get("install")):
+            purelib_mtime = self._get_purelib_mtime(cached_install["paths"])
+            if cached_details.get("extras_mtime") == purelib_mtime:
+                cached_extras = cached_details.get("extras", {})
 
-        return self._raw_cache
+        if missing_extras := [name for name in extras if name not in cached_extras]:
+            install, new_extras = self.query_install_extras(exe_path, missing_extras, managed_by)
+            if install is None:
+                self._query_failures.pop(exe_path, None)
+                return None
 
-    def save(self) -> None:
-        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
-        with open(self.cache_path, 'w') as f:
-            _laz.json.dump(self.raw_cache, f, indent=4)
+            if not (cached_details and cached_details.get("install")):
+                self._store_cache(exe_path, mtime, install)
 
-        self._dirty_cache = False
+            cached_extras = {**cached_extras, **new_extras}
+            if cache_entry := self.raw_cache.get(exe_path):
+                self.raw_cache[exe_path] = {
+                    **cache_entry,
+                    "extras": cached_extras,
+                    "extras_mtime": self._get_purelib_mtime(install.paths),
+                }
+                self._dirty_cache = True
 
-    def clear_invalid_runtimes(self) -> None:
-        """
-        Remove cache entries where the python.exe no longer exists
-        """
-        removed_runtimes: set[str] = set()
-        for exe_path in self.raw_cache.copy():
-            if not os.path.exists(exe_path):
-                self.raw_cache.pop(exe_path)
-                removed_runtimes.add(exe_path)
-        if removed_runtimes:
-            self._dirty_cache = True
+        return {name: cached_extras.get(name) for name in extras}
 
-    def clear_cache(self) -> None:
-        """
-        Completely empty the cache
-        """
-        self._raw_cache = {}
-        self._dirty_cache = True
+    @staticmethod
+    def _get_purelib_mtime(paths: dict[str, str]) -> float | None:
+        # Installing or removing packages changes the mtime of purelib
+        if purelib := paths.get("purelib"):
+            try:
+                return os.stat(purelib).st_mtime
+            except OSError:
+                pass
+        return None
 
-    def query_install(
+    async def aget_install_details(
         self,
         exe_path: str,
         managed_by: str | None = None,
         metadata: dict | None = None,
+        tier: str | None = None,
     ) -> PythonInstall | None:
         """
-        Query the details of a Python install directly
+        Get the details of a Python install, using the cache if valid and
+        querying with an asyncio subprocess otherwise.
 
         :param exe_path: Path to the runtime .exe
         :param managed_by: Which tool manages this install (if any)
         :param metadata: Dictionary of install metadata
+        :param tier: Probe tier to use, defaults to the finder's probe_tier
         :return: a PythonInstall if one exists at the exe Path
         """
-        try:
-            source = self.details_script.get_source_code()
-        except FileNotFoundError:
+        exe_path = os.path.abspath(exe_path)
+        tier = self.probe_tier if tier is None else tier
+        cached_details, mtime = self._lookup_cache(exe_path)
+        if mtime is None:
             return None
 
+        if cached_details and self._cache_has_tier(cached_details, tier):
+            self.stats.count_cache_hit()
+            return self._install_from_cache(cached_details)
+
+        if install := self._name_query_install(exe_path, managed_by, metadata):
+            return install
+
+        if tier == "deferred" and (
+            install := self._deferred_install(exe_path, managed_by, metadata)
+        ):
+            return install
+
+        self.stats.count_cache_miss()
+        if not (lock := self._get_query_lock(exe_path, mtime)):
+            install = await self.aquery_install(exe_path, managed_by, metadata, tier)
+            self._store_cache(exe_path, mtime, install)
+            return install
+
         try:
-            detail_output = _laz.subprocess.run(
-                [exe_path, "-"],
-                input=source,
-                capture_output=True,
-                text=True,
-                check=True,
-            ).stdout
+            waited = await lock.aacquire()
         except OSError:
-            # Something else has gone wrong
-            return None
-        except (_laz.subprocess.CalledProcessError, FileNotFoundError):
-            # Potentially this is micropython which does not support
-            # piping from stdin. Try using a file in a temporary folder.
-            # Python 3.12 has delete_on_close that would make TemporaryFile
-            # Usable on windows but for now use a directory
-            with _laz.tempfile.TemporaryDirectory() as tempdir:
-                temp_script = os.path.join(tempdir, "details_script.py")
-                with open(temp_script, "w") as f:
-                    f.write(source)
-                try:
-                    detail_output = _laz.subprocess.run(
-                        [exe_path, temp_script],
-                        capture_output=True,
-                        text=True,
-                        check=True,
-                    ).stdout
-                except (_laz.subprocess.CalledProcessError, FileNotFoundError):
-                    return None
+            install = await self.aquery_install(exe_path, managed_by, metadata, tier)
+            self._store_cache(exe_path, mtime, install)
+            return install
 
         try:
-            output = _laz.json.loads(detail_output)
-        except _laz.json.JSONDecodeError:
-            return None
+            if waited:
+                self.raw_cache.refresh(exe_path)
+                cached_details, mtime = self._lookup_cache(exe_path)
+                if mtime is None:
+                    return None
+                if cached_details and self._cache_has_tier(cached_details, tier):
+                    return self._install_from_cache(cached_details)
+
+            install = await self.aquery_install(exe_path, managed_by, metadata, tier)
+            self._store_cache(exe_path, mtime, install)
+            if lock.has_waiters:
+                # Saving takes a lock on the cache file, keep it off the event loop
+                await _laz.asyncio.to_thread(self.raw_cache.save)
+                lock.clear_waiters()
+        finally:
+            lock.release()
 
-        if metadata:
-            output["metadata"].update(metadata)
+        return install
 
-        if exe_path != output["executable"]:
-            output["metadata"]["sys_executable"] = output["executable"]
-            output["executable"] = exe_path
+    def _get_query_lock(self, exe_path: str, mtime: float) -> FileLock | None:
+        """
+        Get the lock that must be held to query an install, if single flight
+        queries are enabled and the install can be cached.
 
-        install = PythonInstall.from_json(**output, managed_by=managed_by)
+        :param exe_path: Absolute path to the runtime .exe
+        :param mtime: mtime of the runtime .exe
+        :return: FileLock in a 'locks' folder next to the cache or None
+        """
+        if not self.single_flight or mtime == 0:
+            return None
+        digest = _laz.hashlib.sha256(exe_path.encode("utf8")).hexdigest()[:32]
+        lock_path = os.path.join(
+            os.path.dirname(os.path.abspath(self.cache_path)), "locks", f"{digest}.lock"
+        )
+        return FileLock(lock_path, timeout=self.single_flight_timeout)
 
-        return install
+    def _lookup_cache(self, exe_path: str) -> tuple[dict | None, float | None]:
+        """
+        Get a cache entry if it is still valid, removing it if it is outdated.
 
-    def get_install_details(
-        self,
-        exe_path: str,
-        managed_by: str | None = None,
-        metadata: dict | None = None,
-    ) -> PythonInstall | None:
-        exe_path = os.path.abspath(exe_path)
-        mtime = os.stat(exe_path).st_mtime
+        :param exe_path: Absolute path to the runtime .exe
+        :return: valid cache entry or None,
+                 mtime of the executable or None if it does not exist
+        """
+        self.stats.count_stat()
+        try:
+            mtime = os.stat(exe_path).st_mtime
+        except OSError:
+            # Removed since it was found, or a link to a removed executable
+            # listed from a cached folder listing
+            return None, None
 
         # If the mtime of the file has been set to 0
         # it is not possible to reliably cache install details
         cacheable_install = (mtime != 0)
 
-        install = None
         if cached_details := self.raw_cache.get(exe_path):
             if cacheable_install and cached_details["mtime"] == mtime:
-                install = PythonInstall.from_json(**cached_details["install"])
-            else:
-                self.raw_cache.pop(exe_path)
-                self._dirty_cache = True
+                return self._mark_seen(exe_path, cached_details), mtime
 
-        if install is None:
-            install = self.query_install(exe_path, managed_by, metadata)
-            if install and cacheable_install:
-                self.raw_cache[exe_path] = {
-                    "mtime": mtime,
-                    "install": as_dict(install)
-                }
-                self._dirty_cache = True
+            self.raw_cache.pop(exe_path)
+            self.stats.count_stale_entry()
+            self._dirty_cache = True
 
-        return install
+        return None, mtime
+
+    def _mark_seen(self, exe_path: str, cached_details: dict) -> dict:
+        """
+        Update the time an executable was last seen for cache eviction
+
+        This is only written if it has changed by more than LAST_SEEN_RESOLUTION
+        so warm searches do not need to save the cache.
+
+        :param exe_path: Absolute path to the runtime .exe
+        :param cached_details: Valid cache entry for the executable
+        :return: The cache entry with the updated time
+        """
+        now = _laz.time.time()
+        if now - cached_details.get("last_seen", 0) >= LAST_SEEN_RESOLUTION:
+            cached_details = self.raw_cache[exe_path] = {
+                **cached_details, "last_seen": now
+            }
+            self._dirty_cache = True
+        return cached_details
+
+    @staticmethod
+    def _cache_has_tier(cached_details: dict, tier: str) -> bool:
+        # Full details and failed queries are stored under 'install'
+        # Details from a minimal query are stored separately under 'minimal'
+        return "install" in cached_details or (
+            tier != "full" and "minimal" in cached_details
+        )
+
+    def _install_from_cache(self, cached_details: dict) -> PythonInstall | None:
+        if "deferred" in cached_details:
+            # Only stored in snapshots, these are never written to the details cache
+            details = cached_details["deferred"]
+            install = DeferredPythonInstall(
+                version=tuple(details["version"]),
+                executable=details["executable"],
+                implementation=details["implementation"],
+                managed_by=details["managed_by"],
+                metadata=details["metadata"],
+            )
+            install._finder = self
+            return install
+
+        if "install" not in cached_details:
+            install = LazyPythonInstall.from_json(**cached_details["minimal"])
+            install._finder = self
+            return install
+
+        # Failed queries are cached with an install of None
+        if install_details := cached_details["install"]:
+            return PythonInstall.from_json(**install_details)
+        return None
+
+    def _store_cache(self, exe_path: str, mtime: float, install: PythonInstall | None) -> None:
+        failure = self._query_failures.pop(exe_path, None)
+        if mtime == 0:
+            return
+
+        last_seen = _laz.time.time()
+
+        if isinstance(install, DeferredPythonInstall) and not install._details_loaded:
+            # Nothing has been queried
+            return
+        elif isinstance(install, LazyPythonInstall) and not install._details_loaded:
+            self.raw_cache[exe_path] = {
+                "mtime": mtime,
+                "last_seen": last_seen,
+                "minimal": install._minimal_as_dict(),
+            }
+            self._dirty_cache = True
+        elif install:
+            self.raw_cache[exe_path] = {
+                "mtime": mtime,
+                "last_seen": last_seen,
+                "install": as_dict(install)
+            }
+            self._dirty_cache = True
+        elif failure:
+            self.raw_cache[exe_path] = {
+                "mtime": mtime,
+                "last_seen": last_seen,
+                "install": None,
+                "failure": failure,
+            }
+            self._dirty_cache = True
+
+    def _limited_install_details(
+        self,
+        exe_path: str,
+        managed_by: str | None = None,
+    ) -> PythonInstall | None:
+        # get_install_details limited by the slots shared by batch lookups
+        with self._lock:
+            if self._query_slots is None:
+                self._query_slots = _laz.threading.BoundedSemaphore(
+                    self.max_workers or os.cpu_count() or 1
+                )
+        with self._query_slots:
+            return self.get_install_details(exe_path, managed_by=managed_by)
+
+    def get_many_install_details(
+        self,
+        exe_paths: Iterable[str],
+        managed_by: str | None = None,
+        max_workers: int | None = None,
+    ) -> Iterator[PythonInstall | None]:
+        """
+        Get the details of multiple Python installs, running queries for any
+        installs that are not cached at the same time.
+
+        Results are yielded in the same order as the paths were given, with None
+        for any path that is not a valid Python install.
+
+        Only a limited number of queries are run ahead of the result being yielded
+        so closing the generator early avoids querying the remaining paths.
+
+        :param exe_paths: Paths to the runtime .exe files
+        :param managed_by: Which tool manages these installs (if any)
+        :param max_workers: Maximum number of simultaneous queries for this lookup,
+                            defaults to the finder's max_workers shared with
+                            every other lookup using the default
+        :yield: PythonInstall or None for each path in order
+        """
+        # Lookups using the finder's limit share it, so sources searched at the
+        # same time don't run max_workers queries each
+        if max_workers is None:
+            get_details = self._limited_install_details
+            max_workers = self.max_workers
+        else:
+            get_details = self.get_install_details
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        if max_workers <= 1:
+            for exe_path in exe_paths:
+                yield self.get_install_details(exe_path, managed_by=managed_by)
+            return
+
+        # Contains either completed PythonInstalls or Futures for running queries
+        pending = _laz.deque()
+        running = 0
+        pool = None
+
+        try:
+            for exe_path in exe_paths:
+                install = (
+                    self._get_cached_install(exe_path)
+                    or self._name_query_install(exe_path, managed_by)
+                )
+                if install is None and self.probe_tier == "deferred":
+                    install = self._deferred_install(exe_path, managed_by)
+                if install is None:
+                    # Only start the threads if something actually needs to be queried
+                    if pool is None:
+                        pool = _laz.ThreadPoolExecutor(max_workers=max_workers)
+                    pending.append(
+                        pool.submit(
+                            self.stats.bind_source(get_details),
+                            exe_path,
+                            managed_by=managed_by,
+                        )
+                    )
+                    running += 1
+                else:
+                    pending.append(install)
+
+                # Yield everything that is ready, wait if the worker limit is reached
+                while pending:
+                    item = pending[0]
+                    if isinstance(item, _laz.Future):
+                        if running < max_workers and not item.done():
+                            break
+                        running -= 1
+                        item = item.result()
+                    pending.popleft()
+                    yield item
+
+            while pending:
+                item = pending.popleft()
+                yield item.result() if isinstance(item, _laz.Future) else item
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
 
 
 class PythonInstall(Prefab):
@@ -443,13 +1864,21 @@ class PythonInstall(Prefab):
             paths=paths,
         )
 
-    def get_pip_version(self) -> str | None:
+    def get_pip_version(self, finder: DetailFinder | None = None) -> str | None:
         """
         Get the version of pip installed on a python install.
 
+        :param finder: DetailFinder to get the version through, this uses the
+                       cache and can be combined with other extras. If not
+                       given pip is queried directly.
         :return: None if pip is not found or the command fails
                  version number as string otherwise.
         """
+        if finder is not None:
+            with finder:
+                extras = finder.get_install_extras(self.executable, ["pip_version"])
+            return extras["pip_version"] if extras else None
+
         pip_call = _laz.subprocess.run(
             [self.executable, "-c", "import pip; print(pip.__version__, end='')"],
             text=True,
@@ -463,6 +1892,142 @@ class PythonInstall(Prefab):
         return pip_call.stdout
 
 
+# Slot descriptors for the fields LazyPythonInstall retrieves when accessed
+_architecture_slot = PythonInstall.__dict__["architecture"]
+_paths_slot = PythonInstall.__dict__["paths"]
+_metadata_slot = PythonInstall.__dict__["metadata"]
+
+
+class LazyPythonInstall(PythonInstall):
+    """
+    PythonInstall from a 'minimal' tier query.
+
+    The paths and any metadata that need a 'full' tier query are
+    retrieved through the finder when they are first accessed.
+    """
+    _finder: DetailFinder | None = attribute(default=None, private=True)
+    _details_loaded: bool = attribute(default=False, private=True)
+
+    @property  # type: ignore[misc]
+    def paths(self) -> dict[str, str]:
+        self._load_details()
+        return _paths_slot.__get__(self)
+
+    @paths.setter
+    def paths(self, value: dict[str, str]) -> None:
+        _paths_slot.__set__(self, value)
+
+    @property  # type: ignore[misc]
+    def metadata(self) -> dict:
+        # Only CPython 3.13+ has metadata (freethreaded) that needs a full query
+        if self.implementation == "cpython" and self.version >= (3, 13):
+            self._load_details()
+        return _metadata_slot.__get__(self)
+
+    @metadata.setter
+    def metadata(self, value: dict) -> None:
+        _metadata_slot.__set__(self, value)
+
+    def _field_values(self) -> tuple:
+        # The values as they are now, reading the properties would query the install
+        return (
+            self.version,
+            self.executable,
+            _architecture_slot.__get__(self),
+            self.implementation,
+            self.managed_by,
+            _metadata_slot.__get__(self),
+            _paths_slot.__get__(self),
+            self.shadowed,
+        )
+
+    def __repr__(self) -> str:
+        names = (
+            "version", "executable", "architecture", "implementation",
+            "managed_by", "metadata", "paths", "shadowed",
+        )
+        args = ", ".join(
+            f"{name}={value!r}" for name, value in zip(names, self._field_values())
+        )
+        return f"{type(self).__qualname__}({args})"
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._field_values() == other._field_values()
+
+    def _load_details(self) -> None:
+        if self._details_loaded:
+            return
+        self._details_loaded = True
+
+        finder = DetailFinder() if self._finder is None else self._finder
+        with finder:
+            install = finder.get_install_details(
+                self.executable,
+                managed_by=self.managed_by,
+                metadata=dict(_metadata_slot.__get__(self)),
+                tier="full",
+            )
+
+        if install is not None:
+            _architecture_slot.__set__(self, install.architecture)
+            _paths_slot.__set__(self, install.paths)
+            _metadata_slot.__set__(self, install.metadata)
+
+    def _minimal_as_dict(self) -> dict:
+        # as_dict would load the full details
+        return {
+            "version": self.version,
+            "executable": self.executable,
+            "architecture": self.architecture,
+            "implementation": self.implementation,
+            "managed_by": self.managed_by,
+            "metadata": _metadata_slot.__get__(self),
+        }
+
+
+class DeferredPythonInstall(LazyPythonInstall):
+    """
+    PythonInstall from a 'deferred' tier search.
+
+    Only the version (from the name of the install folder), executable,
+    implementation and managed_by are known without a query.
+    The install is queried when any of the other details are first accessed.
+    """
+    @property  # type: ignore[misc]
+    def architecture(self) -> str:
+        self._load_details()
+        return _architecture_slot.__get__(self)
+
+    @architecture.setter
+    def architecture(self, value: str) -> None:
+        _architecture_slot.__set__(self, value)
+
+    @property  # type: ignore[misc]
+    def metadata(self) -> dict:
+        self._load_details()
+        return _metadata_slot.__get__(self)
+
+    @metadata.setter
+    def metadata(self, value: dict) -> None:
+        _metadata_slot.__set__(self, value)
+
+    # Prefab would generate these again, reading the properties
+    __repr__ = LazyPythonInstall.__repr__
+    __eq__ = LazyPythonInstall.__eq__
+
+    def _deferred_as_dict(self) -> dict:
+        # as_dict would query the install
+        return {
+            "version": self.version,
+            "executable": self.executable,
+            "implementation": self.implementation,
+            "managed_by": self.managed_by,
+            "metadata": _metadata_slot.__get__(self),
+        }
+
+
 # Return type missing due to import requirements
 def _python_exe_regex(basename: str = "python"):
     if sys.platform == "win32":
@@ -471,19 +2036,19 @@ def _python_exe_regex(basename: str = "python"):
         return _laz.re.compile(rf"{basename}\d?\.?\d*")
 
 
-def get_folder_pythons(
+def _get_folder_candidates(
     base_folder: str | os.PathLike,
     basenames: tuple[str, ...] = ("python", "pypy", "micropython"),
-    finder: DetailFinder | None = None,
-    managed_by: str | None = None,
-) -> Iterator[PythonInstall]:
+    stats: DiscoveryStats | None = None,
+) -> Iterator[str]:
+    """
+    Yield the paths of files in a folder that look like Python executables
+    """
     regexes = [_python_exe_regex(name) for name in basenames]
 
-    finder = DetailFinder() if finder is None else finder
-
-    base_folder = str(base_folder)
-
-    with finder, os.scandir(base_folder) as fld:
+    if stats:
+        stats.count_scandir()
+    with os.scandir(str(base_folder)) as fld:
         for file_path in fld:
             try:
                 is_file = file_path.is_file()
@@ -499,30 +2064,103 @@ def get_folder_pythons(
                     # Might be a venv - look for pyvenv.cfg in parent
                     dirname = os.path.dirname(p)
 
+                    if stats:
+                        stats.count_stat()
                     if os.path.exists(os.path.join(dirname, "../pyvenv.cfg")):
                         continue
-                else:
-                    p = file_path.path
 
-                install = finder.get_install_details(p, managed_by=managed_by)
-                if install:
-                    yield install
+                yield p
+
+
+def get_folder_pythons(
+    base_folder: str | os.PathLike,
+    basenames: tuple[str, ...] = ("python", "pypy", "micropython"),
+    finder: DetailFinder | None = None,
+    managed_by: str | None = None,
+    version_filter: VersionFilter | None = None,
+) -> Iterator[PythonInstall]:
+    finder = DetailFinder() if finder is None else finder
+
+    candidates = finder.get_folder_candidates(base_folder, basenames)
+    if version_filter:
+        candidates = [p for p in candidates if version_filter.may_include_path(p)]
+
+    with finder:
+        for install in finder.get_many_install_details(candidates, managed_by=managed_by):
+            if install and (version_filter is None or version_filter.includes(install)):
+                yield install
 
 
 # UV Specific finder
-def get_uv_python_path() -> str | None:
-    # Attempt to get cache
+def _load_installer_cache() -> dict:
     try:
         with open(INSTALLER_CACHE_PATH) as f:
             installer_cache = _laz.json.load(f)
     except (FileNotFoundError, _laz.json.JSONDecodeError):
         installer_cache = {}
+    return installer_cache
+
+
+def _installer_cache_lock() -> FileLock:
+    # Sources searched at the same time may update the installer cache together
+    return FileLock(f"{INSTALLER_CACHE_PATH}.lock")
+
+
+def _write_installer_cache(installer_cache: dict) -> None:
+    # Replace the file so readers never see a partly written cache
+    folder = os.path.dirname(INSTALLER_CACHE_PATH)
+    os.makedirs(folder, exist_ok=True)
+    with _laz.tempfile.NamedTemporaryFile(
+        "w", dir=folder, prefix=".tmp_installer_", suffix=".json", delete=False
+    ) as f:
+        _laz.json.dump(installer_cache, f)
+    try:
+        os.replace(f.name, INSTALLER_CACHE_PATH)
+    except OSError:
+        os.remove(f.name)
+        raise
+
+
+def _save_installer_cache(installer_cache: dict) -> None:
+    """
+    Merge installer folders into the installer cache file
+
+    :param installer_cache: Installer folders to store by installer name
+    """
+    with _installer_cache_lock():
+        _write_installer_cache({**_load_installer_cache(), **installer_cache})
+
+
+def _get_installer_folder(installer: str, find_folder: Callable[[], str | None]) -> str | None:
+    """
+    Get the folder for an installer from the installer cache,
+    finding and storing it if it is missing or no longer exists
+
+    Only one thread or process finds the folder at a time, others waiting
+    for the lock use the folder it stored.
+
+    :param installer: Name of the installer in the cache
+    :param find_folder: Function to find the folder, usually by running the installer
+    :return: The installer folder or None if it could not be found
+    """
+    folder = _load_installer_cache().get(installer)
+    if folder and os.path.exists(folder):
+        return folder
+
+    with _installer_cache_lock():
+        installer_cache = _load_installer_cache()
+        folder = installer_cache.get(installer)
+        if folder and os.path.exists(folder):
+            return folder
+
+        folder = find_folder()
+        installer_cache[installer] = folder
+        _write_installer_cache(installer_cache)
+
+    return folder
 
-    uv_python_dir = installer_cache.get("uv")
-    if uv_python_dir and os.path.exists(uv_python_dir):
-        return uv_python_dir
 
-    # Cache failed
+def _find_uv_python_path() -> str | None:
     try:
         uv_python_find = _laz.subprocess.run(
             ["uv", "python", "dir"],
@@ -531,24 +2169,19 @@ def get_uv_python_path() -> str | None:
             capture_output=True
         )
     except (_laz.subprocess.CalledProcessError, FileNotFoundError):
-        uv_python_dir = None
-    else:
-        # remove newline
-        uv_python_dir = uv_python_find.stdout.strip()
+        return None
+    # remove newline
+    return uv_python_find.stdout.strip()
 
-    # Fill cache and update the cache file
-    installer_cache["uv"] = uv_python_dir
-    os.makedirs(os.path.dirname(INSTALLER_CACHE_PATH), exist_ok=True)
-    with open(INSTALLER_CACHE_PATH, 'w') as f:
-        _laz.json.dump(installer_cache, f)
 
-    return uv_python_dir
+def get_uv_python_path() -> str | None:
+    return _get_installer_folder("uv", _find_uv_python_path)
 
 
-def _implementation_from_uv_dir(
+def _executable_from_uv_dir(
     direntry: os.DirEntry,
-    finder: DetailFinder | None = None,
-) -> PythonInstall | None:
+    stats: DiscoveryStats | None = None,
+) -> str | None:
     if sys.platform == "win32":
         python_paths = [
             os.path.join(direntry, "python.exe"),
@@ -559,31 +2192,156 @@ def _implementation_from_uv_dir(
             os.path.join(direntry, "bin/python")
         ]
 
-    install: PythonInstall | None = None
-    finder = DetailFinder() if finder is None else finder
-
     for pth in python_paths:
+        if stats:
+            stats.count_stat()
         if os.path.exists(pth):
-            install = finder.get_install_details(pth, managed_by="Astral")
-            break
+            return pth
+
+    return None
 
-    return install
+
+def _get_uv_candidates(
+    uv_python_path: str,
+    stats: DiscoveryStats | None = None,
+) -> Iterator[str]:
+    """
+    Yield the paths of the Python executables in the uv python folder
+    """
+    if stats:
+        stats.count_scandir()
+    with os.scandir(uv_python_path) as fld:
+        for f in fld:
+            if (
+                f.is_dir()
+                and not f.is_symlink()
+                and (pth := _executable_from_uv_dir(f, stats))
+            ):
+                yield pth
 
 
-def get_uv_pythons(finder=None) -> Iterator[PythonInstall]:
+def get_uv_pythons(
+    finder=None,
+    version_filter: VersionFilter | None = None,
+    environ: Mapping[str, str] | None = None,
+) -> Iterator[PythonInstall]:
     # This takes some shortcuts over the regular pythonfinder
     # As the UV folders give the python version and the implementation
+    # The folder comes from uv's own settings so environ is not used
     if (
         (uv_python_path := get_uv_python_path())
         and os.path.exists(uv_python_path)
     ):
         finder = DetailFinder() if finder is None else finder
 
-        with finder, os.scandir(uv_python_path) as fld:
-            for f in fld:
-                if (
-                    f.is_dir()
-                    and not f.is_symlink()
-                    and (install := _implementation_from_uv_dir(f, finder=finder))
-                ):
+        candidates = _get_uv_candidates(uv_python_path, stats=finder.stats)
+        if version_filter:
+            candidates = filter(version_filter.may_include_path, candidates)
+
+        with finder:
+            for install in finder.get_many_install_details(candidates, managed_by="Astral"):
+                if install and (version_filter is None or version_filter.includes(install)):
                     yield install
+
+
+# Marks the end of a source in merge_sources
+_SOURCE_DONE = object()
+
+
+def _run_source(source: Iterable[PythonInstall], output, stop) -> None:
+    # Producer thread for merge_sources
+    iterator = iter(source)
+    try:
+        for install in iterator:
+            output.put(install)
+            if stop.is_set():
+                break
+    except Exception as e:  # noqa: BLE001 - Raised again by merge_sources in the consuming thread
+        output.put((_SOURCE_DONE, e))
+    else:
+        output.put((_SOURCE_DONE, None))
+    finally:
+        if hasattr(iterator, "close"):
+            iterator.close()
+
+
+def merge_sources(
+    sources: Sequence[Iterable[PythonInstall]],
+    concurrent: bool = True,
+) -> Generator[PythonInstall, None, None]:
+    """
+    Yield the installs from each source in the same order as chaining them,
+    while searching all of the sources at the same time.
+
+    Each source runs in its own thread. An install is only yielded once every
+    earlier source has finished, so an earlier source can still shadow it when
+    the results are deduplicated.
+
+    :param sources: Iterables of installs in order of precedence
+    :param concurrent: Search the sources one after another if False
+    :yield: Installs from each source in order
+    """
+    if not concurrent or len(sources) <= 1:
+        yield from _laz.chain.from_iterable(sources)
+        return
+
+    stop = _laz.threading.Event()
+    outputs = [_laz.SimpleQueue() for _ in sources]
+    threads = [
+        _laz.threading.Thread(target=_run_source, args=(source, output, stop), daemon=True)
+        for source, output in zip(sources, outputs)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        for output in outputs:
+            while True:
+                item = output.get()
+                if type(item) is tuple and item[0] is _SOURCE_DONE:
+                    if item[1] is not None:
+                        raise item[1]
+                    break
+                yield item
+    finally:
+        # Stop any sources still running after their current install
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def search_sources(
+    finder: DetailFinder,
+    version_filter: VersionFilter | None = None,
+    sources: Iterable[str] | None = None,
+    environ: Mapping[str, str] | None = None,
+) -> Iterator[PythonInstall]:
+    """
+    Search the discovery sources at the same time and yield each install
+    the first time its executable is found
+
+    :param finder: DetailFinder used by every source
+    :param version_filter: Only yield installs within this filter
+    :param sources: Names of the sources to search, defaults to every default source
+    :param environ: Environment variables to search with instead of os.environ
+                    Installs are still queried with os.environ
+    :yield: Installs from each source in order of precedence
+    """
+    listed_bins: set[str] = set()
+
+    stats = finder.stats
+    chain_commands = [
+        stats.timed_source(source.name, source.search(finder, version_filter, environ))
+        for source in get_sources(sources)
+    ]
+    with finder:
+        # Sources are searched at the same time unless queries are limited to one
+        installs = merge_sources(chain_commands, concurrent=finder.max_workers != 1)
+        try:
+            for py in installs:
+                if py.real_executable not in listed_bins:
+                    yield py
+                    listed_bins.add(py.real_executable)
+        finally:
+            # Wait for the sources to stop before the finder saves
+            installs.close()
@@ -0,0 +1,294 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Store the complete result of a search for Python installs along with a
+fingerprint of the environment it was found in.
+
+While the fingerprint matches, the stored installs are returned after checking
+the environment variables and the folders that were searched, without
+scanning folders or checking the details cache of each executable.
+
+The fingerprint covers PATH, PYENV_ROOT, the probe tier, the folders that were
+searched and the folders containing each install that was found.
+A Python executable replaced in place without changing the contents of its
+folder will not be noticed until the folder changes.
+"""
+from __future__ import annotations
+
+import os
+import os.path
+
+try:
+    from _collections_abc import Callable, Iterable, Iterator, Mapping
+except ImportError:
+    from collections.abc import Callable, Iterable, Iterator, Mapping
+
+from ducktools.classbuilder.prefab import as_dict
+from ducktools.lazyimporter import LazyImporter, ModuleImport
+
+from .shared import (
+    DetailFinder,
+    DeferredPythonInstall,
+    LazyPythonInstall,
+    PythonInstall,
+    _get_folder_stamp,
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from .candidates import VersionFilter
+
+_laz = LazyImporter(
+    [
+        ModuleImport("json"),
+        ModuleImport("tempfile"),
+    ]
+)
+
+
+SNAPSHOT_VERSION = 1
+
+# Environment variables that change the result of a search
+SNAPSHOT_ENVIRON = ("PATH", "PYENV_ROOT")
+
+
+def _snapshot_environ(environ: Mapping[str, str] | None) -> dict[str, str | None]:
+    environ = os.environ if environ is None else environ
+    return {name: environ.get(name) for name in SNAPSHOT_ENVIRON}
+
+
+def get_fingerprint(
+    finder: DetailFinder,
+    folders: Iterable[str],
+    environ: Mapping[str, str] | None = None,
+) -> dict:
+    """
+    Get the fingerprint of the environment for a search of the given folders
+
+    :param finder: DetailFinder used for the search
+    :param folders: Folders that are searched (or would be if they existed)
+    :param environ: Environment variables of the search, defaults to os.environ
+    :return: JSON serializable fingerprint
+    """
+    folders = list(dict.fromkeys(f for f in folders if f))
+    finder.stats.count_stat(len(folders))
+    return {
+        "environ": _snapshot_environ(environ),
+        "probe_tier": finder.probe_tier,
+        "folders": {f: _get_folder_stamp(f) for f in folders},
+    }
+
+
+def fingerprint_matches(
+    finder: DetailFinder,
+    fingerprint: dict,
+    environ: Mapping[str, str] | None = None,
+) -> bool:
+    """
+    Check if the environment still matches a fingerprint from get_fingerprint
+
+    :param finder: DetailFinder that will use the result
+    :param fingerprint: Fingerprint to check
+    :param environ: Environment variables to check, defaults to os.environ
+    :return: True if nothing in the fingerprint has changed
+    """
+    if (
+        fingerprint.get("environ") != _snapshot_environ(environ)
+        or fingerprint.get("probe_tier") != finder.probe_tier
+    ):
+        return False
+
+    folders = fingerprint.get("folders", {})
+    finder.stats.count_stat(len(folders))
+    return all(_get_folder_stamp(f) == stamp for f, stamp in folders.items())
+
+
+def install_to_entry(install: PythonInstall) -> dict:
+    """
+    Convert an install to a JSON serializable snapshot entry
+
+    :param install: PythonInstall from a search
+    :return: dict in the format of a details cache entry with the shadowed flag
+    """
+    entry: dict[str, Any]
+    if isinstance(install, DeferredPythonInstall) and not install._details_loaded:
+        entry = {"deferred": install._deferred_as_dict()}
+    elif isinstance(install, LazyPythonInstall) and not install._details_loaded:
+        entry = {"minimal": install._minimal_as_dict()}
+    else:
+        entry = {"install": as_dict(install)}
+    entry["shadowed"] = install.shadowed
+    return entry
+
+
+def install_from_entry(finder: DetailFinder, entry: dict) -> PythonInstall | None:
+    """
+    Convert a snapshot entry from install_to_entry back to an install
+
+    :param finder: DetailFinder used to get details of installs from a minimal search
+    :param entry: Snapshot entry
+    :return: PythonInstall or None if the entry has no install
+    """
+    if install := finder._install_from_cache(entry):
+        # Shadowing depends on the search, it is not part of the cached details
+        install.shadowed = entry.get("shadowed", False)
+    return install
+
+
+def make_snapshot(
+    finder: DetailFinder,
+    search_folders: list[str],
+    installs: list[PythonInstall],
+    environ: Mapping[str, str] | None = None,
+) -> dict:
+    """
+    Make a snapshot of the installs found by a completed search
+
+    :param finder: DetailFinder used for the search
+    :param search_folders: Folders that were scanned
+    :param installs: Installs found by the search, in order
+    :param environ: Environment variables of the search, defaults to os.environ
+    :return: JSON serializable snapshot
+    """
+    install_folders = [os.path.dirname(install.executable) for install in installs]
+    return {
+        "version": SNAPSHOT_VERSION,
+        "search_folders": search_folders,
+        "fingerprint": get_fingerprint(
+            finder, [*search_folders, *install_folders], environ
+        ),
+        "installs": [install_to_entry(install) for install in installs],
+    }
+
+
+def snapshot_matches(
+    finder: DetailFinder,
+    snapshot: dict,
+    search_folders: list[str],
+    environ: Mapping[str, str] | None = None,
+) -> bool:
+    """
+    Check if a snapshot from make_snapshot is still valid
+
+    :param finder: DetailFinder that will use the result
+    :param snapshot: Snapshot to check
+    :param search_folders: Folders a search would scan now
+    :param environ: Environment variables of the search, defaults to os.environ
+    :return: True if the snapshot can be used instead of searching
+    """
+    return (
+        snapshot.get("version") == SNAPSHOT_VERSION
+        and snapshot.get("search_folders") == search_folders
+        and fingerprint_matches(finder, snapshot.get("fingerprint", {}), environ)
+    )
+
+
+def load_snapshot(finder: DetailFinder, search_folders: list[str]) -> list[PythonInstall] | None:
+    """
+    Get the installs from the finder's snapshot if the fingerprint still matches
+
+    :param finder: DetailFinder with the snapshot_path to use
+    :param search_folders: Folders the search would scan
+    :return: list of installs or None if there is no valid snapshot
+    """
+    try:
+        with open(finder.snapshot_path) as f:
+            snapshot = _laz.json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(snapshot, dict) or not snapshot_matches(finder, snapshot, search_folders):
+        return None
+
+    return [
+        install
+        for entry in snapshot.get("installs", [])
+        if (install := install_from_entry(finder, entry))
+    ]
+
+
+def save_snapshot(
+    finder: DetailFinder,
+    search_folders: list[str],
+    installs: list[PythonInstall],
+) -> None:
+    """
+    Store the installs from a completed search in the finder's snapshot
+
+    :param finder: DetailFinder with the snapshot_path to use
+    :param search_folders: Folders that were scanned
+    :param installs: Installs found by the search, in order
+    """
+    snapshot = make_snapshot(finder, search_folders, installs)
+
+    folder = os.path.dirname(finder.snapshot_path)
+    try:
+        os.makedirs(folder, exist_ok=True)
+        with _laz.tempfile.NamedTemporaryFile(
+            "w", dir=folder, prefix=".tmp_snapshot_", suffix=".json", delete=False
+        ) as f:
+            _laz.json.dump(snapshot, f)
+        os.replace(f.name, finder.snapshot_path)
+    except OSError:
+        # The snapshot is only an optimisation
+        pass
+
+
+def search_with_snapshot(
+    search: Callable[[DetailFinder], Iterator[PythonInstall]],
+    finder: DetailFinder,
+    search_folders: list[str],
+    version_filter: VersionFilter | None = None,
+) -> Iterator[PythonInstall]:
+    """
+    Yield installs from the snapshot if it is valid, otherwise run the search
+    and store the results if it is completed.
+
+    :param search: Function that searches for installs with a finder
+    :param finder: DetailFinder to use
+    :param search_folders: Folders the search will scan, part of the fingerprint
+    :param version_filter: Filter applied by the search, a filtered search is
+                           not stored as the snapshot is of every install
+    :yield: Discovered PythonInstalls
+    """
+    with finder.stats.source("snapshot"):
+        installs = load_snapshot(finder, search_folders)
+
+    if installs is not None:
+        if version_filter:
+            installs = [install for install in installs if version_filter.includes(install)]
+        yield from installs
+        return
+
+    if version_filter:
+        yield from search(finder)
+        return
+
+    installs = []
+    for install in search(finder):
+        installs.append(install)
+        yield install
+
+    save_snapshot(finder, search_folders, installs)
@@ -0,0 +1,257 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Registry of the discovery sources searched by get_python_installs
+
+A source is a function that takes `finder` and `version_filter` keyword arguments
+and yields PythonInstalls. Sources are registered with the import path of this
+function and the module is only imported when the source is searched.
+
+Other packages can provide sources with an entry point in the
+'ducktools.pythonfinder.sources' group that refers to a DiscoverySource.
+These are only looked up when a source that is not registered is requested
+by name, so the default search does not need to import importlib.metadata.
+"""
+from __future__ import annotations
+
+import sys
+
+from ducktools.classbuilder.prefab import Prefab
+from ducktools.lazyimporter import LazyImporter, ModuleImport, FromImport
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Mapping
+
+    from .candidates import VersionFilter
+    from .shared import DetailFinder, PythonInstall
+
+_laz = LazyImporter(
+    [
+        ModuleImport("importlib"),
+        FromImport("importlib.metadata", "entry_points"),
+    ]
+)
+
+SOURCES_ENTRY_POINT_GROUP = "ducktools.pythonfinder.sources"
+
+# Cost classes for sources
+# low: lists a few known folders or registry keys
+# medium: lists many folders or checks each candidate more thoroughly
+# high: scans every folder on PATH or similar
+COST_LOW = "low"
+COST_MEDIUM = "medium"
+COST_HIGH = "high"
+COST_CLASSES = (COST_LOW, COST_MEDIUM, COST_HIGH)
+
+
+class DiscoverySource(Prefab):
+    """
+    A source of Python installs for get_python_installs
+
+    :param name: Name used to select the source and for its statistics
+    :param function: Import path of the search function as 'module:function'
+    :param cost: Cost class of searching the source, see COST_CLASSES
+    :param needs_subprocess: Finding the installs may run a subprocess other than
+                             the installs themselves (eg: `pyenv root`)
+    :param default: Search this source when no sources are given
+    """
+    name: str
+    function: str
+    cost: str = COST_MEDIUM
+    needs_subprocess: bool = False
+    default: bool = True
+
+    def __prefab_post_init__(self):
+        if self.cost not in COST_CLASSES:
+            raise ValueError(f"cost must be one of {COST_CLASSES}, not {self.cost!r}")
+        if ":" not in self.function:
+            raise ValueError(
+                f"function must be given as 'module:function', not {self.function!r}"
+            )
+
+    def load(self) -> Callable[..., Iterator[PythonInstall]]:
+        """
+        Import the search function for this source
+
+        :return: The search function
+        """
+        module_name, _, function_name = self.function.partition(":")
+        module = _laz.importlib.import_module(module_name)
+        return getattr(module, function_name)
+
+    def search(
+        self,
+        finder: DetailFinder,
+        version_filter: VersionFilter | None = None,
+        environ: Mapping[str, str] | None = None,
+    ) -> Iterator[PythonInstall]:
+        """
+        Search this source for Python installs
+
+        The search function is only given `environ` if it is not None, so
+        functions that do not read environment variables need not accept it.
+
+        :param finder: DetailFinder used to get and cache install details
+        :param version_filter: Only include installs in this version range
+        :param environ: Environment variables to search with instead of os.environ
+        :return: Iterator of the installs found
+        """
+        if environ is None:
+            return self.load()(finder=finder, version_filter=version_filter)
+        return self.load()(finder=finder, version_filter=version_filter, environ=environ)
+
+
+# Registered sources in search order
+_registry: dict[str, DiscoverySource] = {}
+
+# Sources loaded from entry points, these are not part of the default search
+_entry_point_sources: dict[str, DiscoverySource] = {}
+
+
+def register_source(source: DiscoverySource, replace: bool = False) -> None:
+    """
+    Register a source for get_python_installs
+
+    Sources are searched in the order they are registered, installs found
+    by an earlier source take precedence over duplicates in later sources.
+
+    :param source: The DiscoverySource to register
+    :param replace: Replace an existing source with the same name
+    """
+    if source.name in _registry and not replace:
+        raise ValueError(f"A source named {source.name!r} is already registered")
+    _registry[source.name] = source
+
+
+def _load_entry_point_source(name: str) -> DiscoverySource | None:
+    if name not in _entry_point_sources:
+        for entry_point in _laz.entry_points(group=SOURCES_ENTRY_POINT_GROUP, name=name):
+            source = entry_point.load()
+            if not isinstance(source, DiscoverySource):
+                raise TypeError(
+                    f"Entry point {entry_point.value!r} for source {name!r} "
+                    f"is not a DiscoverySource"
+                )
+            _entry_point_sources[name] = source
+            break
+        else:
+            return None
+
+    return _entry_point_sources[name]
+
+
+def get_source(name: str) -> DiscoverySource:
+    """
+    Get a registered source or a source provided by an entry point
+
+    :param name: Name of the source
+    :return: The DiscoverySource
+    :raises ValueError: If no source has this name
+    """
+    if (source := _registry.get(name)) is not None:
+        return source
+    if (source := _load_entry_point_source(name)) is not None:
+        return source
+    raise ValueError(
+        f"Unknown source {name!r}, available sources are {list(_registry)} "
+        f"and any provided through the {SOURCES_ENTRY_POINT_GROUP!r} entry points"
+    )
+
+
+def get_sources(
+    names: Iterable[str] | None = None,
+    *,
+    max_cost: str | None = None,
+    allow_subprocess: bool = True,
+) -> list[DiscoverySource]:
+    """
+    Get the sources to search
+
+    The names of the sources returned can be given as `sources` to
+    get_python_installs to only search the cheaper sources.
+
+    :param names: Names of the sources in search order,
+                  None for the default registered sources
+    :param max_cost: Only include sources of this cost class or lower, see COST_CLASSES
+    :param allow_subprocess: Include sources that may run a subprocess to find installs
+    :return: list of DiscoverySources
+    """
+    if names is None:
+        sources = [source for source in _registry.values() if source.default]
+    else:
+        sources = [get_source(name) for name in names]
+
+    if max_cost is not None:
+        if max_cost not in COST_CLASSES:
+            raise ValueError(f"max_cost must be one of {COST_CLASSES}, not {max_cost!r}")
+        cost_limit = COST_CLASSES.index(max_cost)
+        sources = [s for s in sources if COST_CLASSES.index(s.cost) <= cost_limit]
+
+    if not allow_subprocess:
+        sources = [s for s in sources if not s.needs_subprocess]
+
+    return sources
+
+
+_uv_source = DiscoverySource(
+    "uv",
+    "ducktools.pythonfinder.shared:get_uv_pythons",
+    cost=COST_LOW,
+    needs_subprocess=True,  # `uv python dir` if the folder is not cached
+)
+
+if sys.platform == "win32":
+    _builtin_sources = [
+        DiscoverySource(
+            "registry",
+            "ducktools.pythonfinder.win32.registry_search:get_registered_pythons",
+            cost=COST_LOW,
+        ),
+        DiscoverySource(
+            "pyenv",
+            "ducktools.pythonfinder.win32.pyenv_search:get_pyenv_pythons",
+            cost=COST_LOW,
+        ),
+        _uv_source,
+    ]
+else:
+    _path_module = "darwin" if sys.platform == "darwin" else "linux"
+    _builtin_sources = [
+        DiscoverySource(
+            "pyenv",
+            "ducktools.pythonfinder.linux.pyenv_search:get_pyenv_pythons",
+            cost=COST_LOW,
+            needs_subprocess=True,  # `pyenv root` if PYENV_ROOT is not set
+        ),
+        _uv_source,
+        DiscoverySource(
+            "PATH",
+            f"ducktools.pythonfinder.{_path_module}:get_path_pythons",
+            cost=COST_HIGH,
+            needs_subprocess=True,  # Gets the pyenv and uv folders to exclude them
+        ),
+    ]
+
+for _source in _builtin_sources:
+    register_source(_source)
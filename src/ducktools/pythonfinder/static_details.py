@@ -0,0 +1,398 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Get the details of a CPython install from the files in its install folder
+without running the executable.
+
+This gives the same output as details_script but only works for standard
+CPython layouts. If the layout is not recognised or is ambiguous None
+is returned and the install should be queried by running details_script.
+
+get_name_details goes further for pyenv and uv installs and only uses the
+name of the install folder, without reading any files.
+"""
+from __future__ import annotations
+
+import os
+import os.path
+import sys
+
+from ducktools.lazyimporter import LazyImporter, ModuleImport
+
+_laz = LazyImporter(
+    [
+        ModuleImport("re"),
+    ]
+)
+
+EXE_NAME_RE = r"python(?P<major>\d)?(?:\.(?P<minor>\d+))?(?P<freethreaded>t)?"
+STDLIB_NAME_RE = r"python(?P<major>\d)\.(?P<minor>\d+)(?P<freethreaded>t)?"
+CONFIG_VAR_RE = r"[{{\s]'{name}': (?P<value>'[^']*'|-?\d+)[,}}]"
+PATCHLEVEL_RE = r"^#define {name}\s+(?P<value>\w+)"
+
+VERSION_NAME_RE = (
+    r"(?P<major>\d+)\.(?P<minor>\d+)\.(?P<micro>\d+)(?:(?P<level>a|b|rc)(?P<serial>\d+))?"
+)
+# 3.12.1, 3.13.0t, 3.14.0a1
+PYENV_NAME_RE = VERSION_NAME_RE + r"(?P<freethreaded>t)?"
+# cpython-3.13.1+freethreaded-linux-x86_64-gnu
+UV_NAME_RE = (
+    r"cpython-" + VERSION_NAME_RE
+    + r"(?:\+(?P<variant>[a-z+]+))?-(?P<os>[^-]+)-(?P<arch>[^-]+)-(?P<libc>[^-]+)"
+)
+
+NAME_RELEASE_LEVELS = {
+    "a": "alpha",
+    "b": "beta",
+    "rc": "candidate",
+    None: "final",
+}
+
+# Architectures from uv names for 32 bit platforms, anything else is 64 bit
+UV_32BIT_ARCHES = {"i686", "i386", "x86", "armv5tel", "armv6", "armv7", "armv7l"}
+
+RELEASE_LEVELS = {
+    "PY_RELEASE_LEVEL_ALPHA": "alpha",
+    "PY_RELEASE_LEVEL_BETA": "beta",
+    "PY_RELEASE_LEVEL_GAMMA": "candidate",
+    "PY_RELEASE_LEVEL_FINAL": "final",
+}
+
+
+def _read_config_vars(sysconfigdata_path: str, names: list[str]) -> dict[str, str | int]:
+    """
+    Get the values of build time variables from a _sysconfigdata_*.py file
+    without importing it.
+    """
+    with open(sysconfigdata_path) as f:
+        source = f.read()
+
+    config_vars: dict[str, str | int] = {}
+    for name in names:
+        match = _laz.re.search(CONFIG_VAR_RE.format(name=_laz.re.escape(name)), source)
+        if match:
+            value = match.group("value")
+            config_vars[name] = value[1:-1] if value.startswith("'") else int(value)
+
+    return config_vars
+
+
+def _read_patchlevel(patchlevel_path: str) -> tuple[int, int, int, str, int] | None:
+    """
+    Get the version tuple from the macros in a patchlevel.h file
+    """
+    with open(patchlevel_path) as f:
+        source = f.read()
+
+    values = []
+    for name in [
+        "PY_MAJOR_VERSION",
+        "PY_MINOR_VERSION",
+        "PY_MICRO_VERSION",
+        "PY_RELEASE_LEVEL",
+        "PY_RELEASE_SERIAL",
+    ]:
+        match = _laz.re.search(
+            PATCHLEVEL_RE.format(name=name),
+            source,
+            flags=_laz.re.MULTILINE,
+        )
+        if not match:
+            return None
+        values.append(match.group("value"))
+
+    major, minor, micro, releaselevel, serial = values
+
+    if releaselevel not in RELEASE_LEVELS:
+        return None
+
+    try:
+        return int(major), int(minor), int(micro), RELEASE_LEVELS[releaselevel], int(serial)
+    except ValueError:
+        return None
+
+
+def get_cpython_paths(
+    prefix: str,
+    version: tuple[int, int, int] | tuple[int, int, int, str, int],
+    abiflags: str = "",
+    platlibdir: str = "lib",
+    freethreaded: bool = False,
+) -> dict[str, str]:
+    """
+    Get the paths sysconfig.get_paths() would give for a CPython install
+    using the default 'posix_prefix' scheme.
+
+    :param prefix: sys.prefix of the install
+    :param version: version of the install, only major and minor are used
+    :param abiflags: sys.abiflags of the install
+    :param platlibdir: sys.platlibdir of the install
+    :param freethreaded: True if this is a free-threaded build
+    :return: dictionary of paths
+    """
+    abi_thread = "t" if freethreaded else ""
+    py_version_short = f"{version[0]}.{version[1]}"
+    stdlib_name = f"python{py_version_short}{abi_thread}"
+
+    # platlibdir was only added in 3.9
+    if version < (3, 9):
+        platlibdir = "lib"
+
+    return {
+        "stdlib": os.path.join(prefix, platlibdir, stdlib_name),
+        "platstdlib": os.path.join(prefix, platlibdir, stdlib_name),
+        "purelib": os.path.join(prefix, "lib", stdlib_name, "site-packages"),
+        "platlib": os.path.join(prefix, platlibdir, stdlib_name, "site-packages"),
+        "include": os.path.join(prefix, "include", f"python{py_version_short}{abiflags}"),
+        "platinclude": os.path.join(prefix, "include", f"python{py_version_short}{abiflags}"),
+        "scripts": os.path.join(prefix, "bin"),
+        "data": prefix,
+    }
+
+
+def get_static_details(exe_path: str) -> dict | None:
+    """
+    Get the details of a CPython install in the same format as details_script
+    by reading the files in its install folder.
+
+    :param exe_path: Path to the python executable
+    :return: dict of install details or None if the layout is not recognised
+    """
+    if sys.platform == "win32":
+        # Windows installs use a different layout with no patchlevel.h or sysconfigdata
+        return None
+
+    real_exe = os.path.realpath(exe_path)
+    bin_folder = os.path.dirname(real_exe)
+    prefix = os.path.dirname(bin_folder)
+
+    exe_match = _laz.re.fullmatch(EXE_NAME_RE, os.path.basename(real_exe))
+    if os.path.basename(bin_folder) != "bin" or not exe_match:
+        return None
+
+    # venvs and distribution patched layouts have different paths
+    # pyvenv.cfg is found relative to the executable before resolving links
+    exe_folder = os.path.dirname(os.path.abspath(exe_path))
+    if (
+        os.path.exists(os.path.join(exe_folder, "pyvenv.cfg"))
+        or os.path.exists(os.path.join(os.path.dirname(exe_folder), "pyvenv.cfg"))
+        or os.path.exists(os.path.join(prefix, "pyvenv.cfg"))
+        or os.path.exists(os.path.join(prefix, "lib", "python3", "dist-packages"))
+    ):
+        return None
+
+    # Find the stdlib folder that matches the executable name
+    lib_folder = os.path.join(prefix, "lib")
+    try:
+        lib_names = os.listdir(lib_folder)
+    except OSError:
+        return None
+
+    stdlib_matches = []
+    for name in lib_names:
+        if not (stdlib_match := _laz.re.fullmatch(STDLIB_NAME_RE, name)):
+            continue
+        if any(
+            (exe_value := exe_match.group(key)) and exe_value != stdlib_match.group(key)
+            for key in ["major", "minor", "freethreaded"]
+        ):
+            continue
+        if os.path.exists(os.path.join(lib_folder, name, "os.py")):
+            stdlib_matches.append((name, stdlib_match))
+
+    if len(stdlib_matches) != 1:
+        return None
+
+    stdlib_name, stdlib_match = stdlib_matches[0]
+
+    if stdlib_match.group("major") != "3":
+        # Python 2 uses different sysconfig schemes
+        return None
+
+    stdlib_folder = os.path.join(lib_folder, stdlib_name)
+    sysconfigdata_files = [
+        name for name in os.listdir(stdlib_folder)
+        if name.startswith("_sysconfigdata_") and name.endswith(".py")
+    ]
+    if len(sysconfigdata_files) != 1:
+        return None
+
+    config_vars = _read_config_vars(
+        os.path.join(stdlib_folder, sysconfigdata_files[0]),
+        ["ABIFLAGS", "PLATLIBDIR", "Py_GIL_DISABLED", "SIZEOF_VOID_P"],
+    )
+
+    abiflags = config_vars.get("ABIFLAGS")
+    sizeof_void_p = config_vars.get("SIZEOF_VOID_P")
+    if not isinstance(abiflags, str) or not isinstance(sizeof_void_p, int):
+        return None
+
+    patchlevel_path = os.path.join(
+        prefix, "include", f"python3.{stdlib_match.group('minor')}{abiflags}", "patchlevel.h"
+    )
+    try:
+        version = _read_patchlevel(patchlevel_path)
+    except OSError:
+        return None
+
+    if version is None or version[:2] != (3, int(stdlib_match.group("minor"))):
+        return None
+
+    freethreaded = bool(config_vars.get("Py_GIL_DISABLED"))
+    platlibdir = config_vars.get("PLATLIBDIR", "lib")
+    assert isinstance(platlibdir, str)
+
+    metadata = {}
+    if version >= (3, 13):
+        metadata["freethreaded"] = freethreaded
+
+    return {
+        "version": list(version),
+        "executable": exe_path,
+        "architecture": "64bit" if sizeof_void_p == 8 else "32bit",
+        "implementation": "cpython",
+        "metadata": metadata,
+        "paths": get_cpython_paths(prefix, version, abiflags, platlibdir, freethreaded),
+    }
+
+
+def _match_install_name(exe_path: str, managed_by: str | None):
+    """
+    Match the name of the folder of a pyenv or uv managed CPython install
+
+    :return: tuple of the install prefix and the regex match or None
+    """
+    exe_folder = os.path.dirname(os.path.abspath(exe_path))
+    if sys.platform == "win32":
+        # pyenv-win and uv place python.exe directly in the install folder
+        prefix = exe_folder
+    elif os.path.basename(exe_folder) == "bin":
+        prefix = os.path.dirname(exe_folder)
+    else:
+        return None
+
+    name = os.path.basename(prefix)
+    re = _laz.re
+
+    if managed_by == "pyenv":
+        match = re.fullmatch(PYENV_NAME_RE, name)
+    elif managed_by == "Astral":
+        match = re.fullmatch(UV_NAME_RE, name)
+    else:
+        match = None
+
+    return (prefix, match) if match else None
+
+
+def _version_from_match(match) -> tuple[int, int, int, str, int]:
+    return (
+        int(match.group("major")),
+        int(match.group("minor")),
+        int(match.group("micro")),
+        NAME_RELEASE_LEVELS[match.group("level")],
+        int(match.group("serial") or 0),
+    )
+
+
+def get_name_version(
+    exe_path: str,
+    managed_by: str | None,
+) -> tuple[int, int, int, str, int] | None:
+    """
+    Get the full version of a pyenv or uv managed CPython install from the
+    name of its install folder.
+
+    Unlike get_name_details this includes debug builds and Windows installs.
+
+    :param exe_path: Path to the python executable of the install
+    :param managed_by: 'pyenv' or 'Astral', other installs are not supported
+    :return: version tuple or None if the name is not recognised
+    """
+    if not (name_match := _match_install_name(exe_path, managed_by)):
+        return None
+
+    version = _version_from_match(name_match[1])
+    return version if version[0] == 3 else None
+
+
+def get_name_details(
+    exe_path: str,
+    managed_by: str | None,
+    architecture: str | None = None,
+) -> dict | None:
+    """
+    Get the details of a pyenv or uv managed CPython install in the same format
+    as details_script from the name of its install folder.
+
+    No files are read, the paths are those of a standard CPython layout in the
+    install folder.
+
+    :param exe_path: Path to the python executable in the bin folder of the install
+    :param managed_by: 'pyenv' or 'Astral', other installs are not supported
+    :param architecture: Architecture read from the executable header, used if
+                         the name does not include it
+    :return: dict of install details or None if the name is not recognised
+    """
+    if sys.platform == "win32":
+        return None
+
+    if not (name_match := _match_install_name(exe_path, managed_by)):
+        return None
+
+    prefix, match = name_match
+
+    if managed_by == "pyenv":
+        freethreaded = bool(match.group("freethreaded"))
+    else:
+        variant = match.group("variant")
+        if variant not in {None, "freethreaded"}:
+            # Debug builds have a different layout
+            return None
+        freethreaded = variant == "freethreaded"
+        architecture = "32bit" if match.group("arch") in UV_32BIT_ARCHES else "64bit"
+
+    version = _version_from_match(match)
+
+    if version[0] != 3 or (freethreaded and version < (3, 13)):
+        return None
+
+    if architecture is None:
+        architecture = "64bit" if sys.maxsize > 2**32 else "32bit"
+
+    # 3.7 and earlier default to the pymalloc 'm' abiflag
+    abiflags = "m" if version < (3, 8) else ""
+    if freethreaded:
+        abiflags += "t"
+
+    metadata = {}
+    if version >= (3, 13):
+        metadata["freethreaded"] = freethreaded
+
+    return {
+        "version": list(version),
+        "executable": exe_path,
+        "architecture": architecture,
+        "implementation": "cpython",
+        "metadata": metadata,
+        "paths": get_cpython_paths(prefix, version, abiflags, "lib", freethreaded),
+    }
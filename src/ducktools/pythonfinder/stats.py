@@ -0,0 +1,253 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Statistics recorded by a DetailFinder while discovering and querying installs.
+"""
+from __future__ import annotations
+
+import time
+
+try:
+    from _collections_abc import Iterable, Iterator
+except ImportError:
+    from collections.abc import Iterable, Iterator
+
+from ducktools.classbuilder.prefab import Prefab, attribute
+from ducktools.lazyimporter import LazyImporter, FromImport
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import threading
+    from collections import deque
+
+_laz = LazyImporter(
+    [
+        FromImport("collections", "deque"),
+        FromImport("threading", "Lock"),
+        FromImport("threading", "local"),
+    ]
+)
+
+
+# Name used for counts recorded outside a discovery source
+OTHER_SOURCE = "other"
+
+# Number of the most recent probes to keep the details of, the count and total
+# time include every probe. Long running finders (the server, watches) would
+# otherwise keep the details of every probe they make.
+MAX_RECORDED_PROBES = 1000
+
+
+class ProbeStats(Prefab):
+    """
+    Timing of a single attempt to query an executable
+
+    CPU times are from the rusage of the query process itself when it is reaped
+    so are not affected by other queries running at the same time. These are
+    None on Windows and for queries run with asyncio.
+    """
+    executable: str
+    wall_time: float
+    user_time: float | None = None
+    system_time: float | None = None
+    succeeded: bool = True
+
+
+class SourceStats(Prefab):
+    """
+    Counts and time spent for one discovery source (pyenv, uv, PATH, registry)
+    """
+    name: str
+    time: float = 0.0
+    installs: int = 0
+    scandir_calls: int = 0
+    stat_calls: int = 0
+
+
+class DiscoveryStats(Prefab):
+    cache_hits: int = 0
+    cache_misses: int = 0
+    stale_entries: int = 0
+    probe_count: int = 0
+    probe_time: float = 0.0
+    # Details of the most recent probes, see MAX_RECORDED_PROBES
+    probes: deque[ProbeStats] = attribute(
+        default_factory=lambda: _laz.deque(maxlen=MAX_RECORDED_PROBES)
+    )
+    sources: dict[str, SourceStats] = attribute(default_factory=dict)
+
+    # Source that scandir and stat calls are currently counted against in each
+    # thread, sources may be searched at the same time in separate threads
+    _thread_source: threading.local = attribute(
+        default_factory=lambda: _laz.local(), private=True
+    )
+    # Queries for batch lookups run in worker threads
+    _lock: threading.Lock = attribute(default_factory=lambda: _laz.Lock(), private=True)
+
+    @property
+    def _current_source(self) -> str | None:
+        return getattr(self._thread_source, "name", None)
+
+    @_current_source.setter
+    def _current_source(self, name: str | None) -> None:
+        self._thread_source.name = name
+
+    def reset(self) -> None:
+        """
+        Clear all recorded statistics
+        """
+        with self._lock:
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.stale_entries = 0
+            self.probe_count = 0
+            self.probe_time = 0.0
+            self.probes.clear()
+            self.sources = {}
+
+    def _get_source(self, name: str | None) -> SourceStats:
+        name = OTHER_SOURCE if name is None else name
+        if (source := self.sources.get(name)) is None:
+            source = self.sources[name] = SourceStats(name)
+        return source
+
+    def count_cache_hit(self) -> None:
+        with self._lock:
+            self.cache_hits += 1
+
+    def count_cache_miss(self) -> None:
+        with self._lock:
+            self.cache_misses += 1
+
+    def count_stale_entry(self) -> None:
+        with self._lock:
+            self.stale_entries += 1
+
+    def count_scandir(self) -> None:
+        with self._lock:
+            self._get_source(self._current_source).scandir_calls += 1
+
+    def count_stat(self, count: int = 1) -> None:
+        with self._lock:
+            self._get_source(self._current_source).stat_calls += count
+
+    def record_probe(
+        self,
+        executable: str,
+        start_time: float,
+        cpu_times: tuple[float, float] | None,
+        succeeded: bool,
+    ) -> None:
+        """
+        Record a probe that has just finished
+
+        :param executable: Path to the executable that was queried
+        :param start_time: time.perf_counter() at the start of the probe
+        :param cpu_times: (user time, system time) of the query process or None
+        :param succeeded: The probe produced output
+        """
+        wall_time = time.perf_counter() - start_time
+        user_time, system_time = (None, None) if cpu_times is None else cpu_times
+
+        with self._lock:
+            self.probe_count += 1
+            self.probe_time += wall_time
+            self.probes.append(
+                ProbeStats(executable, wall_time, user_time, system_time, succeeded)
+            )
+
+    def timed_source(self, name: str, items: Iterable) -> Iterator:
+        """
+        Yield from a discovery source, recording the time spent getting each
+        install and counting scandir and stat calls against the source.
+
+        Time spent by the consumer between installs is not included.
+
+        :param name: Name of the source
+        :param items: Iterable of installs from the source
+        :yield: The installs from items
+        """
+        iterator = iter(items)
+        while True:
+            previous_source, self._current_source = self._current_source, name
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._current_source = previous_source
+                self._add_source_time(name, time.perf_counter() - start)
+
+            with self._lock:
+                self._get_source(name).installs += 1
+            yield item
+
+    def bind_source(self, func):
+        """
+        Wrap a function that will run in a worker thread so that its scandir and
+        stat calls are counted against the current source of this thread
+
+        :param func: Function to wrap
+        :return: Wrapped function
+        """
+        name = self._current_source
+
+        def source_func(*args, **kwargs):
+            previous_source, self._current_source = self._current_source, name
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._current_source = previous_source
+
+        return source_func
+
+    def source(self, name: str) -> _SourceTimer:
+        """
+        Context manager recording time and counts for a block against a source
+
+        :param name: Name of the source
+        """
+        return _SourceTimer(self, name)
+
+    def _add_source_time(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            self._get_source(name).time += elapsed
+
+
+class _SourceTimer(Prefab):
+    stats: DiscoveryStats
+    name: str
+
+    _previous_source: str | None = attribute(default=None, private=True)
+    _start: float = attribute(default=0.0, private=True)
+
+    def __enter__(self):
+        self._previous_source = self.stats._current_source
+        self.stats._current_source = self.name
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stats._add_source_time(self.name, time.perf_counter() - self._start)
+        self.stats._current_source = self._previous_source
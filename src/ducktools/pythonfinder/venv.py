@@ -49,6 +49,7 @@ _laz = LazyImporter(
         FromImport("pathlib", "Path"),
         FromImport("subprocess", "run"),
         FromImport(".", "package_list_script"),
+        FromImport(".client", "get_server_venvs"),
     ],
     globs=globals()
 )
@@ -326,6 +327,19 @@ def get_python_venvs(
     :param search_parent_folders: Also search parent folders
     :yield: PythonVEnv details.
     """
+    # A running discovery server may already know the venvs in this folder
+    if (venvs := _laz.get_server_venvs(base_dir, recursive, search_parent_folders)) is not None:
+        yield from venvs
+        return
+
+    yield from _search_python_venvs(base_dir, recursive, search_parent_folders)
+
+
+def _search_python_venvs(
+    base_dir: str | os.PathLike | None = None,
+    recursive: bool = False,
+    search_parent_folders: bool = False
+) -> Iterable[PythonVEnv]:
     # This converts base_dir to a Path, but mypy doesn't know that
     base_dir = _laz.Path.cwd() if base_dir is None else _laz.Path(base_dir)
 
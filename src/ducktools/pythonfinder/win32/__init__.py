@@ -22,39 +22,41 @@
 # SOFTWARE.
 from __future__ import annotations
 
-import itertools
-
 try:
-    from _collections_abc import Iterator
+    from _collections_abc import Iterable, Iterator
 except ImportError:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
+
+from ..shared import PythonInstall, DetailFinder
+from ..sources import get_sources
 
-from ..shared import PythonInstall, get_uv_pythons, DetailFinder
-from .pyenv_search import get_pyenv_pythons
-from .registry_search import get_registered_pythons
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ..candidates import VersionFilter
 
 
 def get_python_installs(
     *,
-    finder: DetailFinder | None = None
+    finder: DetailFinder | None = None,
+    version_filter: VersionFilter | None = None,
+    sources: Iterable[str] | None = None,
 ) -> Iterator[PythonInstall]:
     listed_stdlibs = set()
     listed_bins = set()
 
     finder = DetailFinder() if finder is None else finder
 
+    stats = finder.stats
+
     with finder:
-        for py in itertools.chain(
-            get_registered_pythons(),
-            get_pyenv_pythons(finder=finder),
-            get_uv_pythons(finder=finder),
-        ):
-            # Compare by stdlib paths for uniqueness
-            stdlib_path = py.paths.get("stdlib")
-            if stdlib_path:
-                if stdlib_path not in listed_stdlibs:
+        for source in get_sources(sources):
+            for py in stats.timed_source(source.name, source.search(finder, version_filter)):
+                # Compare by stdlib paths for uniqueness
+                stdlib_path = py.paths.get("stdlib")
+                if stdlib_path:
+                    if stdlib_path not in listed_stdlibs:
+                        yield py
+                        listed_stdlibs.add(stdlib_path)
+                elif py.executable not in listed_bins:
                     yield py
-                    listed_stdlibs.add(stdlib_path)
-            elif py.executable not in listed_bins:
-                yield py
-                listed_bins.add(py.executable)
+                    listed_bins.add(py.executable)
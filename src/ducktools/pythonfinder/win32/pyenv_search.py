@@ -32,6 +32,11 @@ except ImportError:
 
 from ..shared import PythonInstall, DetailFinder
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ..candidates import VersionFilter
+    from ..stats import DiscoveryStats
+
 
 def get_pyenv_root() -> str | None:
     # Check if the environment variable exists, if so use that
@@ -40,10 +45,45 @@ def get_pyenv_root() -> str | None:
     return pyenv_root
 
 
+def _get_pyenv_candidates(
+    versions_folder: str | os.PathLike,
+    stats: DiscoveryStats | None = None,
+) -> Iterator[str]:
+    """
+    Yield the paths of the Python executables in the pyenv versions folder
+    """
+    if stats:
+        stats.count_scandir()
+    for p in os.scandir(str(versions_folder)):
+        # On windows, venv folders usually have the python.exe in \Scripts\
+        # while runtimes have it in the base folder so venvs shouldn't be disovered
+        # but exclude them early anyway
+        venv_indicator = os.path.join(p.path, "pyvenv.cfg")
+        if stats:
+            stats.count_stat(2)
+        if os.path.exists(venv_indicator):
+            continue
+
+        path_base = os.path.basename(p.path)
+
+        if path_base.startswith("pypy"):
+            executable = os.path.join(p.path, "pypy.exe")
+        elif path_base.startswith("graalpy"):
+            # Graalpy exe in bin subfolder
+            executable = os.path.join(p.path, "bin", "graalpy.exe")
+        else:
+            # Try python.exe
+            executable = os.path.join(p.path, "python.exe")
+
+        if os.path.exists(executable):
+            yield executable
+
+
 def get_pyenv_pythons(
     versions_folder: str | os.PathLike | None = None,
     *,
     finder: DetailFinder | None = None,
+    version_filter: VersionFilter | None = None,
 ) -> Iterator[PythonInstall]:
 
     if versions_folder is None and (pyenv_root := get_pyenv_root()):
@@ -54,27 +94,12 @@ def get_pyenv_pythons(
 
     finder = DetailFinder() if finder is None else finder
 
+    candidates = _get_pyenv_candidates(versions_folder, stats=finder.stats)
+    if version_filter:
+        # pyenv folders are named after the version they hold
+        candidates = filter(version_filter.may_include_path, candidates)
+
     with finder:
-        for p in os.scandir(str(versions_folder)):
-            # On windows, venv folders usually have the python.exe in \Scripts\
-            # while runtimes have it in the base folder so venvs shouldn't be disovered
-            # but exclude them early anyway
-            venv_indicator = os.path.join(p.path, "pyvenv.cfg")
-            if os.path.exists(venv_indicator):
-                continue
-
-            path_base = os.path.basename(p.path)
-
-            if path_base.startswith("pypy"):
-                executable = os.path.join(p.path, "pypy.exe")
-            elif path_base.startswith("graalpy"):
-                # Graalpy exe in bin subfolder
-                executable = os.path.join(p.path, "bin", "graalpy.exe")
-            else:
-                # Try python.exe
-                executable = os.path.join(p.path, "python.exe")
-
-            if os.path.exists(executable):
-                install = finder.get_install_details(executable, managed_by="pyenv")
-                if install:
-                    yield install
+        for install in finder.get_many_install_details(candidates, managed_by="pyenv"):
+            if install and (version_filter is None or version_filter.includes(install)):
+                yield install
@@ -36,8 +36,13 @@ import os.path
 import winreg
 from _collections_abc import Iterator
 
+from ..candidates import get_candidate_version
 from ..shared import DetailFinder, PythonInstall
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ..candidates import VersionFilter
+
 exclude_companies = {
     "PyLauncher",  # pylauncher is special cased to be ignored
 }
@@ -64,66 +69,84 @@ def enum_values(key):
         yield winreg.EnumValue(key, i)
 
 
-def get_registered_pythons(finder: DetailFinder | None = None) -> Iterator[PythonInstall]:
+def _get_registry_candidates() -> Iterator[tuple[str, dict]]:
+    """
+    Yield the paths of Python executables listed in the registry
+    along with the metadata from their registry keys
+    """
+    for base, py_folder, flags in check_pairs:
+        base_key = None
+        try:
+            base_key = winreg.OpenKeyEx(base, py_folder, access=winreg.KEY_READ | flags)
+        except FileNotFoundError:
+            continue
+        else:
+            # Query the base folder eg: HKEY_LOCAL_MACHINE\SOFTWARE\Python
+            # The values here should be "companies" as defined in the PEP
+            for company in enum_keys(base_key):
+                if company in exclude_companies:
+                    continue
+
+                with winreg.OpenKey(base_key, company) as company_key:
+                    comp_metadata = {
+                        "Company": company
+                    }
+
+                    for name, data, _ in enum_values(company_key):
+                        comp_metadata[f"Company{name}"] = data
+
+                    for py_keyname in enum_keys(company_key):
+                        metadata: dict = {
+                            **comp_metadata,
+                            "Tag": py_keyname,
+                        }
+
+                        with winreg.OpenKey(company_key, py_keyname) as py_key:
+                            for name, data, _ in enum_values(py_key):
+                                metadata[name] = data
+
+                            install_key = None
+                            try:
+                                install_key = winreg.OpenKey(py_key, "InstallPath")
+                                python_path, _ = winreg.QueryValueEx(
+                                    install_key,
+                                    "ExecutablePath",
+                                )
+                            except FileNotFoundError:
+                                python_path = None
+                            finally:
+                                if install_key:
+                                    winreg.CloseKey(install_key)
+
+                            metadata["InWindowsRegistry"] = True
+
+                        # Pyenv puts architecture information in the Version value for some reason
+                        if python_path and os.path.isfile(python_path):
+                            yield python_path, metadata
+
+        finally:
+            if base_key:
+                winreg.CloseKey(base_key)
+
+
+def get_registered_pythons(
+    finder: DetailFinder | None = None,
+    version_filter: VersionFilter | None = None,
+) -> Iterator[PythonInstall]:
     finder = DetailFinder() if finder is None else finder
 
     with finder:
-        for base, py_folder, flags in check_pairs:
-            base_key = None
-            try:
-                base_key = winreg.OpenKeyEx(base, py_folder, access=winreg.KEY_READ | flags)
-            except FileNotFoundError:
+        for python_path, metadata in _get_registry_candidates():
+            if (
+                version_filter
+                and not version_filter.may_include(get_candidate_version(python_path, metadata))
+            ):
                 continue
-            else:
-                # Query the base folder eg: HKEY_LOCAL_MACHINE\SOFTWARE\Python
-                # The values here should be "companies" as defined in the PEP
-                for company in enum_keys(base_key):
-                    if company in exclude_companies:
-                        continue
-
-                    with winreg.OpenKey(base_key, company) as company_key:
-                        comp_metadata = {
-                            "Company": company
-                        }
-
-                        for name, data, _ in enum_values(company_key):
-                            comp_metadata[f"Company{name}"] = data
-
-                        for py_keyname in enum_keys(company_key):
-                            metadata: dict = {
-                                **comp_metadata,
-                                "Tag": py_keyname,
-                            }
-
-                            with winreg.OpenKey(company_key, py_keyname) as py_key:
-                                for name, data, _ in enum_values(py_key):
-                                    metadata[name] = data
-
-                                install_key = None
-                                try:
-                                    install_key = winreg.OpenKey(py_key, "InstallPath")
-                                    python_path, _ = winreg.QueryValueEx(
-                                        install_key,
-                                        "ExecutablePath",
-                                    )
-                                except FileNotFoundError:
-                                    python_path = None
-                                finally:
-                                    if install_key:
-                                        winreg.CloseKey(install_key)
-
-                                metadata["InWindowsRegistry"] = True
-
-                            # Pyenv puts architecture information in the Version value for some reason
-                            if python_path and os.path.isfile(python_path):
-                                details = finder.get_install_details(
-                                    python_path,
-                                    managed_by=metadata["Company"],
-                                    metadata=metadata,
-                                )
-                                if details:
-                                    yield details
 
-            finally:
-                if base_key:
-                    winreg.CloseKey(base_key)
+            details = finder.get_install_details(
+                python_path,
+                managed_by=metadata["Company"],
+                metadata=metadata,
+            )
+            if details and (version_filter is None or version_filter.includes(details)):
+                yield details
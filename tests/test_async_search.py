@@ -0,0 +1,82 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import asyncio
+import os
+import os.path
+import sys
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from ducktools.pythonfinder import async_search
+from ducktools.pythonfinder.shared import DetailFinder
+from ducktools.pythonfinder.async_search import aget_python_installs
+
+
+def test_aquery_install_matches_sync(temp_finder):
+    sync_install = temp_finder.query_install(sys.executable)
+    async_install = asyncio.run(temp_finder.aquery_install(sys.executable))
+
+    assert sync_install is not None
+    assert async_install == sync_install
+
+
+def test_aquery_install_invalid(temp_finder):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fake_exe = os.path.join(tmpdir, "python")
+        assert asyncio.run(temp_finder.aquery_install(fake_exe)) is None
+
+
+def test_aget_install_details_cache(temp_finder):
+    install = asyncio.run(temp_finder.aget_install_details(sys.executable))
+    assert install is not None
+
+    # The async details should fill the same cache as the sync version
+    with patch.object(DetailFinder, "query_install") as query_mock:
+        assert temp_finder.get_install_details(sys.executable) == install
+        query_mock.assert_not_called()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Test for non-Windows only")
+def test_aget_python_installs_path(temp_finder):
+    async def no_root():
+        return None
+
+    async def collect():
+        return [i async for i in aget_python_installs(finder=temp_finder)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bin_folder = os.path.join(tmpdir, "bin")
+        os.mkdir(bin_folder)
+        exe_link = os.path.join(bin_folder, "python3")
+        os.symlink(sys.executable, exe_link)
+
+        with patch.dict(os.environ, {"PATH": bin_folder}), \
+                patch.object(async_search, "aget_pyenv_root", no_root), \
+                patch.object(async_search, "aget_uv_python_path", no_root):
+            installs = asyncio.run(collect())
+
+    assert len(installs) == 1
+    assert installs[0].executable == exe_link
+    assert installs[0].version == tuple(sys.version_info)
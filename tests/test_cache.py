@@ -20,15 +20,32 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
+import json
 import re
 import sys
 import os.path
+import threading
 from types import SimpleNamespace
 from unittest.mock import patch
 
+from ducktools.classbuilder.prefab import as_dict
+
 import pytest
 
-from ducktools.pythonfinder.shared import DetailFinder, PythonInstall
+from ducktools.pythonfinder.cache_store import get_cache_store
+from ducktools.pythonfinder.shared import (
+    CACHE_VERSION,
+    DETAILS_CACHE_PATH,
+    DetailFinder,
+    DeferredPythonInstall,
+    LAST_SEEN_RESOLUTION,
+    LazyPythonInstall,
+    PythonInstall,
+    QueryError,
+    _is_running_file,
+    version_tuple_to_str,
+)
+from ducktools.pythonfinder.snapshot import install_from_entry, install_to_entry
 
 fake_python_path = "/path/to/python" if sys.platform != "win32" else r"X:\path\to\python"
 json_python_path = re.escape(fake_python_path)
@@ -53,8 +70,8 @@ example_install = PythonInstall(
 
 @pytest.fixture
 def run_mock():
-    with patch("subprocess.run") as mock:
-        mock.return_value.stdout = example_json
+    with patch.object(DetailFinder, "_run_query") as mock:
+        mock.return_value = example_json
         yield mock
 
 
@@ -73,6 +90,11 @@ def stat_mock():
         st_ctime=1739886571
     )
 
+    # Record the identity of the running interpreter before os.stat is replaced
+    for path in (sys.executable, getattr(sys, "_base_executable", None)):
+        if path:
+            _is_running_file(os.stat(path), path)
+
     with patch("os.stat") as mock:
         mock.return_value = result
         yield
@@ -175,6 +197,82 @@ def test_clear_invalid_runtimes(run_mock, stat_mock, temp_finder):
         assert os.path.abspath(fake_python_path) not in temp_finder.raw_cache
 
 
+def test_evict_least_recently_seen(temp_finder):
+    temp_finder.max_cache_entries = 2
+    for i in range(4):
+        temp_finder.raw_cache[f"/path/to/python{i}"] = {"mtime": 1, "last_seen": 10 - i, "install": None}
+
+    temp_finder.save()
+
+    assert sorted(temp_finder.raw_cache) == ["/path/to/python0", "/path/to/python1"]
+
+
+def test_prune_on_save(temp_finder):
+    real_exe = os.path.abspath(sys.executable)
+    temp_finder.raw_cache[real_exe] = {"mtime": 1, "install": None}
+    temp_finder.raw_cache["/path/to/removed/python"] = {"mtime": 1, "install": None}
+
+    # The first save starts the prune interval
+    temp_finder.save()
+    assert os.path.exists(temp_finder.prune_stamp_path)
+    assert "/path/to/removed/python" in temp_finder.raw_cache
+
+    temp_finder.save()
+    assert "/path/to/removed/python" in temp_finder.raw_cache
+
+    # Once the interval has passed missing executables are removed
+    os.utime(temp_finder.prune_stamp_path, (0, 0))
+    with patch("os.path.exists", wraps=os.path.exists) as exists_mock:
+        temp_finder.save()
+
+    assert sorted(temp_finder.raw_cache) == [real_exe]
+    # The missing folder is checked once without checking the executable
+    checked = [c.args[0] for c in exists_mock.call_args_list]
+    assert "/path/to/removed" in checked
+    assert "/path/to/removed/python" not in checked
+    assert os.stat(temp_finder.prune_stamp_path).st_mtime > 0
+
+
+def test_last_seen_updated(run_mock, stat_mock, temp_finder):
+    fake_abspath = os.path.abspath(fake_python_path)
+
+    with patch.object(DetailFinder, "save"):
+        with temp_finder:
+            temp_finder.get_install_details(fake_python_path)
+
+        last_seen = temp_finder.raw_cache[fake_abspath]["last_seen"]
+        temp_finder._dirty_cache = False
+
+        # Recently seen entries are not rewritten on every read
+        temp_finder.get_install_details(fake_python_path)
+        assert not temp_finder._dirty_cache
+
+        temp_finder.raw_cache[fake_abspath] = {
+            **temp_finder.raw_cache[fake_abspath], "last_seen": last_seen - LAST_SEEN_RESOLUTION
+        }
+        temp_finder.get_install_details(fake_python_path)
+        assert temp_finder._dirty_cache
+        assert temp_finder.raw_cache[fake_abspath]["last_seen"] >= last_seen
+
+
+def test_last_seen_updated_batch(run_mock, stat_mock, temp_finder):
+    fake_abspath = os.path.abspath(fake_python_path)
+
+    with patch.object(DetailFinder, "save"):
+        temp_finder.get_install_details(fake_python_path)
+        last_seen = temp_finder.raw_cache[fake_abspath]["last_seen"]
+        temp_finder.raw_cache[fake_abspath] = {
+            **temp_finder.raw_cache[fake_abspath], "last_seen": last_seen - LAST_SEEN_RESOLUTION
+        }
+        temp_finder._dirty_cache = False
+
+        # Cache hits in a batch lookup also count as seen
+        installs = list(temp_finder.get_many_install_details([fake_python_path], max_workers=4))
+        assert installs[0] is not None
+        assert temp_finder._dirty_cache
+        assert temp_finder.raw_cache[fake_abspath]["last_seen"] >= last_seen
+
+
 def test_changed_stat_invalidates(run_mock, temp_finder):
     fake_abspath = os.path.abspath(fake_python_path)
 
@@ -213,7 +311,7 @@ def test_changed_stat_invalidates(run_mock, temp_finder):
 
             assert temp_finder.raw_cache[fake_abspath]["mtime"] == 1739886571
 
-            querymock.assert_called_with(fake_abspath, None, None)
+            querymock.assert_called_with(fake_abspath, None, None, "full")
             querymock.reset_mock()
 
             with temp_finder:
@@ -228,3 +326,410 @@ def test_changed_stat_invalidates(run_mock, temp_finder):
 
             assert temp_finder.raw_cache[fake_abspath]["mtime"] == 1739886572
             querymock.assert_called()
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_many_install_details_order(temp_finder, max_workers):
+    import threading
+    import time
+
+    paths = [f"/path/to/python3.{i}" for i in range(8)]
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    def slow_details(pth, managed_by=None, metadata=None):
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(active, max_active)
+        # Make earlier requests take longer to check ordering is kept
+        time.sleep(0.01 * (len(paths) - paths.index(pth)))
+        with lock:
+            active -= 1
+        return None if pth.endswith("3.3") else pth
+
+    with patch.object(DetailFinder, "get_install_details", side_effect=slow_details):
+        results = list(temp_finder.get_many_install_details(paths, max_workers=max_workers))
+
+    assert results == [None if p.endswith("3.3") else p for p in paths]
+    if max_workers == 1:
+        assert max_active == 1
+    else:
+        assert 1 < max_active <= max_workers
+
+
+def test_many_install_details_shared_limit(temp_finder):
+    # Lookups from sources searched at the same time share the finder's max_workers
+    import threading
+    import time
+
+    temp_finder.max_workers = 2
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    def slow_details(pth, managed_by=None, metadata=None):
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(active, max_active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return pth
+
+    def lookup(source):
+        paths = [f"/{source}/python3.{i}" for i in range(4)]
+        assert list(temp_finder.get_many_install_details(paths)) == paths
+
+    with patch.object(DetailFinder, "get_install_details", side_effect=slow_details):
+        threads = [threading.Thread(target=lookup, args=(s,)) for s in ("pyenv", "uv", "path")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert max_active == 2
+
+
+def test_many_install_details_cached(run_mock, stat_mock, temp_finder):
+    with patch.object(DetailFinder, "save"):
+        with temp_finder:
+            temp_finder.get_install_details(fake_python_path)
+
+        with patch.object(DetailFinder, "get_install_details") as details_mock:
+            results = list(temp_finder.get_many_install_details([fake_python_path], max_workers=4))
+
+    # Cached installs are returned without being queried
+    details_mock.assert_not_called()
+    assert results == [example_install]
+
+
+def test_failed_query_cached(stat_mock, temp_finder):
+    fake_abspath = os.path.abspath(fake_python_path)
+
+    with patch.object(DetailFinder, "save"), \
+            patch.object(DetailFinder, "_run_query") as query_mock:
+        query_mock.side_effect = QueryError("Timed out after 20.0 seconds")
+
+        with temp_finder:
+            assert temp_finder.get_install_details(fake_python_path) is None
+
+        assert query_mock.call_count == 1
+        assert temp_finder.raw_cache[fake_abspath]["install"] is None
+        assert temp_finder.raw_cache[fake_abspath]["failure"] == "Timed out after 20.0 seconds"
+
+        # The failure is cached, so the query is not run again
+        with temp_finder:
+            assert temp_finder.get_install_details(fake_python_path) is None
+
+        assert query_mock.call_count == 1
+
+
+def test_failed_query_saved(tmp_path, stat_mock):
+    # Failures are only written to the versioned cache file, never one older versions read
+    cache_path = tmp_path / os.path.basename(DETAILS_CACHE_PATH)
+    fake_abspath = os.path.abspath(fake_python_path)
+
+    with patch.object(DetailFinder, "_run_query") as query_mock:
+        query_mock.side_effect = QueryError("Timed out after 20.0 seconds")
+        with DetailFinder(cache_path=str(cache_path)) as finder:
+            assert finder.get_install_details(fake_python_path) is None
+
+    cache_files = [f for f in os.listdir(tmp_path) if f.startswith("runtime_cache_v") and f.endswith(".json")]
+    assert cache_files == [cache_path.name]
+    entry = json.loads(cache_path.read_text())[fake_abspath]
+    assert entry["install"] is None
+    assert entry["failure"] == "Timed out after 20.0 seconds"
+
+    with patch.object(DetailFinder, "_run_query") as query_mock:
+        with DetailFinder(cache_path=str(cache_path)) as finder:
+            assert finder.get_install_details(fake_python_path) is None
+        query_mock.assert_not_called()
+
+
+def test_old_cache_version_ignored(tmp_path, run_mock, stat_mock):
+    assert os.path.basename(DETAILS_CACHE_PATH) == f"runtime_cache_v{CACHE_VERSION}.json"
+
+    # An entry from a version 2 cache that would not match the query result
+    old_install = as_dict(example_install)
+    old_install["version"] = [3, 12, 0, "final", 0]
+    old_cache = tmp_path / "runtime_cache_v2.json"
+    old_cache.write_text(json.dumps({
+        os.path.abspath(fake_python_path): {
+            "mtime": 1739886571, "last_seen": 0, "install": old_install
+        }
+    }))
+
+    finder = DetailFinder(cache_path=str(tmp_path / os.path.basename(DETAILS_CACHE_PATH)))
+    with finder:
+        assert finder.get_install_details(fake_python_path) == example_install
+
+    run_mock.assert_called_once()
+    assert json.loads(old_cache.read_text())[os.path.abspath(fake_python_path)]["install"] == old_install
+
+
+def test_single_flight_uses_other_result(run_mock, stat_mock, temp_finder):
+    fake_abspath = os.path.abspath(fake_python_path)
+    lock = temp_finder._get_query_lock(fake_abspath, 1739886571)
+    results = []
+
+    # Another process holds the lock while querying the install
+    with lock:
+        thread = threading.Thread(
+            target=lambda: results.append(temp_finder.get_install_details(fake_python_path))
+        )
+        thread.start()
+        thread.join(0.1)
+        assert thread.is_alive()
+
+        other_store = get_cache_store(temp_finder.cache_path)
+        other_store[fake_abspath] = {
+            "mtime": 1739886571,
+            "install": as_dict(example_install),
+        }
+        other_store.save()
+
+    thread.join()
+
+    # The waiting finder reads the result instead of querying
+    run_mock.assert_not_called()
+    assert results == [example_install]
+
+
+def test_single_flight_saves_result(run_mock, stat_mock, temp_finder):
+    fake_abspath = os.path.abspath(fake_python_path)
+    lock = temp_finder._get_query_lock(fake_abspath, 1739886571)
+
+    # Without another process waiting the result is only saved with everything else
+    with patch.object(type(temp_finder.raw_cache), "refresh") as refresh_mock:
+        temp_finder.get_install_details(fake_python_path)
+        refresh_mock.assert_not_called()
+    assert fake_abspath not in get_cache_store(temp_finder.cache_path)
+    assert not lock.has_waiters
+
+    # Another process waiting for the lock gets the result before unlocking,
+    # without leaving the context manager
+    temp_finder.raw_cache.pop(fake_abspath)
+    lock._mark_waiting()
+    temp_finder.get_install_details(fake_python_path)
+    assert get_cache_store(temp_finder.cache_path)[fake_abspath]["mtime"] == 1739886571
+    assert not lock.has_waiters
+
+
+def test_single_flight_timeout(run_mock, stat_mock, temp_finder):
+    temp_finder.single_flight_timeout = 0.05
+    fake_abspath = os.path.abspath(fake_python_path)
+
+    with temp_finder._get_query_lock(fake_abspath, 1739886571):
+        assert temp_finder.get_install_details(fake_python_path) == example_install
+
+    run_mock.assert_called_once()
+
+
+def test_finder_stats(run_mock, stat_mock, temp_finder):
+    temp_finder.single_flight = False
+    with patch.object(DetailFinder, "save"), temp_finder:
+        temp_finder.get_install_details(fake_python_path)
+        temp_finder.get_install_details(fake_python_path)
+
+    stats = temp_finder.stats
+    assert stats.cache_misses == 1
+    assert stats.cache_hits == 1
+    assert stats.probe_count == 1
+    assert stats.probes[0].executable == os.path.abspath(fake_python_path)
+
+    fake_abspath = os.path.abspath(fake_python_path)
+    temp_finder.raw_cache[fake_abspath] = {**temp_finder.raw_cache[fake_abspath], "mtime": 1}
+    with patch.object(DetailFinder, "save"):
+        temp_finder.get_install_details(fake_python_path)
+
+    assert stats.stale_entries == 1
+    assert stats.probe_count == 2
+
+
+def test_install_extras_cached(temp_finder):
+    with temp_finder:
+        extras = temp_finder.get_install_extras(sys.executable, ["base_executable"])
+    assert extras == {"base_executable": getattr(sys, "_base_executable", None)}
+
+    cache_entry = temp_finder.raw_cache[os.path.abspath(sys.executable)]
+    assert cache_entry["install"] is not None
+    assert cache_entry["extras"] == extras
+
+    # Cached extras don't need a query
+    with patch.object(DetailFinder, "_run_query") as query_mock:
+        assert temp_finder.get_install_extras(sys.executable, ["base_executable"]) == extras
+        query_mock.assert_not_called()
+
+    # Only missing extras are requested
+    with patch.object(DetailFinder, "query_install_extras") as query_mock:
+        query_mock.return_value = (example_install, {"pip_version": "25.0"})
+        extras = temp_finder.get_install_extras(
+            sys.executable, ["base_executable", "pip_version"]
+        )
+        query_mock.assert_called_once_with(
+            os.path.abspath(sys.executable), ["pip_version"], None
+        )
+
+    assert extras["pip_version"] == "25.0"
+
+
+def test_install_extras_purelib_changed(temp_finder):
+    with temp_finder:
+        temp_finder.get_install_extras(sys.executable, ["base_executable"])
+
+    cache_entry = temp_finder.raw_cache[os.path.abspath(sys.executable)]
+    cache_entry["extras_mtime"] = -1.0
+
+    with patch.object(DetailFinder, "query_install_extras") as query_mock:
+        query_mock.return_value = (example_install, {"base_executable": "python"})
+        extras = temp_finder.get_install_extras(sys.executable, ["base_executable"])
+        query_mock.assert_called_once()
+
+    assert extras == {"base_executable": "python"}
+
+
+def test_invalid_probe_tier():
+    with pytest.raises(ValueError):
+        DetailFinder(probe_tier="maximal")
+
+
+def test_minimal_tier(temp_finder):
+    full_install = temp_finder.query_install(sys.executable)
+
+    finder = DetailFinder(
+        cache_path=temp_finder.cache_path,
+        probe_tier="minimal",
+        static_query_managers=(),
+        in_process_query=False,
+    )
+    exe_path = os.path.abspath(sys.executable)
+
+    with finder:
+        install = finder.get_install_details(sys.executable)
+
+    assert isinstance(install, LazyPythonInstall)
+    assert install.version == full_install.version
+    assert install.implementation == full_install.implementation
+    assert not install._details_loaded
+
+    # Each tier is cached separately
+    assert "install" not in finder.raw_cache[exe_path]
+    assert "paths" not in finder.raw_cache[exe_path]["minimal"]
+
+    with patch.object(DetailFinder, "_run_query") as query_mock:
+        assert isinstance(finder.get_install_details(sys.executable), LazyPythonInstall)
+        query_mock.assert_not_called()
+
+    # Accessing paths gets the full details
+    assert install.paths == full_install.paths
+    assert install._details_loaded
+    assert finder.raw_cache[exe_path]["install"]["paths"] == full_install.paths
+
+    # A full install in the cache satisfies a minimal request
+    with patch.object(DetailFinder, "_run_query") as query_mock:
+        assert finder.get_install_details(sys.executable) == full_install
+        query_mock.assert_not_called()
+
+
+@pytest.fixture
+def pyenv_python(tmp_path):
+    # Link the running interpreter into a pyenv style folder named by its version
+    if sys.platform == "win32":
+        pytest.skip("Uses a symlink to the running interpreter")
+    bin_folder = tmp_path / version_tuple_to_str(sys.version_info) / "bin"
+    bin_folder.mkdir(parents=True)
+    exe_path = bin_folder / "python"
+    exe_path.symlink_to(os.path.realpath(sys.executable))
+    return str(exe_path)
+
+
+def test_deferred_tier(temp_finder, pyenv_python):
+    finder = DetailFinder(
+        cache_path=temp_finder.cache_path,
+        probe_tier="deferred",
+        static_query_managers=(),
+        in_process_query=False,
+    )
+
+    with patch.object(DetailFinder, "_run_query") as query_mock:
+        install = finder.get_install_details(pyenv_python, managed_by="pyenv")
+        many_installs = list(finder.get_many_install_details([pyenv_python], "pyenv", 2))
+        assert install.version == tuple(sys.version_info)
+        assert install.executable == pyenv_python
+        # Showing or comparing the install does not query it
+        assert "DeferredPythonInstall(" in repr(install)
+        assert install == many_installs[0]
+        query_mock.assert_not_called()
+
+    assert isinstance(install, DeferredPythonInstall)
+    assert isinstance(many_installs[0], DeferredPythonInstall)
+    assert not install._details_loaded
+
+    # Nothing was queried so nothing is cached
+    assert os.path.abspath(pyenv_python) not in finder.raw_cache
+
+    # Accessing the architecture queries the install
+    full_install = temp_finder.query_install(pyenv_python, managed_by="pyenv")
+    assert install.architecture == full_install.architecture
+    assert install._details_loaded
+    assert as_dict(install) == as_dict(full_install)
+    assert finder.raw_cache[os.path.abspath(pyenv_python)]["install"]["paths"] == full_install.paths
+
+
+def test_deferred_tier_unnamed_install(temp_finder):
+    # Installs with no version in the folder name use a minimal query
+    finder = DetailFinder(cache_path=temp_finder.cache_path, probe_tier="deferred")
+
+    install = finder.get_install_details(sys.executable)
+    assert type(install) in {PythonInstall, LazyPythonInstall}
+    assert install.version == tuple(sys.version_info)
+
+
+def test_deferred_snapshot_entry(temp_finder, pyenv_python):
+    finder = DetailFinder(cache_path=temp_finder.cache_path, probe_tier="deferred")
+    install = finder.get_install_details(pyenv_python, managed_by="pyenv")
+    install.shadowed = True
+
+    with patch.object(DetailFinder, "_run_query") as query_mock:
+        entry = install_to_entry(install)
+        restored = install_from_entry(finder, json.loads(json.dumps(entry)))
+        query_mock.assert_not_called()
+
+    assert "deferred" in entry
+    assert isinstance(restored, DeferredPythonInstall)
+    assert not restored._details_loaded
+    assert restored.version == install.version
+    assert restored.shadowed
+
+
+def test_running_interpreter_in_process(temp_finder):
+    subprocess_finder = DetailFinder(
+        cache_path=temp_finder.cache_path,
+        in_process_query=False,
+    )
+    expected = subprocess_finder.query_install(sys.executable)
+
+    with patch.object(DetailFinder, "_run_query") as query_mock:
+        install = temp_finder.query_install(sys.executable)
+        query_mock.assert_not_called()
+
+    assert install == expected
+
+
+@pytest.mark.skipif(sys.prefix == sys.base_prefix, reason="Needs to run in a venv")
+def test_venv_base_interpreter_in_process(temp_finder):
+    base_executable = sys._base_executable
+    subprocess_finder = DetailFinder(
+        cache_path=temp_finder.cache_path,
+        in_process_query=False,
+    )
+    expected = subprocess_finder.query_install(base_executable)
+
+    with patch.object(DetailFinder, "_run_query") as query_mock:
+        install = temp_finder.query_install(base_executable)
+        query_mock.assert_not_called()
+
+    assert install == expected
@@ -0,0 +1,264 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import json
+import multiprocessing
+import os.path
+import sqlite3
+
+import pytest
+
+from ducktools.pythonfinder import cache_store
+from ducktools.pythonfinder.cache_store import (
+    CacheStore,
+    FileLock,
+    JSONCacheStore,
+    SQLiteCacheStore,
+    get_cache_store,
+)
+from ducktools.pythonfinder.shared import DetailFinder
+
+
+entry = {"mtime": 1739886571.0, "install": None, "failure": "Timed out after 20.0 seconds"}
+
+
+@pytest.fixture(params=["cache.json", "cache.sqlite3"])
+def store_path(request, tmp_path):
+    return str(tmp_path / "cache" / request.param)
+
+
+def test_get_cache_store(tmp_path):
+    assert type(get_cache_store(str(tmp_path / "cache.json"))) is JSONCacheStore
+    assert type(get_cache_store(str(tmp_path / "cache.db"))) is SQLiteCacheStore
+    assert type(get_cache_store(str(tmp_path / "cache.sqlite3"))) is SQLiteCacheStore
+
+
+def test_round_trip(store_path):
+    store = get_cache_store(store_path)
+    assert "/path/to/python" not in store
+    assert len(store) == 0
+
+    store["/path/to/python"] = entry
+    store["/path/to/other"] = entry
+    store.save()
+
+    new_store = get_cache_store(store_path)
+    assert new_store["/path/to/python"] == entry
+    assert sorted(new_store) == ["/path/to/other", "/path/to/python"]
+
+    del new_store["/path/to/other"]
+    new_store.save()
+
+    assert dict(get_cache_store(store_path)) == {"/path/to/python": entry}
+
+
+def test_clear(store_path):
+    store = get_cache_store(store_path)
+    store["/path/to/python"] = entry
+    store.save()
+
+    store.clear()
+    assert "/path/to/python" not in store
+    store["/path/to/other"] = entry
+    store.save()
+
+    assert dict(get_cache_store(store_path)) == {"/path/to/other": entry}
+
+
+def test_least_recently_seen(store_path):
+    store = get_cache_store(store_path)
+    for i in range(4):
+        store[f"/path/to/python{i}"] = {**entry, "last_seen": 10 - i}
+    store.save()
+
+    store = get_cache_store(store_path)
+    # Unsaved changes are included
+    store["/path/to/python3"] = {**entry, "last_seen": 20}
+    del store["/path/to/python2"]
+
+    assert store.least_recently_seen(2) == ["/path/to/python1", "/path/to/python0"]
+
+
+def test_sqlite_least_recently_seen_not_decoded(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite3")
+    store = SQLiteCacheStore(path)
+    for i in range(4):
+        store[f"/path/to/python{i}"] = {**entry, "last_seen": i}
+    store.save()
+    store.close()
+
+    store = SQLiteCacheStore(path)
+    monkeypatch.setattr(store, "_read_entry", None)
+    assert store.least_recently_seen(1) == ["/path/to/python0"]
+
+
+def test_save_keeps_other_writes(store_path):
+    first = get_cache_store(store_path)
+    second = get_cache_store(store_path)
+    first["/path/to/removed"] = entry
+    first.save()
+
+    # Both stores have loaded the cache before either saves
+    assert "/path/to/removed" in second
+    second["/path/to/second"] = entry
+    first["/path/to/first"] = entry
+    del first["/path/to/removed"]
+
+    second.save()
+    first.save()
+
+    assert dict(get_cache_store(store_path)) == {
+        "/path/to/first": entry,
+        "/path/to/second": entry,
+    }
+    # The saving store also sees entries from the other store
+    assert "/path/to/second" in first
+
+
+def _save_entry(store_path, key):
+    store = get_cache_store(store_path)
+    store[key] = entry
+    store.save()
+
+
+def test_concurrent_process_saves(store_path):
+    keys = [f"/path/to/python{i}" for i in range(4)]
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=_save_entry, args=(store_path, key)) for key in keys]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+        assert p.exitcode == 0
+
+    assert sorted(get_cache_store(store_path)) == sorted(keys)
+
+
+def test_file_lock_timeout(tmp_path):
+    lock_path = str(tmp_path / "cache.json.lock")
+    with FileLock(lock_path) as lock:
+        assert lock.locked
+        with pytest.raises(TimeoutError):
+            FileLock(lock_path, timeout=0.05).acquire()
+
+    assert not lock.locked
+    with FileLock(lock_path, timeout=0.05) as lock:
+        assert lock.locked
+
+
+def test_file_lock_waiters(tmp_path):
+    lock_path = str(tmp_path / "cache.json.lock")
+    holder = FileLock(lock_path)
+    assert holder.acquire() is False
+    assert not holder.has_waiters
+
+    # A process that fails to take the lock marks that it is waiting
+    with pytest.raises(TimeoutError):
+        FileLock(lock_path, timeout=0.05).acquire()
+    assert holder.has_waiters
+
+    holder.clear_waiters()
+    holder.release()
+    assert not holder.has_waiters
+
+
+def test_sqlite_unsaved_not_written(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    store = SQLiteCacheStore(path)
+    store["/path/to/python"] = entry
+
+    # Nothing is created until the store is saved
+    assert not os.path.exists(path)
+    assert "/path/to/python" in store
+
+
+def test_sqlite_per_entry_rows(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    store = SQLiteCacheStore(path)
+    store["/path/to/python"] = entry
+    store["/path/to/other"] = {**entry, "mtime": 1.0}
+    store.save()
+    store.close()
+
+    with sqlite3.connect(path) as connection:
+        rows = dict(connection.execute("SELECT exe_path, entry FROM runtimes"))
+    connection.close()
+
+    assert json.loads(rows["/path/to/python"]) == entry
+    assert json.loads(rows["/path/to/other"])["mtime"] == 1.0
+
+
+def test_sqlite_invalid_file(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    with open(path, "w") as f:
+        f.write("not a database")
+
+    store = SQLiteCacheStore(path)
+    assert "/path/to/python" not in store
+    store["/path/to/python"] = entry
+    store.save()
+    store.close()
+
+    assert SQLiteCacheStore(path)["/path/to/python"] == entry
+
+
+def test_sqlite_locked_not_replaced(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_store, "SQLITE_TIMEOUT", 0.05)
+    path = str(tmp_path / "cache.sqlite3")
+    store = SQLiteCacheStore(path)
+    store["/path/to/other"] = entry
+    store.save()
+    store.close()
+
+    # Another process is writing to the database
+    other = sqlite3.connect(path)
+    other.execute("BEGIN EXCLUSIVE")
+    try:
+        store = SQLiteCacheStore(path)
+        store["/path/to/python"] = entry
+        store.save()
+    finally:
+        other.rollback()
+        other.close()
+
+    # The database is kept and the change is written on the next save
+    assert SQLiteCacheStore(path)["/path/to/other"] == entry
+    store.save()
+    store.close()
+    assert SQLiteCacheStore(path)["/path/to/python"] == entry
+
+
+def test_cache_store_abstract():
+    with pytest.raises(TypeError):
+        CacheStore("cache.json")
+
+
+def test_finder_uses_sqlite(tmp_path):
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.sqlite3"))
+    assert isinstance(finder.raw_cache, SQLiteCacheStore)
+
+    with finder:
+        finder.raw_cache["/path/to/python"] = entry
+        finder._dirty_cache = True
+
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.sqlite3"))
+    assert finder.raw_cache["/path/to/python"] == entry
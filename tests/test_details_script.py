@@ -47,3 +47,25 @@ def test_details_script():
                 continue
 
             assert result[key] == details[key]
+
+
+def test_details_script_extras():
+    with patch("sys.stdout.write") as mock:
+        main(["base_executable", "not_an_extra"])
+
+        result = json.loads(mock.mock_calls[0].args[0])
+
+    assert result["extras"] == {
+        "base_executable": getattr(sys, "_base_executable", None),
+        "not_an_extra": None,
+    }
+
+
+def test_details_script_minimal():
+    details = get_details()
+    minimal_details = get_details(minimal=True)
+
+    assert "paths" not in minimal_details
+    assert "freethreaded" not in minimal_details["metadata"]
+    for key in ["version", "executable", "architecture", "implementation"]:
+        assert minimal_details[key] == details[key]
@@ -0,0 +1,172 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from ducktools.pythonfinder.elf_header import (
+    ExecutableHeader,
+    can_run_natively,
+    get_native_machines,
+    read_executable_header,
+)
+from ducktools.pythonfinder.shared import DetailFinder
+
+
+example_json = """
+{
+    "version": [3, 13, 2, "final", 0],
+    "executable": "/path/to/python",
+    "architecture": "64bit",
+    "implementation": "cpython",
+    "metadata": {"freethreaded": false}
+}
+"""
+
+
+def make_elf(path, bits=64, little_endian=True, elf_type=3, machine=62):
+    byteorder = "little" if little_endian else "big"
+    data = (
+        b"\x7fELF"
+        + bytes([1 if bits == 32 else 2, 1 if little_endian else 2, 1])
+        + bytes(9)
+        + elf_type.to_bytes(2, byteorder)
+        + machine.to_bytes(2, byteorder)
+        + bytes(44)
+    )
+    path.write_bytes(data)
+    return str(path)
+
+
+def foreign_machine():
+    # Pick a machine type that this platform doesn't run natively
+    return next(m for m in [183, 62, 258] if m not in get_native_machines())
+
+
+def test_read_elf(tmp_path):
+    exe = make_elf(tmp_path / "python", bits=32, machine=40)
+    header = read_executable_header(exe)
+
+    assert header == ExecutableHeader(
+        format="elf",
+        bits=32,
+        little_endian=True,
+        elf_type=3,
+        machine=40,
+    )
+    assert header.architecture == "32bit"
+    assert header.machine_name == "arm"
+
+
+def test_read_big_endian(tmp_path):
+    exe = make_elf(tmp_path / "python", little_endian=False, elf_type=2, machine=21)
+    header = read_executable_header(exe)
+
+    assert header.little_endian is False
+    assert header.elf_type == 2
+    assert header.machine_name == "ppc64"
+
+
+def test_read_script(tmp_path):
+    exe = tmp_path / "python"
+    exe.write_text("#!/bin/sh\nexec python3 \"$@\"\n")
+
+    header = read_executable_header(exe)
+    assert header.format == "script"
+    assert header.architecture is None
+    assert can_run_natively(header)
+
+
+@pytest.mark.parametrize("contents", [b"", b"\x7fEL", b"MZ\x90\x00", b"print('hello')"])
+def test_read_unknown(tmp_path, contents):
+    exe = tmp_path / "python"
+    exe.write_bytes(contents)
+
+    header = read_executable_header(exe)
+    assert header.format == "unknown"
+    assert not can_run_natively(header)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux ELF test")
+def test_running_python_native():
+    assert can_run_natively(read_executable_header(sys.executable))
+
+
+def test_foreign_not_native(tmp_path):
+    exe = make_elf(tmp_path / "python", machine=foreign_machine())
+    assert not can_run_natively(read_executable_header(exe))
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux ELF test")
+def test_arm32_native_on_aarch64(tmp_path, monkeypatch):
+    from ducktools.pythonfinder import elf_header
+
+    monkeypatch.setattr(elf_header, "_native_machines", None)
+    uname = SimpleNamespace(machine="aarch64")
+    with patch.object(elf_header.os, "uname", return_value=uname):
+        assert {183, 40} <= get_native_machines()
+
+    exe = make_elf(tmp_path / "python", bits=32, machine=40)
+    assert can_run_natively(read_executable_header(exe))
+
+
+def test_object_file_not_native(tmp_path):
+    machine = next(iter(get_native_machines()))
+    exe = make_elf(tmp_path / "python", elf_type=1, machine=machine)
+    assert not can_run_natively(read_executable_header(exe))
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux ELF test")
+def test_finder_skips_foreign(tmp_path):
+    exe = make_elf(tmp_path / "python", machine=foreign_machine())
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.json"))
+
+    with patch.object(DetailFinder, "_run_query") as run_mock:
+        run_mock.return_value = example_json
+        assert finder.query_install(exe) is None
+        run_mock.assert_not_called()
+
+    finder = DetailFinder(
+        cache_path=str(tmp_path / "cache.json"),
+        skip_foreign_executables=False,
+    )
+    with patch.object(DetailFinder, "_run_query") as run_mock:
+        run_mock.return_value = example_json
+        assert finder.query_install(exe) is not None
+        run_mock.assert_called_once()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux ELF test")
+def test_finder_architecture_from_header(tmp_path):
+    # example_json reports 64bit, the header is used instead
+    machine = read_executable_header(sys.executable).machine
+    exe = make_elf(tmp_path / "python", bits=32, machine=machine)
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.json"))
+
+    with patch.object(DetailFinder, "_run_query") as run_mock:
+        run_mock.return_value = example_json
+        install = finder.query_install(exe)
+
+    assert install.architecture == "32bit"
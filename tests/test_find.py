@@ -0,0 +1,213 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import os.path
+from unittest.mock import patch
+
+import pytest
+
+from ducktools.pythonfinder import find
+from ducktools.pythonfinder.candidates import (
+    CandidateHint,
+    VersionFilter,
+    get_candidate_hint,
+    get_candidate_version,
+)
+from ducktools.pythonfinder.find import (
+    HINT_MATCH,
+    HINT_MISMATCH,
+    HINT_UNKNOWN,
+    find_python,
+    get_likelihood,
+)
+from ducktools.pythonfinder.shared import DetailFinder, PythonInstall
+
+
+@pytest.mark.parametrize(
+    "exe_path, hint",
+    [
+        ("/usr/bin/python", CandidateHint()),
+        ("/usr/bin/python3", CandidateHint((3,), "cpython")),
+        ("/usr/bin/python3.12", CandidateHint((3, 12), "cpython")),
+        ("/usr/bin/python3.13t", CandidateHint((3, 13), "cpython", True)),
+        ("/usr/bin/pypy3.10", CandidateHint((3, 10), "pypy")),
+        ("/pyenv/versions/3.12.1/bin/python", CandidateHint((3, 12, 1), "cpython")),
+        ("/pyenv/versions/3.13.0t/bin/python", CandidateHint((3, 13, 0), "cpython", True)),
+        ("/pyenv/versions/pypy3.10-7.3.15/bin/python", CandidateHint((3, 10), "pypy")),
+        (
+            "/uv/cpython-3.13.1+freethreaded-linux-x86_64-gnu/bin/python",
+            CandidateHint((3, 13, 1), "cpython", True),
+        ),
+        ("/uv/graalpy-3.11.0-linux-x86_64-gnu/bin/python", CandidateHint(None, "graalpy")),
+        ("/pyenv/versions/micropython-1.20.0/bin/python", CandidateHint(None, "micropython")),
+        ("C:/Python312/python.exe", CandidateHint((3, 12), "cpython")),
+        ("/opt/app-1.2/bin/python", CandidateHint()),
+        ("/opt/tool/1.2/bin/python", CandidateHint()),
+        ("/opt/tool/2.0/bin/python3.12", CandidateHint((3, 12), "cpython")),
+    ]
+)
+def test_candidate_hint(exe_path, hint):
+    assert get_candidate_hint(exe_path) == hint
+
+
+def test_candidate_version_registry():
+    metadata = {"SysVersion": "3.12", "Company": "PythonCore"}
+    assert get_candidate_version("C:/Python/python.exe", metadata) == (3, 12)
+    assert get_candidate_version("C:/Python311/python.exe", {}) == (3, 11)
+
+
+def test_version_filter_may_include():
+    version_filter = VersionFilter(min_version="3.10", max_version="3.12.99")
+
+    assert version_filter.may_include(None)
+    assert version_filter.may_include((3,))
+    assert version_filter.may_include((3, 10))
+    assert version_filter.may_include((3, 12, 4))
+    assert not version_filter.may_include((3, 9))
+    assert not version_filter.may_include((3, 13, 0))
+    assert not version_filter.may_include((2,))
+
+    compatible = VersionFilter(specifier="~=3.11")
+    assert compatible.may_include((3, 13))
+    assert not compatible.may_include((3, 10, 2))
+    assert not compatible.may_include_path("/pyenv/versions/3.10.2/bin/python")
+    assert compatible.may_include_path("/usr/bin/python3")
+
+    # Numbered folders outside of pyenv are not Python versions
+    assert VersionFilter(min_version="3.10").may_include_path("/opt/tool/1.2/bin/python")
+
+    # MicroPython folders are named with the MicroPython release
+    assert VersionFilter(min_version="3.0").may_include_path(
+        "/pyenv/versions/micropython-1.20.0/bin/python"
+    )
+
+
+def test_version_filter_includes():
+    version_filter = VersionFilter(min_version="3.10", specifier="!=3.11.*")
+
+    assert version_filter.includes(PythonInstall((3, 12, 1, "final", 0), "python"))
+    assert not version_filter.includes(PythonInstall((3, 11, 1, "final", 0), "python"))
+    assert not version_filter.includes(PythonInstall((3, 9, 1, "final", 0), "python"))
+
+
+def test_likelihood():
+    spec = find._get_specifier("3.12")
+
+    assert get_likelihood(CandidateHint((3, 12, 1), "cpython"), spec) == HINT_MATCH
+    assert get_likelihood(CandidateHint((3, 12), "cpython"), spec) == HINT_MATCH
+    assert get_likelihood(CandidateHint((3, 12), "cpython"), find._get_specifier("==3.12.5")) == HINT_MATCH
+    assert get_likelihood(CandidateHint((3, 11), "cpython"), spec) == HINT_MISMATCH
+    assert get_likelihood(CandidateHint((3,), "cpython"), spec) == HINT_UNKNOWN
+    assert get_likelihood(CandidateHint(), spec) == HINT_UNKNOWN
+    assert get_likelihood(CandidateHint((3, 11, 4), "cpython"), spec) == HINT_MISMATCH
+
+    pypy = CandidateHint((3, 12), "pypy")
+    assert get_likelihood(pypy, spec, implementation="cpython") == HINT_MISMATCH
+    assert get_likelihood(pypy, spec, implementation="pypy") == HINT_MATCH
+
+    freethreaded = CandidateHint((3, 13, 1), "cpython", True)
+    assert get_likelihood(freethreaded, None, freethreaded=True) == HINT_MATCH
+    assert get_likelihood(freethreaded, None, freethreaded=False) == HINT_MISMATCH
+    assert get_likelihood(CandidateHint((3, 12)), None, freethreaded=True) == HINT_MISMATCH
+
+
+@pytest.fixture
+def fake_candidates():
+    installs = {
+        "/path/bin/python3": PythonInstall((3, 12, 4, "final", 0), "/path/bin/python3"),
+        "/path/bin/python3.11": PythonInstall((3, 11, 9, "final", 0), "/path/bin/python3.11"),
+        "/path/bin/python3.12": PythonInstall((3, 12, 4, "final", 0), "/path/bin/python3.12"),
+        "/pyenv/versions/3.13.1/bin/python": PythonInstall(
+            (3, 13, 1, "final", 0), "/pyenv/versions/3.13.1/bin/python", managed_by="pyenv"
+        ),
+        "/pyenv/versions/3.13.1t/bin/python": PythonInstall(
+            (3, 13, 1, "final", 0),
+            "/pyenv/versions/3.13.1t/bin/python",
+            managed_by="pyenv",
+            metadata={"freethreaded": True},
+        ),
+    }
+    candidates = [
+        ("/pyenv/versions/3.13.1/bin/python", "pyenv", None, False),
+        ("/pyenv/versions/3.13.1t/bin/python", "pyenv", None, False),
+        ("/path/bin/python3", None, None, True),
+        ("/path/bin/python3.11", None, None, True),
+        ("/path/bin/python3.12", None, None, True),
+    ]
+    queried = []
+
+    def get_install_details(self, exe_path, managed_by=None, metadata=None):
+        queried.append(exe_path)
+        return installs.get(exe_path)
+
+    with (
+        patch.object(find, "get_search_roots", return_value=(None, None)),
+        patch.object(find, "get_candidates", return_value=candidates),
+        patch.object(DetailFinder, "get_install_details", get_install_details),
+        # The fake paths are their own real paths
+        patch.object(os.path, "realpath", lambda p: p),
+    ):
+        yield queried
+
+
+def test_find_python_most_likely_first(temp_finder, fake_candidates):
+    install = find_python("3.12", finder=temp_finder)
+
+    assert install.executable == "/path/bin/python3.12"
+    assert fake_candidates == ["/path/bin/python3.12"]
+
+
+def test_find_python_unknown_before_mismatch(temp_finder, fake_candidates):
+    install = find_python("==3.12.4", finder=temp_finder)
+
+    assert install.executable == "/path/bin/python3.12"
+    assert fake_candidates == ["/path/bin/python3.12"]
+
+    fake_candidates.clear()
+    assert find_python("3.10", finder=temp_finder) is None
+    # Everything is queried once before giving up, 'python3' could be any
+    # version so it is queried before the mismatches
+    assert fake_candidates[0] == "/path/bin/python3"
+    assert len(fake_candidates) == 5
+
+
+def test_find_python_newest_first(temp_finder, fake_candidates):
+    install = find_python(">=3.11", finder=temp_finder)
+    assert install.executable == "/pyenv/versions/3.13.1/bin/python"
+    assert len(fake_candidates) == 1
+
+
+def test_find_python_freethreaded(temp_finder, fake_candidates):
+    install = find_python("3.13", freethreaded=True, finder=temp_finder)
+    assert install.executable == "/pyenv/versions/3.13.1t/bin/python"
+    assert fake_candidates == ["/pyenv/versions/3.13.1t/bin/python"]
+
+    install = find_python("3.13", freethreaded=False, finder=temp_finder)
+    assert install.executable == "/pyenv/versions/3.13.1/bin/python"
+
+
+def test_find_python_this_python(temp_finder, this_python):
+    spec = f"=={this_python.version_str}"
+    with patch.object(find, "get_candidates", return_value=[(this_python.executable, None, None, True)]):
+        install = find_python(spec, finder=temp_finder)
+
+    assert install == this_python
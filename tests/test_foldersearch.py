@@ -20,10 +20,12 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
+import asyncio
 import sys
 import os.path
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, call
 import textwrap
+import time
 import subprocess
 from pathlib import Path
 
@@ -31,7 +33,9 @@ import pytest
 
 from ducktools.pythonfinder.shared import (
     DetailFinder,
+    ProbeLauncher,
     PythonInstall,
+    QueryError,
     get_folder_pythons,
 )
 from ducktools.pythonfinder import details_script
@@ -63,28 +67,24 @@ details_text = Path(details_script.__file__).read_text()
     "output, expected", [(fake_details, fake_details_out), ("InvalidJSON", None)]
 )
 def test_query_install(output, expected, temp_finder):
-    with patch("subprocess.run") as run_mock:
-        mock_out = MagicMock()
-
-        mock_out.stdout = output
-        run_mock.return_value = mock_out
+    with patch.object(DetailFinder, "_run_query") as run_mock:
+        run_mock.return_value = output
 
         details = temp_finder.query_install(fake_details_out.executable)
+        flags = temp_finder.launcher.get_flags(fake_details_out.executable)
 
         run_mock.assert_called_with(
-            [fake_details_out.executable, "-"],
+            [fake_details_out.executable, *flags, "-"],
             input=details_text,
-            capture_output=True,
-            text=True,
-            check=True,
         )
 
         assert details == expected
 
 
 def test_get_install_details_error(temp_finder):
-    with patch(
-        "subprocess.run",
+    with patch.object(
+        DetailFinder,
+        "_run_query",
         side_effect=subprocess.CalledProcessError(1, "Unsuccessful Call"),
     ) as run_mock:
         details = temp_finder.query_install(fake_details_out.executable)
@@ -92,14 +92,63 @@ def test_get_install_details_error(temp_finder):
         run_mock.assert_any_call(
             [fake_details_out.executable, "-"],
             input=details_text,
-            capture_output=True,
-            text=True,
-            check=True,
         )
 
         assert details is None
 
 
+def test_launcher_flags(tmp_path):
+    launcher = ProbeLauncher()
+
+    assert launcher.get_flags("/usr/bin/python3") == ["-I", "-S", "-X", "frozen_modules=on"]
+    assert launcher.get_flags("/usr/bin/python2.7") == []
+    assert launcher.get_flags("/usr/bin/micropython") == []
+
+    # site sets the paths for venvs so it must be imported
+    venv_exe = tmp_path / "bin" / "python"
+    venv_exe.parent.mkdir()
+    (tmp_path / "pyvenv.cfg").touch()
+    assert launcher.get_flags(str(venv_exe)) == ["-I", "-X", "frozen_modules=on"]
+
+
+def test_launcher_env():
+    with patch.dict(os.environ, {"PYTHONSTARTUP": "startup.py", "MICROPYPATH": "lib"}):
+        env = ProbeLauncher.get_env()
+
+    assert "PYTHONSTARTUP" not in env
+    assert "MICROPYPATH" not in env
+    assert env["PATH"] == os.environ["PATH"]
+
+
+def test_query_install_fallbacks(temp_finder):
+    exe = fake_details_out.executable
+    error = subprocess.CalledProcessError(2, "Unsupported")
+
+    with patch.object(DetailFinder, "_run_query") as run_mock:
+        run_mock.side_effect = [error, error, fake_details]
+        details = temp_finder.query_install(exe)
+
+    assert details == fake_details_out
+
+    flags = temp_finder.launcher.get_flags(exe)
+    flagged_call, plain_call, script_call = run_mock.call_args_list
+
+    assert flagged_call == call([exe, *flags, "-"], input=details_text)
+    assert plain_call == call([exe, "-"], input=details_text)
+
+    # The script is kept next to the cache for later queries
+    script_args = script_call.args[0]
+    assert script_call.kwargs == {"input": None}
+    assert os.path.dirname(script_args[1]) == os.path.dirname(temp_finder.cache_path)
+    assert Path(script_args[1]).read_text() == details_text
+
+    with patch.object(DetailFinder, "_run_query") as run_mock:
+        run_mock.side_effect = [error, error, fake_details]
+        temp_finder.query_install(exe)
+
+    assert run_mock.call_args_list[2] == script_call
+
+
 def test_get_folder_pythons(fs, temp_finder):
 
     if sys.platform == "win32":
@@ -137,3 +186,174 @@ def test_get_folder_pythons(fs, temp_finder):
         )
 
     assert result == [python_exe, pypy_exe]
+
+
+def test_folder_candidates_cached(tmp_path, temp_finder):
+    fld = tmp_path / "bin"
+    fld.mkdir()
+    exe_name = "python.exe" if sys.platform == "win32" else "python3"
+    (fld / exe_name).touch()
+    (fld / "not-python").touch()
+
+    # Folders changed in the last moments are not cached
+    assert temp_finder.get_folder_candidates(fld) == [str(fld / exe_name)]
+    assert str(fld) not in temp_finder.folder_cache
+
+    old_time = time.time() - 60
+    os.utime(fld, (old_time, old_time))
+    os.utime(tmp_path, (old_time, old_time))
+    temp_finder.get_folder_candidates(fld)
+
+    with patch("os.scandir") as scandir_mock:
+        assert temp_finder.get_folder_candidates(fld) == [str(fld / exe_name)]
+    scandir_mock.assert_not_called()
+
+    # Adding an executable changes the folder mtime and it is scanned again
+    pypy_name = "pypy.exe" if sys.platform == "win32" else "pypy"
+    (fld / pypy_name).touch()
+    os.utime(fld, (old_time + 1, old_time + 1))
+    assert sorted(temp_finder.get_folder_candidates(fld)) == sorted(
+        [str(fld / exe_name), str(fld / pypy_name)]
+    )
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Uses a symlink")
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_cached_listing_removed_link_target(tmp_path, max_workers):
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.json"), max_workers=max_workers)
+    fld = tmp_path / "bin"
+    fld.mkdir()
+    target = tmp_path / "python3.12"
+    target.touch()
+    (fld / "python3").symlink_to(target)
+
+    old_time = time.time() - 60
+    os.utime(fld, (old_time, old_time))
+    os.utime(tmp_path, (old_time, old_time))
+    assert finder.get_folder_candidates(fld) == [str(fld / "python3")]
+
+    # Removing the link target does not change the folder
+    target.unlink()
+    os.utime(tmp_path, (old_time, old_time))
+
+    assert list(get_folder_pythons(fld, finder=finder)) == []
+
+
+def _make_script(folder, name, body):
+    script_path = os.path.join(folder, name)
+    with open(script_path, "w") as f:
+        f.write(f"#!/bin/sh\n{body}\n")
+    os.chmod(script_path, 0o755)
+    return script_path
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Test for non-Windows only")
+def test_query_timeout_kills_tree(tmp_path):
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.json"), query_timeout=0.5)
+    pid_file = tmp_path / "child.pid"
+
+    # Start a child process that would outlive the query if not killed
+    exe = _make_script(tmp_path, "python", f"sleep 30 &\necho $! > {pid_file}\nwait")
+
+    details = finder.query_install(exe)
+    assert details is None
+    assert finder._query_failures[exe].startswith("Timed out")
+
+    child_pid = int(pid_file.read_text())
+    for _ in range(50):
+        try:
+            os.kill(child_pid, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        os.kill(child_pid, 9)
+        pytest.fail("Child process of query was not killed")
+
+
+def _assert_killed(pid):
+    for _ in range(50):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return
+        time.sleep(0.05)
+    os.kill(pid, 9)
+    pytest.fail("Process of query was not killed")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Test for non-Windows only")
+def test_aquery_cancel_kills_tree(tmp_path):
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.json"), query_timeout=None)
+    pid_file = tmp_path / "pids"
+    exe = _make_script(tmp_path, "python", f"sleep 30 &\necho $$ $! > {pid_file}\nwait")
+
+    async def cancel_query():
+        task = asyncio.ensure_future(finder._arun_query([exe]))
+        while not pid_file.exists() or not pid_file.read_text().strip():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_query())
+
+    for pid in pid_file.read_text().split():
+        _assert_killed(int(pid))
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Test for non-Windows only")
+def test_query_output_limit(tmp_path):
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.json"), max_query_output=1000)
+    exe = _make_script(tmp_path, "python", "head -c 100000 /dev/zero")
+
+    with pytest.raises(QueryError):
+        finder._run_query([exe])
+
+    with pytest.raises(QueryError):
+        asyncio.run(finder._arun_query([exe]))
+
+    assert finder.query_install(exe) is None
+    assert finder._query_failures[exe].startswith("Output exceeded")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Test for non-Windows only")
+def test_query_output_limit_running(tmp_path):
+    # A query that keeps running after exceeding the limit is killed straight away
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.json"), max_query_output=1000)
+    pid_file = tmp_path / "pids"
+    exe = _make_script(
+        tmp_path, "python", f"sleep 30 &\necho $$ $! > {pid_file}\nhead -c 100000 /dev/zero\nwait"
+    )
+
+    start = time.perf_counter()
+    with pytest.raises(QueryError, match="Output exceeded"):
+        finder._run_query([exe])
+    assert time.perf_counter() - start < 10
+
+    for pid in pid_file.read_text().split():
+        _assert_killed(int(pid))
+
+
+@pytest.mark.skipif(not hasattr(os, "wait4"), reason="Test for os.wait4 only")
+def test_query_unknown_exit_status(tmp_path):
+    # A query reaped elsewhere is not assumed to have succeeded
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.json"))
+    exe = _make_script(tmp_path, "python", "exit 1")
+
+    with (
+        patch("os.wait4", side_effect=ChildProcessError),
+        pytest.raises(QueryError, match="Exit status"),
+    ):
+        finder._run_query([exe])
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Test for non-Windows only")
+def test_aquery_timeout(tmp_path):
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.json"), query_timeout=0.5)
+    exe = _make_script(tmp_path, "python", "sleep 30")
+
+    start = time.perf_counter()
+    assert asyncio.run(finder.aquery_install(exe)) is None
+    assert time.perf_counter() - start < 10
+    assert finder._query_failures[exe].startswith("Timed out")
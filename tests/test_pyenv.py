@@ -48,11 +48,16 @@ else:
 
 details_text = Path(details_script.__file__).read_text()
 
+# Executables are checked before launching, these are launched as scripts
+FAKE_EXE = "#!/bin/sh\n"
+
 
 def test_get_pyenv_root_env():
     fake_path = "path/to/pyenv"
     with patch.dict(os.environ, {"PYENV_ROOT": fake_path}):
         assert get_pyenv_root() == fake_path
+        # An explicit environment is used instead of os.environ
+        assert get_pyenv_root({"PYENV_ROOT": "other/pyenv"}) == "other/pyenv"
 
 
 @pytest.mark.skipif(sys.platform == "win32", reason="Test for non-Windows only")
@@ -219,23 +224,23 @@ def test_invalid_ver_nix(fs, uses_details_script, temp_finder):
 
     fs.create_dir(py_folder)
     fs.create_dir(os.path.join(py_folder, "bin"))
-    fs.create_file(py_exe)
+    fs.create_file(py_exe, contents=FAKE_EXE)
 
     py2_folder = os.path.join(tmpdir, "ext3.13.0")
     py2_exe = os.path.join(py2_folder, "bin/python")
 
     fs.create_dir(py2_folder)
     fs.create_dir(os.path.join(py2_folder, "bin"))
-    fs.create_file(py2_exe)
+    fs.create_file(py2_exe, contents=FAKE_EXE)
 
     py3_folder = os.path.join(tmpdir, "invalid-version-3.12.1")
     py3_exe = os.path.join(py3_folder, "bin/python")
 
     fs.create_dir(py3_folder)
     fs.create_dir(os.path.join(py3_folder, "bin"))
-    fs.create_file(py3_exe)
+    fs.create_file(py3_exe, contents=FAKE_EXE)
 
-    with patch("subprocess.run") as run_mock:
+    with patch.object(DetailFinder, "_run_query") as run_mock:
         run_mock.side_effect = OSError("Failure")
         versions = list(get_pyenv_pythons(tmpdir, finder=temp_finder))
         assert run_mock.call_count == 3
@@ -267,18 +272,16 @@ def test_pypy_version(fs, temp_finder):
     fs.add_real_file(details_script.__file__)
     fs.create_dir(py_folder)
     fs.create_dir(os.path.join(py_folder, "bin"))
-    fs.create_file(py_exe)
+    fs.create_file(py_exe, contents=FAKE_EXE)
 
-    with patch("subprocess.run") as run_cmd:
-        run_cmd.return_value.stdout = mock_output
+    with patch.object(DetailFinder, "_run_query") as run_cmd:
+        run_cmd.return_value = mock_output
         versions = list(get_pyenv_pythons(tmpdir, finder=temp_finder))
 
+        flags = temp_finder.launcher.get_flags(py_exe)
         run_cmd.assert_called_once_with(
-            [os.path.abspath(py_exe), "-"],
+            [os.path.abspath(py_exe), *flags, "-"],
             input=details_text,
-            capture_output=True,
-            text=True,
-            check=True,
         )
 
         out_version = PythonInstall(
@@ -294,3 +297,32 @@ def test_pypy_version(fs, temp_finder):
         )
 
         assert versions == [out_version]
+
+
+def test_version_filter_skips_folders(tmp_path, temp_finder):
+    from ducktools.pythonfinder import VersionFilter
+
+    versions_folder = tmp_path / "versions"
+    executables = {}
+    for version in ["3.9.18", "3.12.1", "3.13.0"]:
+        exe_name = "python.exe" if sys.platform == "win32" else "bin/python"
+        exe = versions_folder / version / exe_name
+        exe.parent.mkdir(parents=True)
+        exe.write_text(FAKE_EXE)
+        executables[str(exe)] = PythonInstall.from_str(version=version, executable=str(exe))
+
+    queried = []
+
+    def get_install_details(self, exe_path, managed_by=None):
+        queried.append(exe_path)
+        return executables[exe_path]
+
+    version_filter = VersionFilter(min_version="3.10", max_version="3.12.99")
+    with patch.object(DetailFinder, "get_install_details", get_install_details):
+        installs = list(
+            get_pyenv_pythons(versions_folder, finder=temp_finder, version_filter=version_filter)
+        )
+
+    assert [i.version_str for i in installs] == ["3.12.1"]
+    # Versions ruled out by the folder name are never queried
+    assert queried == [str(versions_folder / "3.12.1" / exe_name)]
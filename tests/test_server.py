@@ -0,0 +1,233 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import os
+import os.path
+import socket
+import stat
+import sys
+import tempfile
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from ducktools.pythonfinder.shared import CACHE_FOLDER, PythonInstall
+
+if sys.platform == "win32":
+    pytest.skip("The discovery server uses Unix domain sockets", allow_module_level=True)
+
+from ducktools.pythonfinder import client, server
+from ducktools.pythonfinder.client import (
+    SERVER_SOCKET_PATH,
+    ServerError,
+    get_server_installs,
+    get_server_venvs,
+    query_server,
+)
+from ducktools.pythonfinder.server import DiscoveryServer
+
+
+@pytest.fixture
+def search_folder(tmp_path):
+    folder = tmp_path / "bin"
+    folder.mkdir()
+    return str(folder)
+
+
+@pytest.fixture
+def fake_search(search_folder):
+    installs = [
+        PythonInstall(
+            version=(3, 13, 2, "final", 0),
+            executable=os.path.join(search_folder, "python3.13"),
+        ),
+        PythonInstall(
+            version=(3, 12, 9, "final", 0),
+            executable=os.path.join(search_folder, "python3.12"),
+            shadowed=True,
+        ),
+    ]
+    calls = []
+
+    def search(finder, environ=None):
+        calls.append(finder)
+        yield from installs
+
+    search.installs = installs
+    search.calls = calls
+
+    with (
+        patch.object(server, "search_sources", search),
+        patch.object(server, "_get_search_folders", lambda environ=None: [search_folder]),
+    ):
+        yield search
+
+
+@pytest.fixture
+def discovery_server(temp_finder):
+    # Unix socket paths have a short length limit so avoid pytest's tmp_path
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = os.path.join(tmpdir, "s.sock")
+        discovery = DiscoveryServer(socket_path=socket_path, finder=temp_finder)
+        thread = threading.Thread(target=discovery.serve_forever)
+        thread.start()
+        try:
+            for _ in range(500):
+                if discovery._server is not None and os.path.exists(socket_path):
+                    break
+                threading.Event().wait(0.01)
+            yield discovery
+        finally:
+            discovery.shutdown()
+            thread.join(timeout=5)
+
+
+def test_ping(temp_finder):
+    discovery = DiscoveryServer(finder=temp_finder)
+    response = discovery.handle_request({"query": "ping"})
+    assert response["ok"]
+    assert response["version"] == server.__version__
+
+
+def test_unknown_query(temp_finder):
+    discovery = DiscoveryServer(finder=temp_finder)
+    assert not discovery.handle_request({"query": "unknown"})["ok"]
+
+
+def test_install_results_reused(temp_finder, fake_search):
+    discovery = DiscoveryServer(finder=temp_finder)
+    request = {"query": "installs", "environ": {"PATH": os.environ.get("PATH")}}
+
+    first = discovery.handle_request(request)
+    second = discovery.handle_request(request)
+
+    assert first == second
+    assert len(first["installs"]) == 2
+    assert len(fake_search.calls) == 1
+
+    # A different PATH is a separate search
+    discovery.handle_request({"query": "installs", "environ": {"PATH": "/other"}})
+    assert len(fake_search.calls) == 2
+
+
+def test_install_search_environ(temp_finder, fake_search):
+    discovery = DiscoveryServer(finder=temp_finder)
+    seen_environs = []
+
+    def search(finder, environ=None):
+        # The client's environment is passed to the search, not set in os.environ
+        assert os.environ.get("PATH") != "/client/bin"
+        seen_environs.append(environ)
+        return iter([])
+
+    with patch.object(server, "search_sources", search):
+        discovery.handle_request({"query": "installs", "environ": {"PATH": "/client/bin"}})
+
+    assert seen_environs == [{"PATH": "/client/bin"}]
+
+
+def test_stored_results_limited(temp_finder, fake_search):
+    discovery = DiscoveryServer(finder=temp_finder)
+    for i in range(server.MAX_STORED_RESULTS + 5):
+        discovery.get_install_entries({"PATH": f"/client/{i}"})
+
+    assert len(discovery._install_snapshots) == server.MAX_STORED_RESULTS
+    # The oldest results are dropped first
+    assert ("/client/0", None) not in discovery._install_snapshots
+    assert (f"/client/{server.MAX_STORED_RESULTS + 4}", None) in discovery._install_snapshots
+
+
+def test_socket_outside_cache():
+    # Clearing the cache does not remove the socket of a running server
+    assert os.path.commonpath([SERVER_SOCKET_PATH, CACHE_FOLDER]) != CACHE_FOLDER
+
+
+def test_venv_results_reused(temp_finder, tmp_path):
+    venv_folder = tmp_path / ".venv"
+    venv_folder.mkdir()
+    discovery = DiscoveryServer(finder=temp_finder)
+
+    with patch.object(server, "_search_python_venvs", return_value=iter([])) as search:
+        first = discovery.get_venv_entries(str(tmp_path))
+        second = discovery.get_venv_entries(str(tmp_path))
+
+    assert first == second == []
+    assert search.call_count == 1
+
+
+def test_client_server(discovery_server, fake_search):
+    socket_path = discovery_server.socket_path
+
+    assert query_server("ping", socket_path)["ok"]
+
+    installs = get_server_installs(discovery_server.finder, socket_path)
+    assert [i.executable for i in installs] == [i.executable for i in fake_search.installs]
+    assert [i.shadowed for i in installs] == [False, True]
+
+    assert get_server_venvs(os.path.dirname(socket_path), socket_path=socket_path) == []
+
+    with pytest.raises(ServerError):
+        query_server("unknown", socket_path)
+
+
+def test_socket_permissions(discovery_server):
+    # Other users can not connect to the server
+    assert stat.S_IMODE(os.stat(discovery_server.socket_path).st_mode) & 0o077 == 0
+
+
+def test_request_error_response(discovery_server):
+    # Failures while answering are returned instead of closing the connection
+    with (
+        patch.object(DiscoveryServer, "get_venv_entries", side_effect=PermissionError("denied")),
+        pytest.raises(ServerError, match="denied"),
+    ):
+        query_server("venvs", discovery_server.socket_path, base_dir="/")
+
+    assert query_server("ping", discovery_server.socket_path)["ok"]
+
+
+def test_no_server(tmp_path):
+    socket_path = str(tmp_path / "missing.sock")
+    assert get_server_installs(socket_path=socket_path) is None
+    assert get_server_venvs(socket_path=socket_path) is None
+
+
+def test_server_disabled(discovery_server, fake_search, monkeypatch):
+    monkeypatch.setenv(client.NO_SERVER_ENVIRON, "1")
+    assert get_server_installs(socket_path=discovery_server.socket_path) is None
+
+
+def test_stale_socket_removed():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = os.path.join(tmpdir, "s.sock")
+        # Bound but not listening, as if left behind by a server that was killed
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(socket_path)
+
+        DiscoveryServer(socket_path=socket_path)._remove_stale_socket()
+        assert not os.path.exists(socket_path)
+
+
+def test_running_server_not_replaced(discovery_server):
+    with pytest.raises(RuntimeError):
+        DiscoveryServer(socket_path=discovery_server.socket_path)._remove_stale_socket()
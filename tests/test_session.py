@@ -0,0 +1,87 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import sys
+import sysconfig
+
+import pytest
+
+from ducktools.pythonfinder.session import InterpreterSession, SessionError
+
+
+@pytest.fixture
+def session(tmp_path):
+    with InterpreterSession(sys.executable, script_folder=str(tmp_path)) as session:
+        yield session
+
+
+def test_session_queries(session, temp_finder):
+    install = temp_finder.query_install(sys.executable)
+
+    assert session.get_install() == install
+    assert session.get_base_executable() == getattr(sys, "_base_executable", None)
+    assert session.get_config_vars(["SIZEOF_VOID_P"]) == {
+        "SIZEOF_VOID_P": sysconfig.get_config_var("SIZEOF_VOID_P")
+    }
+
+    packages = session.get_packages()
+    assert packages is not None
+    assert "pytest" in {p.name for p in packages}
+
+
+def test_session_query_error(session):
+    with pytest.raises(SessionError):
+        session.request("not_a_query")
+
+    # The session continues after a failed query
+    assert session.running
+    assert session.request("ping") is True
+
+
+def test_session_closed(tmp_path):
+    with InterpreterSession(sys.executable, script_folder=str(tmp_path)) as session:
+        assert session.running
+
+    assert not session.running
+    with pytest.raises(SessionError):
+        session.request("ping")
+
+
+def test_session_invalid_executable(tmp_path):
+    session = InterpreterSession(
+        str(tmp_path / "not_python"),
+        script_folder=str(tmp_path),
+    )
+    with pytest.raises(SessionError):
+        session.start()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Uses a shell script as the interpreter")
+def test_session_timeout(tmp_path):
+    exe = tmp_path / "python"
+    exe.write_text("#!/bin/sh\nsleep 10\n")
+    exe.chmod(0o755)
+
+    session = InterpreterSession(str(exe), script_folder=str(tmp_path), timeout=0.2)
+    with pytest.raises(SessionError):
+        session.start()
+    assert not session.running
@@ -22,13 +22,14 @@
 # SOFTWARE.
 
 import sys
+import threading
 from unittest.mock import patch
 from types import SimpleNamespace
 from pathlib import Path
 
 import pytest
 
-from ducktools.pythonfinder.shared import PythonInstall
+from ducktools.pythonfinder.shared import DetailFinder, PythonInstall, merge_sources
 
 version_pairs = [
     ("3.12.2", (3, 12, 2, "final", 0)),
@@ -122,3 +123,79 @@ def test_fail_pip_version():
         )
 
         assert pip_ver is None
+
+
+def test_pip_version_finder():
+    finder = DetailFinder()
+    with patch.object(DetailFinder, "get_install_extras") as mock_extras, \
+            patch.object(DetailFinder, "save"):
+        mock_extras.return_value = {"pip_version": "23.0.1"}
+
+        inst = PythonInstall(tuple(sys.version_info), sys.executable)
+
+        pip_ver = inst.get_pip_version(finder=finder)
+
+        mock_extras.assert_called_once_with(sys.executable, ["pip_version"])
+
+        assert pip_ver == "23.0.1"
+
+
+def test_merge_sources_order():
+    later_source_started = threading.Event()
+
+    def first():
+        # Only finishes if the last source runs at the same time
+        yield 1
+        assert later_source_started.wait(5)
+        yield 2
+
+    def second():
+        yield 3
+
+    def third():
+        later_source_started.set()
+        yield 4
+        yield 5
+
+    assert list(merge_sources([first(), second(), third()])) == [1, 2, 3, 4, 5]
+
+
+def test_merge_sources_sequential():
+    started = []
+
+    def source(name):
+        started.append(name)
+        yield name
+
+    merged = merge_sources([source("pyenv"), source("PATH")], concurrent=False)
+    assert next(merged) == "pyenv"
+    assert started == ["pyenv"]
+    assert list(merged) == ["PATH"]
+
+
+def test_merge_sources_error():
+    def failing():
+        yield 1
+        raise OSError("Source failed")
+
+    with pytest.raises(OSError, match="Source failed"):
+        list(merge_sources([failing(), iter([2])]))
+
+
+def test_merge_sources_close():
+    closed = threading.Event()
+
+    def source():
+        try:
+            yield 1
+            yield 2
+            yield 3
+        finally:
+            closed.set()
+
+    merged = merge_sources([iter([0]), source()])
+    assert next(merged) == 0
+    merged.close()
+
+    # The sources have stopped by the time close returns
+    assert closed.is_set()
@@ -0,0 +1,116 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import os
+import os.path
+
+import pytest
+
+from ducktools.pythonfinder.shared import PythonInstall
+from ducktools.pythonfinder.snapshot import load_snapshot, search_with_snapshot
+
+
+@pytest.fixture
+def search_folder(tmp_path):
+    folder = tmp_path / "bin"
+    folder.mkdir()
+    return str(folder)
+
+
+@pytest.fixture
+def fake_search(search_folder):
+    installs = [
+        PythonInstall(
+            version=(3, 13, 2, "final", 0),
+            executable=os.path.join(search_folder, "python3.13"),
+            paths={"stdlib": "/usr/lib/python3.13"},
+        ),
+        PythonInstall(
+            version=(3, 12, 9, "final", 0),
+            executable=os.path.join(search_folder, "python3.12"),
+            shadowed=True,
+        ),
+    ]
+    calls = []
+
+    def search(finder):
+        calls.append(finder)
+        yield from installs
+
+    search.installs = installs
+    search.calls = calls
+    return search
+
+
+def test_snapshot_reused(temp_finder, search_folder, fake_search):
+    folders = [search_folder]
+    first = list(search_with_snapshot(fake_search, temp_finder, folders))
+    second = list(search_with_snapshot(fake_search, temp_finder, folders))
+
+    assert first == second == fake_search.installs
+    assert len(fake_search.calls) == 1
+
+
+def test_snapshot_folder_changed(temp_finder, search_folder, fake_search):
+    folders = [search_folder]
+    list(search_with_snapshot(fake_search, temp_finder, folders))
+
+    with open(os.path.join(search_folder, "python3.14"), "w"):
+        pass
+    # mtime resolution may not show the change, the inode of a replaced folder will
+    os.rename(search_folder, f"{search_folder}_old")
+    os.mkdir(search_folder)
+
+    assert load_snapshot(temp_finder, folders) is None
+    list(search_with_snapshot(fake_search, temp_finder, folders))
+    assert len(fake_search.calls) == 2
+
+
+def test_snapshot_environment_changed(temp_finder, search_folder, fake_search, monkeypatch):
+    folders = [search_folder]
+    list(search_with_snapshot(fake_search, temp_finder, folders))
+
+    monkeypatch.setenv("PATH", f"{search_folder}{os.pathsep}{os.environ.get('PATH', '')}")
+    assert load_snapshot(temp_finder, folders) is None
+
+    # Different folders to search also invalidate the snapshot
+    monkeypatch.undo()
+    assert load_snapshot(temp_finder, folders) is not None
+    assert load_snapshot(temp_finder, [*folders, "/usr/local/bin"]) is None
+
+
+def test_snapshot_incomplete_search(temp_finder, search_folder, fake_search):
+    folders = [search_folder]
+    installs = search_with_snapshot(fake_search, temp_finder, folders)
+    next(installs)
+    installs.close()
+
+    # Only complete searches are stored
+    assert not os.path.exists(temp_finder.snapshot_path)
+
+
+def test_clear_cache_removes_snapshot(temp_finder, search_folder, fake_search):
+    list(search_with_snapshot(fake_search, temp_finder, [search_folder]))
+    assert os.path.exists(temp_finder.snapshot_path)
+
+    temp_finder.clear_cache()
+    assert not os.path.exists(temp_finder.snapshot_path)
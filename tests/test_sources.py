@@ -0,0 +1,185 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from ducktools.pythonfinder import list_python_installs
+from ducktools.pythonfinder import sources
+from ducktools.pythonfinder.sources import (
+    COST_HIGH,
+    COST_LOW,
+    DiscoverySource,
+    get_source,
+    get_sources,
+    register_source,
+)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    # Keep sources registered by tests out of the real registry
+    monkeypatch.setattr(sources, "_registry", dict(sources._registry))
+    monkeypatch.setattr(sources, "_entry_point_sources", {})
+    return sources._registry
+
+
+@pytest.fixture
+def plugin(tmp_path, monkeypatch):
+    # An installed distribution providing a source through an entry point
+    dist_info = tmp_path / "fake_plugin-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: fake-plugin\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[ducktools.pythonfinder.sources]\nfake = fake_plugin_sources:FAKE_SOURCE\n"
+    )
+    (tmp_path / "fake_plugin_sources.py").write_text(textwrap.dedent(
+        """
+        from ducktools.pythonfinder.sources import DiscoverySource
+
+        FAKE_SOURCE = DiscoverySource("fake", "fake_plugin_search:search", default=False)
+        """
+    ))
+    (tmp_path / "fake_plugin_search.py").write_text(textwrap.dedent(
+        """
+        from ducktools.pythonfinder.shared import PythonInstall
+
+        def search(*, finder, version_filter=None):
+            for version in [(3, 12, 1, "final", 0), (3, 13, 1, "final", 0)]:
+                install = PythonInstall(version, f"/fake/python{version[0]}.{version[1]}")
+                if version_filter is None or version_filter.includes(install):
+                    yield install
+        """
+    ))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield
+    for module in ("fake_plugin_sources", "fake_plugin_search"):
+        sys.modules.pop(module, None)
+
+
+def test_default_sources():
+    names = [source.name for source in get_sources()]
+    if sys.platform == "win32":
+        assert names == ["registry", "pyenv", "uv"]
+    else:
+        assert names == ["pyenv", "uv", "PATH"]
+        assert get_source("PATH").cost == COST_HIGH
+
+
+def test_selected_sources():
+    assert [source.name for source in get_sources(["uv", "pyenv"])] == ["uv", "pyenv"]
+
+
+def test_filter_sources():
+    cheap = [source.name for source in get_sources(max_cost=COST_LOW)]
+    no_subprocess = [source.name for source in get_sources(allow_subprocess=False)]
+    if sys.platform == "win32":
+        assert cheap == ["registry", "pyenv", "uv"]
+        assert no_subprocess == ["registry", "pyenv"]
+    else:
+        assert cheap == ["pyenv", "uv"]
+        assert no_subprocess == []
+        assert [s.name for s in get_sources(["PATH", "uv"], max_cost=COST_LOW)] == ["uv"]
+
+    with pytest.raises(ValueError):
+        get_sources(max_cost="free")
+
+
+def test_unknown_source(registry):
+    with pytest.raises(ValueError, match="Unknown source 'missing'"):
+        get_sources(["missing"])
+
+
+def test_invalid_source():
+    with pytest.raises(ValueError):
+        DiscoverySource("fake", "fake_plugin_search:search", cost="free")
+
+    with pytest.raises(ValueError):
+        DiscoverySource("fake", "fake_plugin_search.search")
+
+
+def test_register_source(registry, plugin):
+    source = DiscoverySource("fake", "fake_plugin_search:search")
+    register_source(source)
+
+    # Registered sources are part of the default search
+    assert get_sources()[-1] is source
+
+    with pytest.raises(ValueError):
+        register_source(DiscoverySource("fake", "other:search"))
+
+    register_source(DiscoverySource("fake", "other:search"), replace=True)
+    assert get_source("fake").function == "other:search"
+
+
+def test_entry_point_source(registry, plugin, temp_finder):
+    source = get_source("fake")
+    assert source.name == "fake"
+    assert source.default is False
+
+    # Entry point sources are only searched when requested
+    assert "fake" not in [s.name for s in get_sources()]
+
+    # The search module is imported when the source is searched
+    assert "fake_plugin_search" not in sys.modules
+    installs = list_python_installs(finder=temp_finder, sources=["fake"])
+    assert "fake_plugin_search" in sys.modules
+
+    assert [install.executable for install in installs] == [
+        "/fake/python3.13",
+        "/fake/python3.12",
+    ]
+
+
+def test_only_selected_sources_searched(registry, plugin, temp_finder):
+    # Any search of the default sources now fails
+    for source in get_sources():
+        register_source(
+            DiscoverySource(source.name, "fake_plugin_search:missing"), replace=True
+        )
+
+    with pytest.raises(AttributeError):
+        list_python_installs(finder=temp_finder)
+
+    installs = list_python_installs(finder=temp_finder, sources=["fake"])
+    assert len(installs) == 2
+
+
+def test_lazy_imports():
+    # Importing the package does not import the search modules until they are used
+    script = textwrap.dedent(
+        """
+        import sys
+        import ducktools.pythonfinder as pythonfinder
+
+        lazy = ["async_search", "candidates", "client", "find", "linux", "win32", "darwin"]
+        print([m for m in lazy if f"ducktools.pythonfinder.{m}" in sys.modules])
+        print(pythonfinder.VersionFilter.__module__)
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split("\n")[:2] == ["[]", "ducktools.pythonfinder.candidates"]
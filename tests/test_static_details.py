@@ -0,0 +1,267 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import sys
+import os.path
+from unittest.mock import patch
+
+import pytest
+
+from ducktools.pythonfinder.shared import DetailFinder, PythonInstall
+from ducktools.pythonfinder.static_details import (
+    get_cpython_paths,
+    get_name_details,
+    get_name_version,
+    get_static_details,
+)
+
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32",
+    reason="Static queries are only supported for POSIX layouts",
+)
+
+sysconfigdata_text = """
+build_time_vars = {'ABIFLAGS': '',
+ 'PLATLIBDIR': 'lib',
+ 'Py_GIL_DISABLED': 0,
+ 'SIZEOF_VOID_P': 8}
+"""
+
+patchlevel_text = """
+#define PY_MAJOR_VERSION        3
+#define PY_MINOR_VERSION        12
+#define PY_MICRO_VERSION        4
+#define PY_RELEASE_LEVEL        PY_RELEASE_LEVEL_FINAL
+#define PY_RELEASE_SERIAL       0
+"""
+
+
+def make_layout(prefix, stdlib_name="python3.12"):
+    bin_folder = prefix / "bin"
+    bin_folder.mkdir(parents=True, exist_ok=True)
+    exe = bin_folder / "python3.12"
+    exe.write_text("#!/bin/sh\n")
+    (bin_folder / "python").symlink_to("python3.12")
+
+    stdlib = prefix / "lib" / stdlib_name
+    stdlib.mkdir(parents=True)
+    (stdlib / "os.py").touch()
+    (stdlib / "_sysconfigdata__linux_x86_64-linux-gnu.py").write_text(sysconfigdata_text)
+
+    include = prefix / "include" / "python3.12"
+    include.mkdir(parents=True)
+    (include / "patchlevel.h").write_text(patchlevel_text)
+
+    return str(bin_folder / "python")
+
+
+def test_static_details(tmp_path):
+    prefix = tmp_path / "3.12.4"
+    exe = make_layout(prefix)
+
+    details = get_static_details(exe)
+
+    stdlib = os.path.join(prefix, "lib", "python3.12")
+    assert details == {
+        "version": [3, 12, 4, "final", 0],
+        "executable": exe,
+        "architecture": "64bit",
+        "implementation": "cpython",
+        "metadata": {},
+        "paths": {
+            "stdlib": stdlib,
+            "platstdlib": stdlib,
+            "purelib": os.path.join(stdlib, "site-packages"),
+            "platlib": os.path.join(stdlib, "site-packages"),
+            "include": os.path.join(prefix, "include", "python3.12"),
+            "platinclude": os.path.join(prefix, "include", "python3.12"),
+            "scripts": os.path.join(prefix, "bin"),
+            "data": str(prefix),
+        },
+    }
+
+
+def test_static_details_venv(tmp_path):
+    prefix = tmp_path / "3.12.4"
+    exe = make_layout(prefix)
+    (prefix / "pyvenv.cfg").touch()
+
+    assert get_static_details(exe) is None
+
+
+def test_static_details_ambiguous(tmp_path):
+    prefix = tmp_path / "3.12.4"
+    exe = make_layout(prefix)
+    (prefix / "lib" / "python3.11").mkdir()
+    (prefix / "lib" / "python3.11" / "os.py").touch()
+    (prefix / "bin" / "python").unlink()
+    (prefix / "bin" / "python").write_text("#!/bin/sh\n")
+
+    # 'python' could be either version
+    assert get_static_details(exe) is None
+    # 'python3.12' can only be one
+    assert get_static_details(str(prefix / "bin" / "python3.12")) is not None
+
+
+def test_static_details_version_mismatch(tmp_path):
+    prefix = tmp_path / "3.12.4"
+    exe = make_layout(prefix)
+    patchlevel = prefix / "include" / "python3.12" / "patchlevel.h"
+    patchlevel.write_text(patchlevel_text.replace("12", "11"))
+
+    assert get_static_details(exe) is None
+
+
+@pytest.mark.skipif(
+    get_static_details(sys.executable) is None,
+    reason="Running python does not use a recognised layout",
+)
+def test_static_details_match_running():
+    from ducktools.pythonfinder import details_script
+
+    details = get_static_details(sys.executable)
+    assert details == details_script.get_details()
+
+
+def test_finder_static_query(tmp_path):
+    exe = make_layout(tmp_path / "3.12.4")
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.json"))
+
+    with patch.object(DetailFinder, "_run_query") as run_mock:
+        install = finder.query_install(exe, managed_by="pyenv")
+        run_mock.assert_not_called()
+
+    assert isinstance(install, PythonInstall)
+    assert install.version == (3, 12, 4, "final", 0)
+    assert install.managed_by == "pyenv"
+
+
+def test_finder_static_query_unmanaged(tmp_path):
+    exe = make_layout(tmp_path / "3.12.4")
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.json"))
+
+    with patch.object(DetailFinder, "_run_query") as run_mock:
+        run_mock.return_value = "invalid"
+        assert finder.query_install(exe) is None
+        run_mock.assert_called_once()
+
+    finder = DetailFinder(
+        cache_path=str(tmp_path / "cache.json"),
+        static_query_managers=None,
+    )
+    with patch.object(DetailFinder, "_run_query") as run_mock:
+        assert finder.query_install(exe) is not None
+        run_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "name, managed_by, version, architecture, freethreaded",
+    [
+        ("3.12.4", "pyenv", (3, 12, 4, "final", 0), None, False),
+        ("3.13.1t", "pyenv", (3, 13, 1, "final", 0), None, True),
+        ("3.14.0rc1", "pyenv", (3, 14, 0, "candidate", 1), None, False),
+        ("cpython-3.12.8-linux-x86_64-gnu", "Astral", (3, 12, 8, "final", 0), "64bit", False),
+        (
+            "cpython-3.13.1+freethreaded-linux-aarch64-gnu",
+            "Astral",
+            (3, 13, 1, "final", 0),
+            "64bit",
+            True,
+        ),
+        ("cpython-3.11.11-linux-i686-gnu", "Astral", (3, 11, 11, "final", 0), "32bit", False),
+    ]
+)
+def test_name_details(name, managed_by, version, architecture, freethreaded):
+    prefix = os.path.join("/installs", name)
+    details = get_name_details(os.path.join(prefix, "bin", "python"), managed_by)
+
+    assert details["version"] == list(version)
+    assert details["implementation"] == "cpython"
+    if architecture:
+        assert details["architecture"] == architecture
+    if version >= (3, 13):
+        assert details["metadata"] == {"freethreaded": freethreaded}
+    else:
+        assert details["metadata"] == {}
+    assert details["paths"] == get_cpython_paths(
+        prefix, version, "t" if freethreaded else "", "lib", freethreaded
+    )
+
+
+@pytest.mark.parametrize(
+    "name, managed_by",
+    [
+        ("pypy3.10-7.3.17", "pyenv"),
+        ("3.12-dev", "pyenv"),
+        ("2.7.18", "pyenv"),
+        ("3.12.4t", "pyenv"),
+        ("cpython-3.13.1+debug-linux-x86_64-gnu", "Astral"),
+        ("pypy-3.10.14-linux-x86_64-gnu", "Astral"),
+        ("3.12.4", None),
+        ("cpython-3.12.8-linux-x86_64-gnu", "pyenv"),
+    ]
+)
+def test_name_details_unrecognised(name, managed_by):
+    assert get_name_details(os.path.join("/installs", name, "bin", "python"), managed_by) is None
+
+
+def test_name_details_match_static(tmp_path):
+    exe = make_layout(tmp_path / "3.12.4")
+    name_details = get_name_details(exe, "pyenv", "64bit")
+    assert name_details == get_static_details(exe)
+
+
+def test_finder_details_from_names(tmp_path):
+    exe = str(tmp_path / "cpython-3.13.1+freethreaded-linux-x86_64-gnu" / "bin" / "python")
+    os.makedirs(os.path.dirname(exe))
+    with open(exe, "w") as f:
+        f.write("#!/bin/sh\n")
+
+    finder = DetailFinder(cache_path=str(tmp_path / "cache.json"), details_from_names=True)
+
+    with patch.object(DetailFinder, "query_install") as query_mock:
+        install = finder.get_install_details(exe, managed_by="Astral")
+        installs = list(finder.get_many_install_details([exe], managed_by="Astral"))
+        query_mock.assert_not_called()
+
+    assert installs == [install]
+    assert install.version == (3, 13, 1, "final", 0)
+    assert install.metadata == {"freethreaded": True}
+    assert install.managed_by == "Astral"
+    # Name details are not stored as if the install had been queried
+    assert exe not in finder.raw_cache
+
+
+@pytest.mark.parametrize(
+    "name, managed_by, version",
+    [
+        ("3.12.4", "pyenv", (3, 12, 4, "final", 0)),
+        ("3.14.0a2t", "pyenv", (3, 14, 0, "alpha", 2)),
+        ("cpython-3.13.1+debug-linux-x86_64-gnu", "Astral", (3, 13, 1, "final", 0)),
+        ("2.7.18", "pyenv", None),
+        ("pypy3.10-7.3.17", "pyenv", None),
+        ("3.12.4", None, None),
+    ]
+)
+def test_name_version(name, managed_by, version):
+    assert get_name_version(os.path.join("/installs", name, "bin", "python"), managed_by) == version
@@ -0,0 +1,156 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from ducktools.pythonfinder.shared import DetailFinder
+from ducktools.pythonfinder.__main__ import display_stats
+from ducktools.pythonfinder.stats import DiscoveryStats, MAX_RECORDED_PROBES, OTHER_SOURCE
+
+
+def test_timed_source():
+    stats = DiscoveryStats()
+
+    def source():
+        stats.count_scandir()
+        yield 1
+        stats.count_stat(2)
+        yield 2
+
+    assert list(stats.timed_source("pyenv", source())) == [1, 2]
+
+    pyenv = stats.sources["pyenv"]
+    assert pyenv.installs == 2
+    assert pyenv.scandir_calls == 1
+    assert pyenv.stat_calls == 2
+    assert pyenv.time > 0
+
+    # Counts outside of a source are kept separately
+    stats.count_stat()
+    assert stats.sources[OTHER_SOURCE].stat_calls == 1
+
+
+def test_source_context():
+    stats = DiscoveryStats()
+    with stats.source("uv"):
+        stats.count_scandir()
+        with stats.source("PATH"):
+            stats.count_stat()
+        stats.count_stat()
+
+    assert stats.sources["uv"].scandir_calls == 1
+    assert stats.sources["uv"].stat_calls == 1
+    assert stats.sources["PATH"].stat_calls == 1
+
+
+def test_sources_in_threads():
+    stats = DiscoveryStats()
+
+    def source(name):
+        stats.count_stat()
+        yield name
+        # Worker threads for queries count against the source that started them
+        worker = threading.Thread(target=stats.bind_source(stats.count_stat))
+        worker.start()
+        worker.join()
+        yield name
+
+    threads = [
+        threading.Thread(target=lambda name=name: list(stats.timed_source(name, source(name))))
+        for name in ("pyenv", "PATH")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stats.sources["pyenv"].stat_calls == 2
+    assert stats.sources["PATH"].stat_calls == 2
+    assert OTHER_SOURCE not in stats.sources
+
+
+def test_record_probe():
+    stats = DiscoveryStats()
+    stats.record_probe("/path/to/python", time.perf_counter(), (0.25, 0.125), True)
+    stats.record_probe("/path/to/pypy", time.perf_counter(), None, False)
+
+    assert stats.probe_count == 2
+    probe, failed_probe = stats.probes
+    assert probe.executable == "/path/to/python"
+    assert probe.succeeded
+    assert (probe.user_time, probe.system_time) == (0.25, 0.125)
+    assert not failed_probe.succeeded
+    assert failed_probe.user_time is None
+
+    stats.reset()
+    assert stats.probe_count == 0
+
+
+def test_recorded_probes_limited():
+    stats = DiscoveryStats()
+    for i in range(MAX_RECORDED_PROBES + 10):
+        stats.record_probe(f"/path/to/python{i}", time.perf_counter(), None, True)
+
+    # Totals include every probe, only the most recent details are kept
+    assert stats.probe_count == MAX_RECORDED_PROBES + 10
+    assert len(stats.probes) == MAX_RECORDED_PROBES
+    assert stats.probes[0].executable == "/path/to/python10"
+
+
+def test_display_empty_stats(capsys):
+    display_stats(DiscoveryStats())
+    assert "Queries: 0" in capsys.readouterr().out
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Test for non-Windows only")
+def test_probe_cpu_times(tmp_path):
+    import resource
+
+    finder = DetailFinder(
+        cache_path=str(tmp_path / "cache.json"),
+        in_process_query=False,
+        static_query_managers=(),
+    )
+    exe = tmp_path / "python"
+    exe.write_text(f'#!/bin/sh\nsleep 1\nexec {sys.executable} "$@"\n')
+    exe.chmod(0o755)
+
+    # Another child using CPU finishes while the query runs
+    busy = threading.Thread(
+        target=subprocess.run,
+        args=([sys.executable, "-c", "sum(range(3 * 10**7))"],),
+    )
+    start_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    busy.start()
+    finder.query_install(str(exe))
+    busy.join()
+    all_children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_utime - start_usage.ru_utime
+
+    probe = finder.stats.probes[0]
+    assert probe.user_time is not None and probe.system_time is not None
+    # The time of the other child is not counted against the query
+    assert all_children - probe.user_time > 0.2
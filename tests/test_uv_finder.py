@@ -24,7 +24,9 @@ import json
 import os
 import re
 import subprocess
+import time
 
+from concurrent.futures import ThreadPoolExecutor
 from tempfile import TemporaryDirectory
 
 import unittest.mock as mock
@@ -32,6 +34,7 @@ import unittest.mock as mock
 
 import pytest
 
+from ducktools.pythonfinder import shared
 from ducktools.pythonfinder.shared import (
     get_uv_python_path,
     get_uv_pythons,
@@ -112,6 +115,28 @@ class TestUVFakes:
 
             assert pydir is None
 
+    def test_get_uv_python_path_concurrent(self, tmp_path):
+        # Sources searched at the same time find the folder once
+        # and leave a complete cache file
+        cache_path = tmp_path / "installer_details.json"
+        calls = []
+
+        def slow_find():
+            calls.append(None)
+            time.sleep(0.1)
+            return str(tmp_path)
+
+        with (
+            mock.patch.object(shared, "INSTALLER_CACHE_PATH", str(cache_path)),
+            mock.patch.object(shared, "_find_uv_python_path", slow_find),
+            ThreadPoolExecutor(4) as pool,
+        ):
+            results = list(pool.map(lambda _: get_uv_python_path(), range(4)))
+
+        assert results == [str(tmp_path)] * 4
+        assert len(calls) == 1
+        assert json.loads(cache_path.read_text()) == {"uv": str(tmp_path)}
+
 
 @pytest.mark.skipif(get_uv_python_path() is None, reason=UV_REASON)
 class TestUVReal:
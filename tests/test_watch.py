@@ -0,0 +1,175 @@
+# ducktools-pythonfinder
+# MIT License
+#
+# Copyright (c) 2026 David C Ellis
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import os
+import os.path
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from ducktools.pythonfinder.shared import PythonInstall
+
+if sys.platform != "linux":
+    pytest.skip("Watching installs is only supported on Linux", allow_module_level=True)
+
+from ducktools.pythonfinder.linux import watch
+from ducktools.pythonfinder.linux.watch import (
+    INSTALL_ADDED,
+    INSTALL_CHANGED,
+    INSTALL_REMOVED,
+    InstallEvent,
+    watch_python_installs,
+)
+
+
+@pytest.fixture
+def search_folder(tmp_path):
+    folder = tmp_path / "bin"
+    folder.mkdir()
+    (folder / "python3.12").write_text("3.12.0")
+    return folder
+
+
+@pytest.fixture
+def fake_search(search_folder):
+    # Each python file in the folder is an install with its contents as the version
+    def search(finder):
+        search.calls += 1
+        for name in sorted(os.listdir(search_folder)):
+            if not name.startswith("python"):
+                continue
+            path = search_folder / name
+            major, minor, micro = path.read_text().split(".")
+            yield PythonInstall(
+                version=(int(major), int(minor), int(micro), "final", 0),
+                executable=str(path),
+            )
+
+    search.calls = 0
+
+    with (
+        patch.object(watch, "search_sources", search),
+        patch.object(watch, "_get_search_folders", lambda: [str(search_folder)]),
+        patch.object(watch, "_get_install_roots", list),
+    ):
+        yield search
+
+
+@pytest.fixture
+def stop():
+    event = threading.Event()
+    # Stop the watch if an expected event never arrives
+    timer = threading.Timer(10, event.set)
+    timer.start()
+    yield event
+    timer.cancel()
+    event.set()
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watch_events(temp_finder, search_folder, fake_search, stop, use_inotify):
+    events = watch_python_installs(
+        finder=temp_finder,
+        poll_interval=0.05,
+        stop=stop,
+        use_inotify=use_inotify,
+    )
+
+    try:
+        event = next(events)
+        assert event.event == INSTALL_ADDED
+        assert event.install.version == (3, 12, 0, "final", 0)
+
+        (search_folder / "python3.13").write_text("3.13.1")
+        event = next(events)
+        assert event == InstallEvent(
+            INSTALL_ADDED,
+            PythonInstall(version=(3, 13, 1, "final", 0), executable=str(search_folder / "python3.13")),
+        )
+
+        # Modified in place so only the polled file stamp or inotify sees it
+        (search_folder / "python3.13").write_text("3.13.10")
+        event = next(events)
+        assert event.event == INSTALL_CHANGED
+        assert event.install.version == (3, 13, 10, "final", 0)
+
+        os.remove(search_folder / "python3.12")
+        event = next(events)
+        assert event.event == INSTALL_REMOVED
+        assert event.install.executable == str(search_folder / "python3.12")
+    finally:
+        events.close()
+
+    assert not stop.is_set()
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watch_ignores_other_files(temp_finder, search_folder, fake_search, stop, use_inotify):
+    events = watch_python_installs(
+        finder=temp_finder,
+        poll_interval=0.05,
+        stop=stop,
+        use_inotify=use_inotify,
+    )
+
+    try:
+        assert next(events).event == INSTALL_ADDED
+        assert fake_search.calls == 1
+
+        # Files that are not Python executables do not start a search
+        for name in ("pip", "black", "pyvenv.cfg"):
+            (search_folder / name).write_text("")
+        threading.Event().wait(0.5)
+
+        (search_folder / "python3.13").write_text("3.13.1")
+        event = next(events)
+        assert event.event == INSTALL_ADDED
+        assert event.install.executable == str(search_folder / "python3.13")
+        assert fake_search.calls == 2
+    finally:
+        events.close()
+
+
+def test_watch_stop(temp_finder, fake_search):
+    stop = threading.Event()
+    events = watch_python_installs(finder=temp_finder, poll_interval=0.01, stop=stop)
+    assert next(events).event == INSTALL_ADDED
+
+    stop.set()
+    assert list(events) == []
+
+
+def test_inotify_missing_folder(tmp_path):
+    watcher = watch._InotifyWatcher()
+    watcher.open()
+    try:
+        missing = tmp_path / "missing"
+        watcher.update([str(missing)])
+        assert not watcher.wait(0.01)
+
+        # Folders that could not be watched are polled
+        missing.mkdir()
+        assert watcher.wait(0.01)
+    finally:
+        watcher.close()